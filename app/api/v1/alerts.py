@@ -10,7 +10,7 @@ from app.services import (
     trust_service
 )
 from app.services.lead_service import get_all_leads
-from app.ingestion.registry import registry
+from app.services.ingestion_run_service import get_latest_summary
 from app.core.auth.security import require_roles, UserRole
 
 router = APIRouter(
@@ -27,7 +27,7 @@ def get_active_alerts(db: Session = Depends(get_db)):
     # 1. Gather all necessary state from other services
     leads = get_all_leads(db)
     
-    ingestion_status = registry.last_summary or {} 
+    ingestion_status = get_latest_summary(db) or {}
     
     data_quality = data_quality_service.analyze_data_quality(leads)
     
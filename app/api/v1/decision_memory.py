@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
-from app.schemas.decision_memory import DecisionMemoryCreate, DecisionFeedbackUpdate, DecisionMemoryRead
+from app.core.database import get_db, get_async_db
+from app.schemas.decision_memory import DecisionMemoryCreate, DecisionFeedbackUpdate, DecisionMemoryRead, DecisionMemoryPage
 from app.services import decision_memory_service
 from app.core.auth.security import UserRole, require_roles, get_current_user, UserContext
 
@@ -36,16 +37,17 @@ def provide_decision_feedback(
     feedback_data.approved_by = user.user_id
     return decision_memory_service.record_feedback(db, memory_id, feedback_data)
 
-@router.get("/history", response_model=List[DecisionMemoryRead], dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.SALES_MANAGER, UserRole.OPS_CRM, UserRole.VIEWER]))])
-def get_decision_history(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+@router.get("/history", response_model=DecisionMemoryPage, dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.SALES_MANAGER, UserRole.OPS_CRM, UserRole.VIEWER]))])
+async def get_decision_history(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Retrieves a paginated history of all decisions from memory.
+    Retrieves the decision history from memory, newest first.
+    Follow `next_cursor` to page through older decisions.
     """
-    return decision_memory_service.get_decision_history(db, skip, limit)
+    return await decision_memory_service.get_decision_history_async(db, cursor, limit)
 
 @router.get("/learning-signals", response_model=List[DecisionMemoryRead], dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.OPS_CRM]))])
 def get_all_learning_signals(
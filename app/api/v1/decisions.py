@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import json
 
-from app.core.database import get_db
-from app.schemas.decision import DecisionRecommendation
+from app.core.database import get_db, get_async_db
+from app.schemas.decision import DecisionRecommendation, PersonaRecommendationBatch
 from app.schemas.decision_proposal import DecisionProposalCreate, DecisionProposalOut
 from app.schemas.decision_review import DecisionReview
 from app.schemas.override import DecisionOverride
-from app.core.decision.engine import generate_recommendations, filter_recommendations_by_persona, explain_decision, PERSONA_WEIGHTS
+from app.services.recommendation_service import get_persona_recommendations, get_persona_feeds
 from app.services.decision_service import create_decision_proposal, override_decision
 from app.services.decision_review_service import review_decision
 from app.core.decision.confidence import get_system_confidence
 from app.services.analytics_service import get_key_metrics
 from app.core.governance.audit import create_audit_log_entry
+from app.core.unit_of_work import UnitOfWork
 from app.schemas.audit_log import AuditLogCreate
 from app.core.auth.security import get_current_user_role, UserRole, require_roles, UserContext, get_current_user
 from app.services.decision_sla_service import evaluate_decision_sla
 from app.models.decision_feedback import DecisionFeedback
 from app.schemas.decision_feedback import DecisionFeedbackCreate, DecisionFeedbackRead
-from app.services.traceability_service import capture_decision_snapshot, get_decision_snapshot
-from app.schemas.decision_snapshot import DecisionSnapshotRead
+from app.services.traceability_service import get_decision_snapshot_async, list_decision_snapshots_async
+from app.schemas.decision_snapshot import DecisionSnapshotRead, DecisionSnapshotPage
 
 router = APIRouter(
     prefix="/decisions",
@@ -40,50 +42,16 @@ def get_decision_recommendations(
         confidence_data = get_system_confidence(db)
         analytics_metrics = get_key_metrics(db)
         
-        # Pass persona to generate_recommendations for weighting
-        all_recommendations = generate_recommendations(
-            analytics_metrics=analytics_metrics,
-            confidence_score=confidence_data.score,
-            persona=role
-        )
-        
-        filtered_recommendations = filter_recommendations_by_persona(all_recommendations, role)
-        
-        final_recommendations = []
-        for rec in filtered_recommendations:
-            # Capture snapshot for traceability
-            snapshot = capture_decision_snapshot(
-                db=db,
-                decision=rec,
-                user_id=user.user_id,
+        # Memoized per input fingerprint; unchanged inputs return the DTIDs already traced.
+        # Snapshots and audit entries are written together when the unit of work exits.
+        with UnitOfWork(db) as uow:
+            return get_persona_recommendations(
+                uow,
+                analytics_metrics=analytics_metrics,
+                confidence_score=confidence_data.score,
                 persona=role,
-                inputs=analytics_metrics,
-                rules_fired=rec.explanation.get("triggered_rule_ids", []) if rec.explanation else [],
-                weights={"persona_weight": PERSONA_WEIGHTS.get(role, 1.0)},
-                model_version="v1.0"
+                user_id=user.user_id
             )
-            
-            # Update recommendation ID with the generated DTID
-            rec.id = snapshot.decision_id
-            
-            log_details = json.dumps({
-                "title": rec.title,
-                "priority": rec.priority.value,
-                "confidence": rec.confidence,
-                "explanation": rec.explanation,
-                "dtid": snapshot.decision_id
-            })
-            
-            log_entry = AuditLogCreate(
-                event_type="decision_generated",
-                decision=rec.recommendation[:255],
-                details=log_details,
-                persona=role.value if role else "anonymous"
-            )
-            create_audit_log_entry(db, log_entry)
-            final_recommendations.append(rec)
-        
-        return final_recommendations
 
     except Exception as e:
         raise HTTPException(
@@ -91,15 +59,57 @@ def get_decision_recommendations(
             detail=f"Failed to generate recommendations: {str(e)}"
         )
 
+@router.get("/recommendations/batch", response_model=PersonaRecommendationBatch, dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.OPS_CRM]))])
+def get_decision_recommendations_batch(
+    personas: Optional[List[UserRole]] = Query(None, description="Personas to build feeds for; defaults to all"),
+    db: Session = Depends(get_db),
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Builds every persona's recommendation feed in one pass, e.g. for the
+    morning digest. Confidence, metrics and rule results are computed once;
+    each feed is traced (and memoized) exactly like `/recommendations` for
+    that persona.
+    """
+    try:
+        confidence_data = get_system_confidence(db)
+        analytics_metrics = get_key_metrics(db)
+        with UnitOfWork(db) as uow:
+            feeds = get_persona_feeds(uow, analytics_metrics, confidence_data.score, user.user_id, personas)
+        return PersonaRecommendationBatch(
+            confidence_score=confidence_data.score,
+            feeds={persona.value: recommendations for persona, recommendations in feeds.items()}
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate recommendations: {str(e)}"
+        )
+
+# Declared before /{decision_id} so "snapshots" is not read as a DTID.
+@router.get("/snapshots", response_model=DecisionSnapshotPage, dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.SALES_MANAGER, UserRole.OPS_CRM]))])
+async def list_decision_snapshots(
+    persona: Optional[str] = Query(None, description="Filter by persona"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lists decision snapshots, newest first. Follow `next_cursor` to page
+    through older decisions.
+    """
+    return await list_decision_snapshots_async(db, persona=persona, cursor=cursor, limit=limit)
+
 @router.get("/{decision_id}", response_model=DecisionSnapshotRead)
-def get_decision_trace(
+async def get_decision_trace(
     decision_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieves the full snapshot and trace for a specific decision ID (DTID).
     """
-    snapshot = get_decision_snapshot(db, decision_id)
+    snapshot = await get_decision_snapshot_async(db, decision_id)
     if not snapshot:
         raise HTTPException(status_code=404, detail="Decision trace not found")
     return snapshot
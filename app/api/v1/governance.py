@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from datetime import datetime
 
-from app.core.database import get_db
-from app.schemas.audit_log import AuditLog
-from app.core.governance.audit import get_audit_logs
+from app.core.database import get_async_db
+from app.schemas.audit_log import AuditLogPage
+from app.core.governance.audit import get_audit_logs_async
 from app.core.cache import clear_cache
 from app.core.auth.security import require_roles, UserRole
 
@@ -15,26 +15,27 @@ router = APIRouter(
     dependencies=[Depends(require_roles([UserRole.FOUNDER]))]
 )
 
-@router.get("/audit_logs", response_model=List[AuditLog])
-def read_audit_logs(
+@router.get("/audit_logs", response_model=AuditLogPage)
+async def read_audit_logs(
     event_type: Optional[str] = Query(None, description="Filter by event type"),
     persona: Optional[str] = Query(None, description="Filter by persona"),
     start_date: Optional[datetime] = Query(None, description="Start of date range"),
     end_date: Optional[datetime] = Query(None, description="End of date range"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Retrieve audit logs for governance and traceability, with optional filters.
+    Retrieve audit logs for governance and traceability, newest first, with
+    optional filters. Follow `next_cursor` to page through older entries.
     """
-    return get_audit_logs(
+    return await get_audit_logs_async(
         db=db,
         event_type=event_type,
         persona=persona,
         start_date=start_date,
         end_date=end_date,
-        skip=skip,
+        cursor=cursor,
         limit=limit
     )
 
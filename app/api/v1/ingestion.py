@@ -1,7 +1,28 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Dict
+import hashlib
+import hmac
+import json
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
 
-from app.ingestion.registry import registry
+from app.core.config import INGESTION_IMPORT_DIR, WHATSAPP_VERIFY_TOKEN, WHATSAPP_APP_SECRET, WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS
+from app.core.database import get_db, get_async_db
+from app.ingestion.file_import import FileIngestion, SUPPORTED_SUFFIXES
+from app.ingestion.registry import registry, IngestionRegistry
+from app.ingestion.webhook import whatsapp_webhook, extract_messages
+from app.schemas.ingestion import (
+    FileImportRequest,
+    DeadLetterRead,
+    DeadLetterPage,
+    DeadLetterUpdate,
+    DeadLetterReplayRequest,
+    DeadLetterReplayResult
+)
+from app.schemas.ingestion_run import IngestionRunPage
+from app.services.ingestion_run_service import get_ingestion_history_async
+from app.services import dead_letter_service
 from app.core.auth.security import require_roles, UserRole
 
 router = APIRouter(
@@ -16,8 +37,8 @@ router = APIRouter(
 )
 def run_ingestion() -> Dict:
     """
-    Triggers the data ingestion process for all enabled sources and
-    returns a detailed summary report.
+    Runs every enabled ingestion source concurrently and returns a summary
+    with per-source status, record counts and timings.
     """
     try:
         summary = registry.ingest_all()
@@ -31,6 +52,33 @@ def run_ingestion() -> Dict:
             detail=f"A critical error occurred during the ingestion process: {e}"
         )
 
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_roles([UserRole.OPS_CRM]))]
+)
+def import_file(request: FileImportRequest) -> Dict:
+    """
+    Imports a partner lead dump (CSV or Parquet) from the import directory
+    through the chunked ingestion pipeline. Invalid rows are reported as
+    failed records and do not stop the import.
+    """
+    import_dir = INGESTION_IMPORT_DIR.resolve()
+    path = (import_dir / request.path).resolve()
+    if not path.is_relative_to(import_dir):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Path must be inside the import directory.")
+    if path.suffix.lower() not in SUPPORTED_SUFFIXES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only CSV and Parquet files can be imported.")
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Import file '{request.path}' not found.")
+
+    adapter = FileIngestion(path, source_name=request.source, columns=request.columns)
+    summary = IngestionRegistry(adapters=[adapter]).ingest_all(incremental=False)
+    return {
+        "status": "import_completed",
+        "summary": summary
+    }
+
 @router.get("/sources")
 def get_sources() -> Dict:
     """Returns a list of available and enabled ingestion sources."""
@@ -38,3 +86,102 @@ def get_sources() -> Dict:
         "available": registry.get_available_sources(),
         "enabled": list(registry.enabled_sources)
     }
+
+@router.get(
+    "/runs",
+    response_model=IngestionRunPage,
+    dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.OPS_CRM]))]
+)
+async def get_ingestion_runs(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Ingestion run history, newest first, with per-source throughput and
+    chunk latency percentiles. Follow `next_cursor` for older runs.
+    """
+    return await get_ingestion_history_async(db, cursor=cursor, limit=limit)
+
+@router.get(
+    "/dead_letters",
+    response_model=DeadLetterPage,
+    dependencies=[Depends(require_roles([UserRole.FOUNDER, UserRole.OPS_CRM]))]
+)
+async def get_dead_letters(
+    source: Optional[str] = Query(None, description="Filter by source"),
+    status_filter: Optional[str] = Query("pending", alias="status", description="pending or replayed"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Records rejected during ingestion, newest first, with their payload and last error."""
+    return await dead_letter_service.list_dead_letters_async(
+        db, source=source, status=status_filter, cursor=cursor, limit=limit
+    )
+
+@router.patch(
+    "/dead_letters/{dead_letter_id}",
+    response_model=DeadLetterRead,
+    dependencies=[Depends(require_roles([UserRole.OPS_CRM]))]
+)
+def update_dead_letter(dead_letter_id: int, update: DeadLetterUpdate, db: Session = Depends(get_db)):
+    """Fixes a pending record's payload ahead of a replay."""
+    letter = dead_letter_service.update_dead_letter_payload(db, dead_letter_id, update.payload)
+    if letter is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pending dead letter not found.")
+    return letter
+
+@router.post(
+    "/dead_letters/replay",
+    response_model=DeadLetterReplayResult,
+    dependencies=[Depends(require_roles([UserRole.OPS_CRM]))]
+)
+def replay_dead_letters(request: DeadLetterReplayRequest, db: Session = Depends(get_db)):
+    """
+    Reprocesses pending dead letters in batches. Records that still fail
+    stay pending with their new error and attempt count.
+    """
+    return dead_letter_service.replay_dead_letters(db, ids=request.ids, source=request.source, limit=request.limit)
+
+@router.get("/webhooks/whatsapp", response_class=PlainTextResponse)
+def verify_whatsapp_webhook(
+    mode: str = Query(..., alias="hub.mode"),
+    token: str = Query(..., alias="hub.verify_token"),
+    challenge: str = Query(..., alias="hub.challenge")
+):
+    """Answers the subscription handshake by echoing the challenge."""
+    if mode != "subscribe" or not WHATSAPP_VERIFY_TOKEN or not hmac.compare_digest(token, WHATSAPP_VERIFY_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Webhook verification failed.")
+    return challenge
+
+@router.post("/webhooks/whatsapp", status_code=status.HTTP_202_ACCEPTED)
+async def receive_whatsapp_webhook(request: Request) -> Dict:
+    """
+    Receives inbound WhatsApp messages and acknowledges at once. Messages are
+    queued and written in coalesced batches by the background flusher. When
+    the queue cannot take the whole delivery, none of it is queued and the
+    request gets a 503 so the sender retries.
+
+    Deliveries must carry a valid X-Hub-Signature-256; without a configured
+    app secret they are refused unless WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS is set.
+    """
+    body = await request.body()
+    if WHATSAPP_APP_SECRET:
+        expected = "sha256=" + hmac.new(WHATSAPP_APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, request.headers.get("x-hub-signature-256", "")):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature.")
+    elif not WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Webhook signature secret is not configured.")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook body must be JSON.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook body must be a JSON object.")
+
+    messages = extract_messages(payload)
+    accepted = whatsapp_webhook.submit(messages)
+    if accepted < len(messages):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook queue is full; retry later.")
+    return {"status": "accepted", "messages": accepted}
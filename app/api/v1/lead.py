@@ -1,10 +1,11 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, Query, status, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.database import get_db
-from app.schemas.lead import Lead, LeadCreate
-from app.services import lead_service
+from app.core.database import get_db, get_async_db
+from app.schemas.lead import Lead, LeadCreate, DuplicateReport
+from app.services import lead_service, dedup_service
 
 router = APIRouter(
     prefix="/leads",
@@ -28,8 +29,25 @@ def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
     response_model=List[Lead],
     summary="Get all leads"
 )
-def get_leads(db: Session = Depends(get_db)):
+async def get_leads(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves a list of all leads.
     """
-    return lead_service.get_all_leads(db=db)
+    return await lead_service.get_all_leads_async(db=db)
+
+@router.get(
+    "/duplicates",
+    response_model=DuplicateReport,
+    summary="Find duplicate leads"
+)
+def get_duplicate_leads(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum merge suggestions to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Clusters leads that share a normalized phone number, a canonical email,
+    or a name plus phone suffix, and suggests which record each cluster
+    should be merged into. Largest clusters come first.
+    """
+    report = dedup_service.get_duplicate_report(db)
+    return {**report, "suggestions": report["suggestions"][:limit]}
@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends
 from app.schemas.listing import Listing
 from app.services import listing_service
 from typing import List
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 
 router = APIRouter()
 
 @router.get("/listings", response_model=List[Listing])
-async def read_listings(db: Session = Depends(get_db)):
+async def read_listings(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve all property listings.
     """
-    return listing_service.get_all_listings(db)
+    return await listing_service.get_all_listings_async(db)
@@ -4,7 +4,8 @@ from typing import Dict, Any
 
 from app.core.database import get_db
 from app.services import system_health_service
-from app.ingestion.registry import registry # Import the registry to get the summary
+from app.services.ingestion_run_service import get_latest_summary
+from app.ingestion.webhook import whatsapp_webhook
 
 router = APIRouter(
     prefix="/system",
@@ -17,21 +18,24 @@ def get_health(db: Session = Depends(get_db)) -> Dict[str, Any]:
     Provides a high-level status of the system, including API, database,
     and data freshness.
     """
-    last_summary = registry.last_summary
+    last_summary = get_latest_summary(db)
     return system_health_service.get_system_health(db, last_summary)
 
 @router.get("/metrics")
 def get_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
-    Returns key operational metrics about the data platform.
+    Returns key operational metrics about the data platform, including the
+    WhatsApp webhook queue depth and flush throughput.
     """
-    last_summary = registry.last_summary
-    return system_health_service.get_system_metrics(db, last_summary)
+    last_summary = get_latest_summary(db)
+    metrics = system_health_service.get_system_metrics(db, last_summary)
+    metrics["webhook_queue"] = whatsapp_webhook.metrics()
+    return metrics
 
 @router.get("/ingestion_status")
-def get_ingestion_status() -> Dict[str, Any]:
+def get_ingestion_status(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
     Provides a detailed summary of the last ingestion run across all sources.
     """
-    last_summary = registry.last_summary
+    last_summary = get_latest_summary(db)
     return system_health_service.get_ingestion_status(last_summary)
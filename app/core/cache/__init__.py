@@ -0,0 +1,7 @@
+from .base import CacheBackend
+from .stats import CacheStats, cache_stats
+from .keys import default_key
+from .engine import LRUCache, estimate_size
+from .sqlite_backend import SQLiteCacheBackend
+from .singleflight import SingleFlight, single_flight, default_flights
+from .decorators import simple_cache, clear_cache, invalidate_tags, default_cache, create_cache_backend, get_cache_metrics
@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+# Sentinel for `set(ttl=...)`: use the backend's default TTL. `None` means "never expires".
+USE_DEFAULT_TTL = object()
+
+class CacheBackend(ABC):
+    """
+    Abstract base class for cache storage backends.
+    The decorators only talk to this interface, so the storage can be swapped
+    between a per-process memory cache and a store shared by all workers.
+    """
+
+    @abstractmethod
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns a (found, value) pair; expired entries count as not found."""
+        pass
+
+    @abstractmethod
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = USE_DEFAULT_TTL,
+        tags: Iterable[str] = (),
+        generation: Optional[Hashable] = None
+    ) -> None:
+        """
+        Stores a value for `ttl` seconds (forever if None) under the given dependency tags.
+        With `generation` (from `tag_generation` before the value was computed), the value
+        is dropped instead if any of its tags was invalidated in the meantime.
+        """
+        pass
+
+    @abstractmethod
+    def tag_generation(self, tags: Iterable[str]) -> Hashable:
+        """
+        Returns a token that changes whenever any of the tags is invalidated
+        or the cache is cleared.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        pass
+
+    @abstractmethod
+    def invalidate_tags(self, *tags: str) -> int:
+        """Removes every entry carrying any of the given tags and returns how many were dropped."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def sweep_expired(self) -> int:
+        """Removes every expired entry and returns how many were dropped."""
+        pass
+
+    @abstractmethod
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Returns the current entry count and approximate byte size per namespace."""
+        pass
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key)[0]
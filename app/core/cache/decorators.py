@@ -0,0 +1,145 @@
+import inspect
+import os
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from app.core.cache.base import CacheBackend
+from app.core.cache.keys import default_key
+from app.core.cache.singleflight import default_flights
+from app.core.cache.stats import cache_stats
+from app.core.cache.engine import LRUCache
+from app.core.cache.sqlite_backend import SQLiteCacheBackend
+from app.core.config import (
+    CACHE_BACKEND, CACHE_SQLITE_PATH, CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_SWEEP_INTERVAL_SECONDS
+)
+
+def create_cache_backend(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Builds the configured cache backend ('memory' or 'sqlite')."""
+    if backend == "sqlite":
+        return SQLiteCacheBackend(
+            CACHE_SQLITE_PATH,
+            max_entries=CACHE_MAX_ENTRIES,
+            max_bytes=CACHE_MAX_BYTES,
+            sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS
+        )
+    if backend == "memory":
+        return LRUCache(
+            max_entries=CACHE_MAX_ENTRIES,
+            max_bytes=CACHE_MAX_BYTES,
+            sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS
+        )
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+# Cache shared by every decorated function. Each function gets its own
+# namespace inside it, so keys never collide across call sites.
+default_cache = create_cache_backend()
+
+def simple_cache(
+    ttl: Optional[int] = 60,
+    key: Optional[Callable[..., Hashable]] = None,
+    namespace: Optional[str] = None,
+    tags: Iterable[str] = ()
+):
+    """
+    Caches a function's result in the shared LRU cache for `ttl` seconds.
+
+    `key` receives the same arguments as the decorated function and returns
+    the hashable part of the cache key. Without it, all non-session arguments
+    are used. `tags` name the data the result depends on; see `invalidate_tags`.
+
+    Concurrent misses for the same key are coalesced: one caller computes the
+    result while the others wait for it. A result whose tags were invalidated
+    while it was being computed is returned but not cached. `async def`
+    functions are supported.
+    """
+    key_func = key or default_key
+    entry_tags = tuple(tags)
+
+    def decorator(func: Callable):
+        func_namespace = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            async def compute_async(cache_key, computed, *args, **kwargs):
+                computed.append(True)
+                # Taken before computing, so a write that lands meanwhile keeps the result out of the cache.
+                generation = default_cache.tag_generation(entry_tags)
+                started = time.perf_counter()
+                result = await func(*args, **kwargs)
+                cache_stats.record_miss(func_namespace, time.perf_counter() - started)
+                default_cache.set(cache_key, result, ttl=ttl, tags=entry_tags, generation=generation)
+                return result
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = (func_namespace, key_func(*args, **kwargs))
+                found, value = default_cache.lookup(cache_key)
+                if found:
+                    cache_stats.record_hit(func_namespace)
+                    return value
+                computed = []
+                result = await default_flights.do_async(cache_key, compute_async, cache_key, computed, *args, **kwargs)
+                if not computed:
+                    cache_stats.record_coalesced(func_namespace)
+                return result
+        else:
+            def compute(cache_key, computed, *args, **kwargs):
+                computed.append(True)
+                # Taken before computing, so a write that lands meanwhile keeps the result out of the cache.
+                generation = default_cache.tag_generation(entry_tags)
+                started = time.perf_counter()
+                result = func(*args, **kwargs)
+                cache_stats.record_miss(func_namespace, time.perf_counter() - started)
+                default_cache.set(cache_key, result, ttl=ttl, tags=entry_tags, generation=generation)
+                return result
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cache_key = (func_namespace, key_func(*args, **kwargs))
+                found, value = default_cache.lookup(cache_key)
+                if found:
+                    cache_stats.record_hit(func_namespace)
+                    return value
+                computed = []
+                result = default_flights.do(cache_key, compute, cache_key, computed, *args, **kwargs)
+                if not computed:
+                    cache_stats.record_coalesced(func_namespace)
+                return result
+
+        wrapper.cache_namespace = func_namespace
+        wrapper.cache_tags = entry_tags
+        return wrapper
+    return decorator
+
+def invalidate_tags(*tags: str) -> int:
+    """
+    Drops every cached result that depends on any of the given tags.
+    Writers call this with the tables they touched instead of clearing
+    the whole cache.
+    """
+    return default_cache.invalidate_tags(*tags)
+
+def clear_cache():
+    default_cache.clear()
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """
+    Combines this worker's hit/miss/eviction counters with the backend's
+    current entry counts and sizes, per namespace.
+    """
+    usage = default_cache.usage()
+    counters = cache_stats.snapshot()
+    namespaces = {}
+    for namespace in sorted(set(usage) | set(counters)):
+        namespaces[namespace] = {
+            **counters.get(namespace, {}),
+            **usage.get(namespace, {"entries": 0, "bytes": 0})
+        }
+    return {
+        "backend": type(default_cache).__name__,
+        # Counters are kept per worker process; entry counts come from the backend.
+        "worker_pid": os.getpid(),
+        "entries": sum(u["entries"] for u in usage.values()),
+        "bytes": sum(u["bytes"] for u in usage.values()),
+        "namespaces": namespaces
+    }
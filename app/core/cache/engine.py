@@ -0,0 +1,203 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+from app.core.cache.base import CacheBackend, USE_DEFAULT_TTL
+from app.core.cache.stats import CacheStats, cache_stats, namespace_of
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximates the memory footprint of a cached value in bytes.
+    Walks containers and plain object attributes once; SQLAlchemy
+    instance state is skipped so a cached ORM object does not pull
+    its whole session into the estimate.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _seen) for item in obj)
+
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        size += sum(
+            estimate_size(value, _seen)
+            for name, value in attrs.items()
+            if not name.startswith("_sa_")
+        )
+    for name in getattr(type(obj), "__slots__", ()):
+        value = getattr(obj, name, None)
+        size += estimate_size(value, _seen)
+    return size
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int, tags: Tuple[str, ...] = ()):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+    def is_expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+class LRUCache(CacheBackend):
+    """
+    A thread-safe, size- and byte-bounded LRU cache with per-entry TTL.
+
+    Expired entries are dropped lazily when they are read and, at most once
+    every `sweep_interval` seconds, by a full sweep piggybacked on writes.
+    Entries can carry dependency tags so that a write only invalidates the
+    results that depend on the data it changed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: Optional[float] = 60,
+        sweep_interval: float = 30,
+        stats: CacheStats = cache_stats
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self.stats = stats
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[Hashable]] = {}
+        # Bumped per tag by `invalidate_tags`, and as a whole by `clear`.
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self._last_sweep = time.monotonic()
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns a (found, value) pair so that cached `None` results are distinguishable from misses."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.is_expired(now):
+                self._remove(key)
+                self.stats.record_expiration(namespace_of(key))
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+
+    def tag_generation(self, tags: Iterable[str]) -> Hashable:
+        with self._lock:
+            return (self._epoch, tuple(self._generations.get(tag, 0) for tag in tags))
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = USE_DEFAULT_TTL,
+        tags: Iterable[str] = (),
+        generation: Optional[Hashable] = None
+    ) -> None:
+        if ttl is USE_DEFAULT_TTL:
+            ttl = self.default_ttl
+        now = time.monotonic()
+        entry_tags = tuple(tags)
+        size = estimate_size(value)
+        # A single value that cannot fit is simply not cached.
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+
+        with self._lock:
+            # Computed before a write invalidated its tags: the value is already stale.
+            if generation is not None and generation != self.tag_generation(entry_tags):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, now + ttl if ttl is not None else None, size, entry_tags)
+            self._total_bytes += size
+            for tag in entry_tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.stats.record_eviction(namespace_of(oldest_key))
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Removes every entry carrying any of the given tags and returns how many were dropped."""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._total_bytes = 0
+            self._epoch += 1
+
+    def sweep_expired(self) -> int:
+        """Removes every expired entry and returns how many were dropped."""
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            usage: Dict[str, Dict[str, int]] = {}
+            for key, entry in self._entries.items():
+                ns_usage = usage.setdefault(namespace_of(key), {"entries": 0, "bytes": 0})
+                ns_usage["entries"] += 1
+                ns_usage["bytes"] += entry.size
+            return usage
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sweep(self, now: float) -> int:
+        expired = [key for key, entry in self._entries.items() if entry.is_expired(now)]
+        for key in expired:
+            self._remove(key)
+            self.stats.record_expiration(namespace_of(key))
+        self._last_sweep = now
+        return len(expired)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        for tag in entry.tags:
+            tagged = self._tag_index.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self._tag_index[tag]
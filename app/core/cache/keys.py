@@ -0,0 +1,14 @@
+from typing import Hashable
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_SESSION_TYPES = (Session, AsyncSession)
+
+def default_key(*args, **kwargs) -> Hashable:
+    """
+    Builds a cache key from the call arguments, leaving out database sessions.
+    A session differs on every request and must never be part of the key.
+    """
+    positional = tuple(arg for arg in args if not isinstance(arg, _SESSION_TYPES))
+    keyword = tuple(sorted((k, v) for k, v in kwargs.items() if not isinstance(v, _SESSION_TYPES)))
+    return positional, keyword
@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.core.cache.keys import default_key
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single computation.
+
+    The first caller for a key runs the function; every caller that arrives
+    while it is still running waits for it and receives the same result (or
+    the same exception). Nothing is remembered once the call completes;
+    combine with a cache to keep results around.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, "asyncio.Future"] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs `fn` for sync callers, such as endpoints served from the threadpool."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Runs the coroutine function `fn` for async callers. The computation
+        runs as its own task, so a cancelled waiter does not cancel it for
+        the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._tasks)
+
+default_flights = SingleFlight()
+
+def single_flight(key: Optional[Callable[..., Hashable]] = None, namespace: Optional[str] = None):
+    """
+    Decorator that coalesces concurrent calls with the same key.
+    Works on both plain and `async def` functions. `key` follows the same
+    convention as `simple_cache`.
+    """
+    key_func = key or default_key
+
+    def decorator(func: Callable):
+        func_namespace = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                flight_key = (func_namespace, key_func(*args, **kwargs))
+                return await default_flights.do_async(flight_key, func, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            flight_key = (func_namespace, key_func(*args, **kwargs))
+            return default_flights.do(flight_key, func, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,262 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from app.core.cache.base import CacheBackend, USE_DEFAULT_TTL
+from app.core.cache.stats import CacheStats, cache_stats, namespace_of
+
+# Bumped whenever the layout below changes. The cache file holds nothing that
+# cannot be recomputed, so an outdated file is simply rebuilt.
+_SCHEMA_VERSION = 3
+
+# Generation row bumped by `clear`; every token includes it.
+_EPOCH_TAG = ""
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+DROP TABLE IF EXISTS cache_tag_generations;
+DROP TABLE IF EXISTS cache_tags;
+DROP TABLE IF EXISTS cache_entries;
+CREATE TABLE cache_entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX ix_cache_entries_expires_at ON cache_entries (expires_at);
+CREATE INDEX ix_cache_entries_last_access ON cache_entries (last_access);
+CREATE TABLE cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX ix_cache_tags_key ON cache_tags (key);
+CREATE TABLE cache_tag_generations (
+    tag TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    A cache stored in a local SQLite file so that every worker process on
+    the host reads and invalidates the same entries.
+
+    Values are pickled and every write runs in its own IMMEDIATE transaction,
+    so readers in other processes never see a half-written entry or a tag
+    invalidation that removed only some of its keys. Eviction is
+    approximately LRU: the access time is refreshed at most once every
+    `touch_interval` seconds to keep reads from turning into writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: Optional[float] = 60,
+        sweep_interval: float = 30,
+        touch_interval: float = 5,
+        busy_timeout_ms: int = 5000,
+        stats: CacheStats = cache_stats
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self.touch_interval = touch_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.stats = stats
+
+        self._local = threading.local()
+        self._last_sweep = time.time()
+        conn = self._connect()
+        if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            conn.executescript(_SCHEMA + f"PRAGMA user_version = {_SCHEMA_VERSION}; COMMIT;")
+
+    # --- Connection handling ---
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return hashlib.sha256(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    # --- CacheBackend interface ---
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        encoded = self._encode_key(key)
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT value, expires_at, last_access FROM cache_entries WHERE key = ?", (encoded,)
+        ).fetchone()
+        if row is None:
+            return False, None
+
+        value, expires_at, last_access = row
+        if expires_at is not None and now >= expires_at:
+            with self._transaction() as conn:
+                if self._remove(conn, [encoded]):
+                    self.stats.record_expiration(namespace_of(key))
+            return False, None
+        if now - last_access >= self.touch_interval:
+            self._connect().execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, encoded))
+        try:
+            return True, pickle.loads(value)
+        except Exception:
+            # An entry written by an incompatible code version is treated as a miss.
+            self.delete(key)
+            return False, None
+
+    def tag_generation(self, tags: Iterable[str]) -> Hashable:
+        return self._generation(self._connect(), tuple(tags))
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = USE_DEFAULT_TTL,
+        tags: Iterable[str] = (),
+        generation: Optional[Hashable] = None
+    ) -> None:
+        tags = tuple(tags)
+        if ttl is USE_DEFAULT_TTL:
+            ttl = self.default_ttl
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Unpicklable results are simply not shared.
+            return
+        if len(payload) > self.max_bytes:
+            self.delete(key)
+            return
+
+        encoded = self._encode_key(key)
+        now = time.time()
+        with self._transaction() as conn:
+            # Computed before a write invalidated its tags (in any worker): the value is already stale.
+            if generation is not None and generation != self._generation(conn, tags):
+                return
+            self._remove(conn, [encoded])
+            conn.execute(
+                "INSERT INTO cache_entries (key, namespace, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (encoded, namespace_of(key), payload, len(payload), now + ttl if ttl is not None else None, now)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, encoded) for tag in tags]
+            )
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(conn, now)
+            self._enforce_limits(conn)
+
+    def delete(self, key: Hashable) -> bool:
+        with self._transaction() as conn:
+            return self._remove(conn, [self._encode_key(key)]) > 0
+
+    def invalidate_tags(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        placeholders = ",".join("?" * len(tags))
+        with self._transaction() as conn:
+            self._bump_generations(conn, tags)
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM cache_tags WHERE tag IN ({placeholders})", tags
+            )]
+            return self._remove(conn, keys)
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cache_tags")
+            conn.execute("DELETE FROM cache_entries")
+            self._bump_generations(conn, (_EPOCH_TAG,))
+
+    def sweep_expired(self) -> int:
+        with self._transaction() as conn:
+            return self._sweep(conn, time.time())
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        rows = self._connect().execute(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries GROUP BY namespace"
+        )
+        return {namespace: {"entries": count, "bytes": size} for namespace, count, size in rows}
+
+    @property
+    def total_bytes(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    # --- Internals (called inside an open transaction) ---
+
+    def _generation(self, conn: sqlite3.Connection, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        wanted = (_EPOCH_TAG,) + tags
+        placeholders = ",".join("?" * len(wanted))
+        current = dict(conn.execute(
+            f"SELECT tag, generation FROM cache_tag_generations WHERE tag IN ({placeholders})", wanted
+        ).fetchall())
+        return tuple(current.get(tag, 0) for tag in wanted)
+
+    def _bump_generations(self, conn: sqlite3.Connection, tags: Iterable[str]) -> None:
+        conn.executemany(
+            "INSERT INTO cache_tag_generations (tag, generation) VALUES (?, 1) "
+            "ON CONFLICT (tag) DO UPDATE SET generation = generation + 1",
+            [(tag,) for tag in tags]
+        )
+
+    def _remove(self, conn: sqlite3.Connection, keys) -> int:
+        removed = 0
+        for key in keys:
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            removed += conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount
+        return removed
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> int:
+        rows = conn.execute(
+            "SELECT key, namespace FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).fetchall()
+        for _, namespace in rows:
+            self.stats.record_expiration(namespace)
+        self._last_sweep = now
+        return self._remove(conn, [key for key, _ in rows])
+
+    def _enforce_limits(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        victims = []
+        for key, namespace, size in conn.execute("SELECT key, namespace, size FROM cache_entries ORDER BY last_access"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append(key)
+            self.stats.record_eviction(namespace)
+            count -= 1
+            total -= size
+        self._remove(conn, victims)
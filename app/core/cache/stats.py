@@ -0,0 +1,81 @@
+import threading
+from typing import Any, Dict, Hashable
+
+def namespace_of(key: Hashable) -> str:
+    """Cache keys built by the decorators are `(namespace, key)` pairs."""
+    if isinstance(key, tuple) and key and isinstance(key[0], str):
+        return key[0]
+    return "default"
+
+class NamespaceStats:
+    __slots__ = ("hits", "misses", "coalesced", "evictions", "expirations", "miss_seconds")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.miss_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "miss_compute_seconds": round(self.miss_seconds, 4),
+            "avg_miss_compute_ms": round(self.miss_seconds * 1000 / self.misses, 2) if self.misses else None
+        }
+
+class CacheStats:
+    """
+    Per-namespace cache counters for this worker process.
+    `misses` counts computations actually run; callers that waited on an
+    in-flight computation are counted as `coalesced`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, NamespaceStats] = {}
+
+    def _get(self, namespace: str) -> NamespaceStats:
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces.setdefault(namespace, NamespaceStats())
+        return stats
+
+    def record_hit(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).hits += 1
+
+    def record_miss(self, namespace: str, compute_seconds: float) -> None:
+        with self._lock:
+            stats = self._get(namespace)
+            stats.misses += 1
+            stats.miss_seconds += compute_seconds
+
+    def record_coalesced(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).coalesced += 1
+
+    def record_eviction(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).evictions += 1
+
+    def record_expiration(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).expirations += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {ns: stats.to_dict() for ns, stats in self._namespaces.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._namespaces.clear()
+
+cache_stats = CacheStats()
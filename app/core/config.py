@@ -1,8 +1,12 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# app/core/config.py -> app/core -> app -> project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
 # --- JWT Settings ---
 # A strong, secret key is required for signing JWTs.
 # For production, this should be set via environment variables.
@@ -10,3 +14,90 @@ load_dotenv()
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "a_very_insecure_default_secret_key_for_dev_only")
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_HOURS = 24
+
+# --- Cache Settings ---
+# "memory" keeps a private cache per worker process. "sqlite" stores entries in
+# a local file shared by every worker on the host, so results and tag
+# invalidations are consistent across processes.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_SQLITE_PATH = os.getenv(
+    "CACHE_SQLITE_PATH",
+    str(PROJECT_ROOT.joinpath("prosi_mini_cache.db"))
+)
+# Upper bounds for the in-process result cache. Entries are evicted in
+# least-recently-used order once either limit is reached.
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# How often (in seconds) expired entries are swept out, in addition to the
+# lazy expiry check performed on every read.
+CACHE_SWEEP_INTERVAL_SECONDS = float(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "30"))
+
+# --- Database Settings ---
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{PROJECT_ROOT.joinpath('prosi_mini.db')}")
+# Used by the async read path; derived from DATABASE_URL (aiosqlite driver) when unset.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# Sized for Starlette's threadpool (40 worker threads by default), so a sync
+# endpoint never waits on the pool while a thread is available.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "40"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# SQLite pragmas applied to every new connection.
+# WAL lets readers proceed while a writer commits; NORMAL is durable under WAL
+# except for the last transactions on power loss.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+SQLITE_MMAP_SIZE_BYTES = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# How often the planner statistics are refreshed (PRAGMA optimize). 0 disables it.
+DB_OPTIMIZE_INTERVAL_SECONDS = float(os.getenv("DB_OPTIMIZE_INTERVAL_SECONDS", "3600"))
+
+# --- Ingestion Settings ---
+# Adapters fetch and normalize concurrently in a bounded thread pool; writes
+# are applied one source at a time because SQLite has a single writer.
+INGESTION_MAX_WORKERS = int(os.getenv("INGESTION_MAX_WORKERS", "4"))
+# A source that has not produced its records within this many seconds is
+# reported as timed out and skipped for the run.
+INGESTION_SOURCE_TIMEOUT_SECONDS = float(os.getenv("INGESTION_SOURCE_TIMEOUT_SECONDS", "30"))
+# Records per chunk in the streaming pipeline; each chunk is one bulk write.
+INGESTION_CHUNK_SIZE = int(os.getenv("INGESTION_CHUNK_SIZE", "500"))
+# When set, adapters fetch their source over HTTP from `<base_url>/<source_name>`
+# (e.g. the stub server in scripts/stub_source_server.py) instead of their
+# built-in sample payloads.
+INGESTION_SOURCE_BASE_URL = os.getenv("INGESTION_SOURCE_BASE_URL") or None
+# Page requests kept in flight per source by the async fetch path.
+INGESTION_FETCH_CONCURRENCY = int(os.getenv("INGESTION_FETCH_CONCURRENCY", "8"))
+INGESTION_PAGE_SIZE = int(os.getenv("INGESTION_PAGE_SIZE", "100"))
+
+# --- Deduplication Settings ---
+# Country calling code assumed for phone numbers written in national format
+# (e.g. "0812..."), used when normalizing them to E.164 for duplicate detection.
+DEDUP_DEFAULT_COUNTRY_CODE = os.getenv("DEDUP_DEFAULT_COUNTRY_CODE", "62")
+
+# --- Decision Settings ---
+# Recommendations are memoized per input fingerprint for this many seconds,
+# so repeat requests return the DTIDs already traced for those inputs.
+DECISION_CACHE_TTL_SECONDS = int(os.getenv("DECISION_CACHE_TTL_SECONDS", "300"))
+
+# --- File Import Settings ---
+# Partner lead dumps (CSV or Parquet) can only be imported from this directory.
+INGESTION_IMPORT_DIR = Path(os.getenv("INGESTION_IMPORT_DIR", str(PROJECT_ROOT.joinpath("imports"))))
+
+# --- WhatsApp Webhook Settings ---
+# Inbound messages wait in a bounded in-process queue; a background flusher
+# writes them in one bulk upsert every WEBHOOK_FLUSH_INTERVAL_MS or once
+# WEBHOOK_FLUSH_MAX_MESSAGES have arrived, whichever comes first.
+WEBHOOK_QUEUE_MAX_SIZE = int(os.getenv("WEBHOOK_QUEUE_MAX_SIZE", "10000"))
+WEBHOOK_FLUSH_INTERVAL_MS = float(os.getenv("WEBHOOK_FLUSH_INTERVAL_MS", "200"))
+WEBHOOK_FLUSH_MAX_MESSAGES = int(os.getenv("WEBHOOK_FLUSH_MAX_MESSAGES", "500"))
+# Verification token for the webhook subscription handshake, and the app
+# secret used to check X-Hub-Signature-256. Deliveries are rejected while the
+# secret is unset, unless unsigned ones are explicitly allowed for local
+# development.
+WHATSAPP_VERIFY_TOKEN = os.getenv("WHATSAPP_VERIFY_TOKEN")
+WHATSAPP_APP_SECRET = os.getenv("WHATSAPP_APP_SECRET")
+WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS = os.getenv("WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS", "false").lower() in ("1", "true", "yes")
+
+# --- Lead Notes ---
+# How many of a lead's most recent notes list views include.
+LEAD_NOTES_PREVIEW_COUNT = int(os.getenv("LEAD_NOTES_PREVIEW_COUNT", "3"))
@@ -1,21 +1,109 @@
-import os
-from pathlib import Path
-from sqlalchemy import create_engine
+import logging
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# --- Absolute Path for Database ---
-# Build a path to the project root directory
-# app/core/database.py -> app/core -> app -> prosi-mini
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-DB_NAME = "prosi_mini.db"
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{PROJECT_ROOT.joinpath(DB_NAME)}"
+from app.core.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE_KIB,
+    SQLITE_MMAP_SIZE_BYTES,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
 
-# print(f"Database URL: {SQLALCHEMY_DATABASE_URL}") # For debugging
+# This is the single source of truth for the database engine and sessions.
+# `app.database` re-exports it for older imports.
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+def to_async_url(url: str) -> str:
+    """Maps a sync SQLite URL onto the aiosqlite driver."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+SQLALCHEMY_ASYNC_DATABASE_URL = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        # A negative cache_size is interpreted by SQLite as KiB rather than pages.
+        cursor.execute(f"PRAGMA cache_size = -{int(SQLITE_CACHE_SIZE_KIB)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(SQLITE_MMAP_SIZE_BYTES)}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+    finally:
+        cursor.close()
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, **engine_kwargs) -> Engine:
+    """
+    Builds an engine with production settings.
+    File-backed SQLite databases get WAL journaling, tuned pragmas and a
+    connection pool sized for the request threadpool. In-memory databases
+    keep SQLAlchemy's defaults.
+    """
+    if not _is_sqlite(url):
+        return create_engine(url, pool_pre_ping=True, **engine_kwargs)
+
+    connect_args = engine_kwargs.pop("connect_args", {})
+    connect_args.setdefault("check_same_thread", False)
+
+    if _is_memory_sqlite(url):
+        return create_engine(url, connect_args=connect_args, **engine_kwargs)
+
+    engine_kwargs.setdefault("pool_size", DB_POOL_SIZE)
+    engine_kwargs.setdefault("max_overflow", DB_MAX_OVERFLOW)
+    engine_kwargs.setdefault("pool_timeout", DB_POOL_TIMEOUT_SECONDS)
+    db_engine = create_engine(url, connect_args=connect_args, **engine_kwargs)
+    event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+def create_async_db_engine(url: str = SQLALCHEMY_ASYNC_DATABASE_URL, **engine_kwargs) -> AsyncEngine:
+    """
+    Async counterpart of `create_db_engine`, used by read-heavy endpoints.
+    File-backed SQLite gets the same pragmas as the sync engine.
+    """
+    if not _is_sqlite(url):
+        return create_async_engine(url, pool_pre_ping=True, **engine_kwargs)
+
+    if _is_memory_sqlite(url):
+        return create_async_engine(url, **engine_kwargs)
+
+    engine_kwargs.setdefault("pool_size", DB_POOL_SIZE)
+    engine_kwargs.setdefault("max_overflow", DB_MAX_OVERFLOW)
+    engine_kwargs.setdefault("pool_timeout", DB_POOL_TIMEOUT_SECONDS)
+    db_engine = create_async_engine(url, **engine_kwargs)
+    event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+def optimize_database(db_engine: Engine) -> None:
+    """
+    Refreshes the query planner statistics. SQLite only re-analyzes tables
+    whose contents changed noticeably, so this is cheap to run periodically.
+    """
+    if db_engine.dialect.name != "sqlite":
+        return
+    try:
+        with db_engine.connect() as conn:
+            conn.execute(text("PRAGMA analysis_limit = 1000"))
+            conn.execute(text("PRAGMA optimize"))
+    except Exception as e:
+        logging.warning(f"Database optimize failed: {e}")
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -27,3 +115,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Read-only endpoints use AsyncSession so that waiting on SQLite does not
+# occupy a threadpool slot. Writes stay on the sync session above.
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
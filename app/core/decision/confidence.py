@@ -3,8 +3,9 @@ from typing import Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
 from app.schemas.confidence import ConfidenceInput, ConfidenceScore, ConfidenceSignal, DataSource
 from app.services.lead_service import get_all_leads
-from app.ingestion.registry import registry
+from app.services.ingestion_run_service import get_latest_summary
 from app.services.explainability import generate_explanation
+from app.core.cache import single_flight
 
 # --- Configuration ---
 WEIGHTS = {
@@ -16,6 +17,9 @@ WEIGHTS = {
 }
 DECAY_RATE_PER_HOUR = 2.0
 SOURCE_TRUST = {"crm": 100, "api": 90, "scraper": 60, "manual": 70}
+# Ingestion adapters are named after their channel; map them onto the kind of
+# source they are.
+SOURCE_TYPES = {"fb_ads": DataSource.API, "whatsapp": DataSource.API}
 
 def map_score_to_status(score: float) -> str:
     if score >= 85: return "HIGH"
@@ -47,6 +51,14 @@ def _calculate_ingestion_health(completeness_score: float) -> Tuple[float, str]:
     else: msg = "Pipeline encountered errors."
     return score, msg
 
+def _source_type(source_name: str) -> DataSource:
+    if source_name in SOURCE_TYPES:
+        return SOURCE_TYPES[source_name]
+    try:
+        return DataSource(source_name)
+    except ValueError:
+        return DataSource.MANUAL
+
 def _calculate_source_reliability(source_type: str) -> Tuple[float, str]:
     score = float(SOURCE_TRUST.get(source_type, 50))
     status = map_score_to_status(score).lower()
@@ -100,15 +112,18 @@ def calculate_confidence(input_data: ConfidenceInput) -> ConfidenceScore:
         decision_guidance=explanation["decision_guidance"]
     )
 
+# Concurrent dashboard requests share one evaluation instead of each
+# re-reading the lead table.
+@single_flight(key=lambda db: ())
 def get_system_confidence(db: Session) -> ConfidenceScore:
     leads = get_all_leads(db)
-    ingestion_summary = registry.last_summary or {}
+    ingestion_summary = get_latest_summary(db) or {}
 
     input_data = ConfidenceInput(
         last_updated=ingestion_summary.get("end_time", datetime.now(timezone.utc)),
         total_records=ingestion_summary.get("total_processed", len(leads) or 0),
         failed_records=ingestion_summary.get("total_failed", 0),
-        source_type=ingestion_summary.get("sources", [{}])[0].get("name", "manual")
+        source_type=_source_type((ingestion_summary.get("sources") or [{}])[0].get("name", "manual"))
     )
     
     return calculate_confidence(input_data)
@@ -1,8 +1,13 @@
-from typing import List, Dict, Any
+import hashlib
+import json
+from typing import List, Dict, Any, Optional
 from app.schemas.decision import DecisionRecommendation, RecommendationPriority, SuggestedOwner
-from app.schemas.rule_result import RuleResult
+from app.core.decision.rules import RuleEvaluation, evaluate_rules, get_evaluation_plan
 from app.core.auth.security import UserRole
 
+# Bump when recommendation logic changes; recorded on snapshots and part of the input fingerprint.
+ENGINE_VERSION = "v1.0"
+
 # --- Persona Weighting Configuration ---
 PERSONA_WEIGHTS = {
     UserRole.FOUNDER: 1.3,
@@ -11,71 +16,55 @@ PERSONA_WEIGHTS = {
     UserRole.VIEWER: 1.0
 }
 
-def check_confidence_threshold(confidence_score: float) -> RuleResult:
-    passed = confidence_score >= 60
-    return RuleResult(
-        rule_id="CONFIDENCE_CHECK",
-        passed=passed,
-        weight=0.5,
-        explanation=f"System confidence score is {confidence_score}%, which is {'above' if passed else 'below'} the 60% minimum threshold."
-    )
-
-def check_policy_violation(metrics: Dict[str, Any]) -> RuleResult:
-    violation = metrics.get("duplicate_rate", 0) > 5
-    return RuleResult(
-        rule_id="POLICY_VIOLATION_CHECK",
-        passed=not violation,
-        weight=0.3,
-        explanation=f"Data duplication rate is {metrics.get('duplicate_rate', 0)}%, which {'does not violate' if not violation else 'violates'} the 5% policy."
-    )
-
-def check_data_completeness(metrics: Dict[str, Any]) -> RuleResult:
-    passed = metrics.get("data_completeness", 0) >= 70
-    return RuleResult(
-        rule_id="COMPLETENESS_CHECK",
-        passed=passed,
-        weight=0.2,
-        explanation=f"Data completeness is {metrics.get('data_completeness', 0)}%, which is {'above' if passed else 'below'} the 70% minimum threshold."
-    )
-
-def explain_decision(decision: DecisionRecommendation, rule_results: List[RuleResult]) -> Dict[str, Any]:
-    passed_rules = [r for r in rule_results if r.passed]
-    failed_rules = [r for r in rule_results if not r.passed]
+def recommendation_fingerprint(
+    analytics_metrics: Dict[str, Any],
+    confidence_score: float,
+    persona: UserRole
+) -> str:
+    """
+    Stable hash of everything a persona's recommendations depend on: the
+    inputs, the persona, the engine version and the compiled rule set.
+    """
+    payload = json.dumps({
+        "metrics": analytics_metrics,
+        "confidence": confidence_score,
+        "persona": persona.value if persona else None,
+        "engine": ENGINE_VERSION,
+        "rules": get_evaluation_plan().signature
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-    if not failed_rules:
+def explain_decision(decision: DecisionRecommendation, evaluation: RuleEvaluation) -> Dict[str, Any]:
+    if evaluation.all_passed:
         summary = f"Recommendation '{decision.title}' is fully supported by all system checks."
     else:
-        summary = f"Recommendation '{decision.title}' is generated despite {len(failed_rules)} warning(s)."
-
-    contributing_factors = [r.explanation for r in passed_rules]
-    triggered_rule_ids = [r.rule_id for r in rule_results]
+        summary = f"Recommendation '{decision.title}' is generated despite {evaluation.failed_count} warning(s)."
 
     return {
         "summary": summary,
-        "contributing_factors": contributing_factors,
-        "triggered_rule_ids": triggered_rule_ids
+        "contributing_factors": list(evaluation.contributing_factors),
+        "triggered_rule_ids": list(evaluation.triggered_rule_ids)
     }
 
 def generate_recommendations(
     analytics_metrics: Dict[str, Any], 
     confidence_score: float,
-    persona: UserRole
+    persona: UserRole,
+    evaluation: Optional[RuleEvaluation] = None
 ) -> List[DecisionRecommendation]:
     """
     Generates recommendations based on analytics, confidence, and persona weighting.
+    Rule results are evaluated once per call unless a precomputed `evaluation` is passed.
     """
     recommendations = []
     
     weight_multiplier = PERSONA_WEIGHTS.get(persona, 1.0)
     weighted_confidence = min(100, int(confidence_score * weight_multiplier))
 
-    rule_results = [
-        check_confidence_threshold(confidence_score),
-        check_policy_violation(analytics_metrics),
-        check_data_completeness(analytics_metrics)
-    ]
+    if evaluation is None:
+        evaluation = evaluate_rules(analytics_metrics, confidence_score)
 
-    if all(r.passed for r in rule_results):
+    if evaluation.all_passed:
         rec = DecisionRecommendation(
             title="Proceed with Automated Outreach",
             recommendation="All system checks passed. It is safe to proceed with automated marketing campaigns.",
@@ -86,12 +75,12 @@ def generate_recommendations(
             suggested_owner=SuggestedOwner.MARKETING,
             governance_flags=[] # Explicitly provide empty list
         )
-        explanation = explain_decision(rec, rule_results)
+        explanation = explain_decision(rec, evaluation)
         rec.explainability_summary = explanation["summary"]
         rec.explanation = explanation
         recommendations.append(rec)
 
-    if not check_data_completeness(analytics_metrics).passed:
+    if not evaluation.passed("COMPLETENESS_CHECK"):
         rec = DecisionRecommendation(
             title="Address Data Completeness",
             recommendation="Data completeness is below the 70% threshold. Prioritize data enrichment activities.",
@@ -102,7 +91,7 @@ def generate_recommendations(
             suggested_owner=SuggestedOwner.OPS,
             governance_flags=["data_gap"] # Provide governance flag
         )
-        explanation = explain_decision(rec, rule_results)
+        explanation = explain_decision(rec, evaluation)
         rec.explainability_summary = explanation["summary"]
         rec.explanation = explanation
         recommendations.append(rec)
@@ -120,3 +109,20 @@ def filter_recommendations_by_persona(recommendations: List[DecisionRecommendati
     elif persona == UserRole.OPS_CRM:
         return [rec for rec in recommendations if rec.suggested_owner == SuggestedOwner.OPS]
     return recommendations
+
+def generate_persona_feeds(
+    analytics_metrics: Dict[str, Any],
+    confidence_score: float,
+    personas: Optional[List[UserRole]] = None
+) -> Dict[UserRole, List[DecisionRecommendation]]:
+    """
+    Builds the filtered recommendation feed for each persona (all of them by
+    default). Rules are evaluated once and shared; only persona weighting and
+    filtering run per persona.
+    """
+    evaluation = evaluate_rules(analytics_metrics, confidence_score)
+    feeds = {}
+    for persona in personas or list(PERSONA_WEIGHTS):
+        recommendations = generate_recommendations(analytics_metrics, confidence_score, persona, evaluation=evaluation)
+        feeds[persona] = filter_recommendations_by_persona(recommendations, persona)
+    return feeds
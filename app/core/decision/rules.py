@@ -0,0 +1,138 @@
+import hashlib
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.schemas.rule_result import RuleResult
+
+# Comparisons a rule may use; the rule passes when `compare(value, threshold)` holds.
+COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+}
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A declarative decision check. `metric` is read from the evaluation
+    input (analytics metrics plus `confidence_score`) and compared against
+    `threshold`. `explanation` is formatted with `value`, `threshold` and
+    `verdict`, where the verdict is `verdicts[0]` on pass and `verdicts[1]`
+    on failure.
+    """
+    rule_id: str
+    metric: str
+    comparator: str
+    threshold: float
+    weight: float
+    explanation: str
+    verdicts: Tuple[str, str] = ("above", "below")
+    default: Any = 0
+
+@dataclass(frozen=True)
+class RuleEvaluation:
+    """The outcome of one pass over a metrics snapshot, shared by every recommendation."""
+    results: Tuple[RuleResult, ...]
+    by_id: Dict[str, RuleResult]
+    contributing_factors: Tuple[str, ...]
+    triggered_rule_ids: Tuple[str, ...]
+    failed_count: int
+
+    @property
+    def all_passed(self) -> bool:
+        return self.failed_count == 0
+
+    def passed(self, rule_id: str) -> bool:
+        return self.by_id[rule_id].passed
+
+class EvaluationPlan:
+    """
+    Rules compiled into a flat list of steps with the comparator resolved,
+    so evaluating a snapshot is a single loop with no lookups per rule.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        seen = set()
+        steps = []
+        for rule in rules:
+            if rule.rule_id in seen:
+                raise ValueError(f"Duplicate decision rule id '{rule.rule_id}'")
+            if rule.comparator not in COMPARATORS:
+                raise ValueError(f"Rule '{rule.rule_id}' has unknown comparator '{rule.comparator}'")
+            seen.add(rule.rule_id)
+            steps.append((rule, COMPARATORS[rule.comparator]))
+        self.steps = tuple(steps)
+        # Identifies the compiled rule set, so cached outputs of another set are never reused.
+        self.signature = hashlib.sha256(repr(tuple(rules)).encode()).hexdigest()[:12]
+
+    def evaluate(self, analytics_metrics: Dict[str, Any], confidence_score: float) -> RuleEvaluation:
+        inputs = {**analytics_metrics, "confidence_score": confidence_score}
+        results = []
+        for rule, compare in self.steps:
+            value = inputs.get(rule.metric, rule.default)
+            passed = bool(compare(value, rule.threshold))
+            results.append(RuleResult(
+                rule_id=rule.rule_id,
+                passed=passed,
+                weight=rule.weight,
+                explanation=rule.explanation.format(
+                    value=value,
+                    threshold=rule.threshold,
+                    verdict=rule.verdicts[0] if passed else rule.verdicts[1]
+                )
+            ))
+        return RuleEvaluation(
+            results=tuple(results),
+            by_id={r.rule_id: r for r in results},
+            contributing_factors=tuple(r.explanation for r in results if r.passed),
+            triggered_rule_ids=tuple(r.rule_id for r in results),
+            failed_count=sum(1 for r in results if not r.passed)
+        )
+
+# --- Rule Registry ---
+RULES: List[Rule] = [
+    Rule(
+        rule_id="CONFIDENCE_CHECK",
+        metric="confidence_score",
+        comparator=">=",
+        threshold=60,
+        weight=0.5,
+        explanation="System confidence score is {value}%, which is {verdict} the {threshold:g}% minimum threshold."
+    ),
+    Rule(
+        rule_id="POLICY_VIOLATION_CHECK",
+        metric="duplicate_rate",
+        comparator="<=",
+        threshold=5,
+        weight=0.3,
+        explanation="Data duplication rate is {value}%, which {verdict} the {threshold:g}% policy.",
+        verdicts=("does not violate", "violates")
+    ),
+    Rule(
+        rule_id="COMPLETENESS_CHECK",
+        metric="data_completeness",
+        comparator=">=",
+        threshold=70,
+        weight=0.2,
+        explanation="Data completeness is {value}%, which is {verdict} the {threshold:g}% minimum threshold."
+    ),
+]
+
+_plan: Optional[EvaluationPlan] = None
+
+def register_rule(rule: Rule) -> None:
+    """Adds a rule to the registry and recompiles the plan, rejecting invalid rules."""
+    global _plan
+    _plan = EvaluationPlan(RULES + [rule])
+    RULES.append(rule)
+
+def get_evaluation_plan() -> EvaluationPlan:
+    """Returns the compiled plan for the registry, compiling it on first use."""
+    global _plan
+    if _plan is None:
+        _plan = EvaluationPlan(RULES)
+    return _plan
+
+def evaluate_rules(analytics_metrics: Dict[str, Any], confidence_score: float) -> RuleEvaluation:
+    return get_evaluation_plan().evaluate(analytics_metrics, confidence_score)
@@ -1,9 +1,13 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 from datetime import datetime
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogCreate
-from app.core.cache import simple_cache, clear_cache
+from app.core.cache import simple_cache, invalidate_tags
+from app.core.pagination import Page, keyset_query, build_page
+from app.core.unit_of_work import UnitOfWork
 
 def create_audit_log_entry(db: Session, event: AuditLogCreate) -> AuditLog:
     """
@@ -14,31 +18,80 @@ def create_audit_log_entry(db: Session, event: AuditLogCreate) -> AuditLog:
     db.add(db_log)
     db.commit()
     db.refresh(db_log)
-    clear_cache() # Invalidate cache whenever a new log is created
+    invalidate_tags("audit_logs") # Only audit log queries depend on this write
     return db_log
 
-@simple_cache(ttl=60)
-def get_audit_logs(
+def stage_audit_log_entry(uow: UnitOfWork, event: AuditLogCreate) -> None:
+    """
+    Batched variant of `create_audit_log_entry`: the entry is inserted with
+    the rest of the unit of work, which invalidates the audit log cache on commit.
+    """
+    uow.add(AuditLog, event.model_dump(), tags=("audit_logs",))
+
+def _audit_logs_key(
     db: Session,
     event_type: Optional[str] = None,
     persona: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 100
-) -> List[AuditLog]:
-    """
-    Retrieves audit logs with optional filtering. This function is cached.
-    """
-    query = db.query(AuditLog)
+):
+    # Keyed on the query parameters only; the session changes on every request.
+    return (event_type, persona, start_date, end_date, cursor, limit)
+
+def _audit_logs_query(
+    event_type: Optional[str] = None,
+    persona: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+):
+    query = select(AuditLog)
 
     if event_type:
-        query = query.filter(AuditLog.event_type == event_type)
+        query = query.where(AuditLog.event_type == event_type)
     if persona:
-        query = query.filter(AuditLog.persona == persona)
+        query = query.where(AuditLog.persona == persona)
     if start_date:
-        query = query.filter(AuditLog.created_at >= start_date)
+        query = query.where(AuditLog.created_at >= start_date)
     if end_date:
-        query = query.filter(AuditLog.created_at <= end_date)
+        query = query.where(AuditLog.created_at <= end_date)
+
+    return keyset_query(query, AuditLog.created_at, AuditLog.id, cursor, limit)
+
+@simple_cache(ttl=60, key=_audit_logs_key, tags=("audit_logs",))
+def get_audit_logs(
+    db: Session,
+    event_type: Optional[str] = None,
+    persona: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[AuditLog]:
+    """
+    Retrieves a page of audit logs, newest first, with optional filtering.
+    Pass the returned `next_cursor` back to fetch the following page.
+    This function is cached.
+    """
+    query = _audit_logs_query(event_type, persona, start_date, end_date, cursor, limit)
+    return build_page(db.execute(query).all(), limit)
 
-    return query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+@simple_cache(ttl=60, key=_audit_logs_key, namespace=get_audit_logs.cache_namespace, tags=("audit_logs",))
+async def get_audit_logs_async(
+    db: AsyncSession,
+    event_type: Optional[str] = None,
+    persona: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[AuditLog]:
+    """
+    Async variant of `get_audit_logs`; both share one cache namespace.
+    """
+    query = _audit_logs_query(event_type, persona, start_date, end_date, cursor, limit)
+    result = await db.execute(query)
+    return build_page(result.all(), limit)
@@ -0,0 +1,179 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, func, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import Base
+
+# Schema changes are applied by numbered migrations and recorded in
+# `schema_version`. Every migration must be idempotent, so a database that was
+# built by the old import-time `create_all`, or a second worker racing the
+# first one at boot, converges on the same schema.
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now())
+)
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+def _create_baseline_schema(conn: Connection) -> None:
+    # Importing the models registers every table on Base.metadata.
+    import app.models  # noqa: F401
+    import app.models.decision_memory  # noqa: F401
+    Base.metadata.create_all(bind=conn)
+
+def _add_decision_proposal_sla_columns(conn: Connection) -> None:
+    # Databases created before SLA escalation lack these columns, which made
+    # the startup SLA check fail.
+    existing = {column["name"] for column in inspect(conn).get_columns("decision_proposals")}
+    if "decided_at" not in existing:
+        conn.execute(text("ALTER TABLE decision_proposals ADD COLUMN decided_at DATETIME"))
+    if "escalated" not in existing:
+        conn.execute(text("ALTER TABLE decision_proposals ADD COLUMN escalated BOOLEAN DEFAULT 0"))
+
+def _add_hot_query_indexes(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_audit_logs_event_type_created_at "
+        "ON audit_logs (event_type, created_at)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_decision_feedback_persona_decision "
+        "ON decision_feedback (persona, decision)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_decision_proposals_status_escalated_created_at "
+        "ON decision_proposals (status, escalated, created_at)"
+    ))
+
+def _add_keyset_pagination_indexes(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at_id "
+        "ON audit_logs (created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_decision_memories_created_at_id "
+        "ON decision_memories (created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_decision_snapshots_created_at_decision_id "
+        "ON decision_snapshots (created_at, decision_id)"
+    ))
+
+def _create_ingestion_watermarks(conn: Connection) -> None:
+    from app.models.ingestion_watermark import IngestionWatermark
+    IngestionWatermark.__table__.create(bind=conn, checkfirst=True)
+
+def _create_ingestion_run_history(conn: Connection) -> None:
+    from app.models.ingestion_run import IngestionRun, IngestionSourceRun
+    IngestionRun.__table__.create(bind=conn, checkfirst=True)
+    IngestionSourceRun.__table__.create(bind=conn, checkfirst=True)
+
+def _create_ingestion_dead_letters(conn: Connection) -> None:
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+    IngestionDeadLetter.__table__.create(bind=conn, checkfirst=True)
+
+# Separator the old upsert used when appending notes to leads.notes.
+_LEGACY_NOTES_SEPARATOR = "\n---\n"
+_NOTES_COPY_BATCH_SIZE = 1000
+
+def _move_lead_notes_to_child_table(conn: Connection) -> None:
+    from app.models.lead_note import LeadNote
+    LeadNote.__table__.create(bind=conn, checkfirst=True)
+    if "notes" not in {column["name"] for column in inspect(conn).get_columns("leads")}:
+        return
+
+    # Each appended section of the old text column becomes its own note, in
+    # the order it was appended, repeats included.
+    rows = conn.execute(text("SELECT id, notes FROM leads WHERE notes IS NOT NULL AND notes != '' ORDER BY id"))
+    batch = []
+    for lead_id, notes in rows:
+        for body in notes.split(_LEGACY_NOTES_SEPARATOR):
+            body = body.strip()
+            # The old upsert wrote a literal "None" when appending to an empty note.
+            if body and body != "None":
+                batch.append({"lead_id": lead_id, "body": body})
+        if len(batch) >= _NOTES_COPY_BATCH_SIZE:
+            conn.execute(LeadNote.__table__.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(LeadNote.__table__.insert(), batch)
+    conn.execute(text("ALTER TABLE leads DROP COLUMN notes"))
+
+def _key_lead_notes_by_delivery(conn: Connection) -> None:
+    # The first lead_notes layout kept one copy of each note text per lead,
+    # which dropped repeated messages. Notes are now deduplicated on the
+    # delivery that carried them instead.
+    columns = {column["name"] for column in inspect(conn).get_columns("lead_notes")}
+    conn.execute(text("DROP INDEX IF EXISTS ux_lead_notes_lead_id_body_hash"))
+    if "body_hash" in columns:
+        conn.execute(text("ALTER TABLE lead_notes DROP COLUMN body_hash"))
+    if "delivery_key" not in columns:
+        conn.execute(text("ALTER TABLE lead_notes ADD COLUMN delivery_key VARCHAR"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_lead_notes_lead_id_source_delivery_key "
+        "ON lead_notes (lead_id, source, delivery_key)"
+    ))
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema", _create_baseline_schema),
+    Migration(2, "decision_proposals SLA columns", _add_decision_proposal_sla_columns),
+    Migration(3, "composite indexes for audit, feedback and SLA queries", _add_hot_query_indexes),
+    Migration(4, "(created_at, id) indexes for keyset pagination", _add_keyset_pagination_indexes),
+    Migration(5, "ingestion_watermarks table", _create_ingestion_watermarks),
+    Migration(6, "ingestion run history tables", _create_ingestion_run_history),
+    Migration(7, "ingestion_dead_letters table", _create_ingestion_dead_letters),
+    Migration(8, "move lead notes to the append-only lead_notes table", _move_lead_notes_to_child_table),
+    Migration(9, "deduplicate lead notes on delivery instead of text", _key_lead_notes_by_delivery),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(conn: Connection) -> int:
+    """Returns the highest applied migration, or 0 for an unversioned database."""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def run_migrations(db_engine: Engine) -> int:
+    """
+    Brings the database up to `LATEST_VERSION` and returns the number of
+    migrations applied. An up-to-date database costs a single query.
+    """
+    with db_engine.connect() as conn:
+        current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return 0
+
+    with db_engine.begin() as conn:
+        _version_metadata.create_all(bind=conn)
+
+    applied = 0
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        try:
+            with db_engine.begin() as conn:
+                migration.apply(conn)
+                conn.execute(schema_version.insert().values(
+                    version=migration.version,
+                    description=migration.description
+                ))
+        except IntegrityError:
+            # Another worker recorded this version first.
+            continue
+        logging.info(f"Applied schema migration {migration.version}: {migration.description}")
+        applied += 1
+    return applied
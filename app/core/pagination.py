@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, and_, or_, type_coerce
+
+T = TypeVar("T")
+
+# Keyset pagination over (created_at, id), newest first. Each page seeks
+# straight to its position through the (created_at, id) index, so page 1000
+# costs the same as page one, unlike OFFSET which scans every skipped row.
+#
+# created_at is compared as the stored text rather than as a bound datetime:
+# SQLite's CURRENT_TIMESTAMP writes "YYYY-MM-DD HH:MM:SS" while bound
+# datetimes carry microseconds, so equal timestamps would not compare equal.
+
+CURSOR_COLUMN = "_cursor_created_at"
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+def encode_cursor(created_at: str, key: Any) -> str:
+    payload = json.dumps([created_at, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    if not isinstance(created_at, str):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    return created_at, key
+
+def keyset_query(query, created_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Orders `query` newest first and seeks past `cursor`. One extra row is
+    fetched to tell whether another page follows; pass the result rows to
+    `build_page`.
+    """
+    created_text = type_coerce(created_column, String)
+    query = query.add_columns(created_text.label(CURSOR_COLUMN))
+    if cursor:
+        created_at, key = decode_cursor(cursor)
+        query = query.where(or_(
+            created_text < created_at,
+            and_(created_text == created_at, id_column < key)
+        ))
+    return query.order_by(created_text.desc(), id_column.desc()).limit(limit + 1)
+
+def build_page(rows: Sequence[Any], limit: int, id_attr: str = "id") -> Page:
+    """Turns `(entity, created_at_text)` rows from `keyset_query` into a page."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [row[0] for row in rows]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, CURSOR_COLUMN), getattr(last[0], id_attr))
+    return Page(items=items, next_cursor=next_cursor)
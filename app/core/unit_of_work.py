@@ -0,0 +1,88 @@
+from typing import Any, Callable, Dict, Iterable, List
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session, SessionTransaction
+from app.core.cache import invalidate_tags
+
+# Session.info key holding the tags to invalidate when the session commits.
+_TAGS_ON_COMMIT = "cache_tags_on_commit"
+
+def invalidate_tags_on_commit(db: Session, *tags: str) -> None:
+    """
+    Invalidates `tags` once `db` commits, for writers whose caller owns the
+    commit. Invalidating earlier would let a concurrent read re-cache the
+    pre-write state before the write is visible. Dropped on rollback.
+    """
+    db.info.setdefault(_TAGS_ON_COMMIT, set()).update(tags)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session) -> None:
+    tags = session.info.pop(_TAGS_ON_COMMIT, None)
+    if tags:
+        invalidate_tags(*tags)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_tags(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A savepoint rollback leaves the outer transaction's writes pending.
+    if previous_transaction.parent is None:
+        session.info.pop(_TAGS_ON_COMMIT, None)
+
+class UnitOfWork:
+    """
+    Collects the rows a request writes and inserts them in one transaction,
+    one executemany per table, instead of a commit and refresh per row.
+    Rows must carry their own keys (e.g. a pre-generated DTID) since nothing
+    is read back. Use as a context manager: the work is committed when the
+    block exits cleanly and rolled back otherwise.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._rows: Dict[Any, List[Dict[str, Any]]] = {}
+        self._tags: set = set()
+        self._commit_callbacks: List[Callable[[], Any]] = []
+
+    def add(self, model, row: Dict[str, Any], tags: Iterable[str] = ()) -> None:
+        """Stages a row for `model`; `tags` are invalidated once it is committed."""
+        self._rows.setdefault(model, []).append(row)
+        self._tags.update(tags)
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        """
+        Registers work that may only happen once the staged rows exist, e.g.
+        caching ids that point at them. Dropped if the unit of work rolls back.
+        """
+        self._commit_callbacks.append(callback)
+
+    def pending(self) -> int:
+        return sum(len(rows) for rows in self._rows.values())
+
+    def _reset(self) -> None:
+        self._rows, self._tags, self._commit_callbacks = {}, set(), []
+
+    def commit(self) -> None:
+        try:
+            for model, rows in self._rows.items():
+                self.db.execute(insert(model.__table__), rows)
+            self.db.commit()
+        except Exception:
+            self.rollback()
+            raise
+        tags, callbacks = self._tags, self._commit_callbacks
+        self._reset()
+        if tags:
+            invalidate_tags(*tags)
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        self.db.rollback()
+        self._reset()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
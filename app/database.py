@@ -1,29 +1,5 @@
-import os
-from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+# Kept for backwards compatibility. The engine, sessions and declarative base
+# live in app.core.database; import from there in new code.
+from app.core.database import SQLALCHEMY_DATABASE_URL, engine, SessionLocal, Base, get_db
 
-# --- Absolute Path for Database ---
-# Build a path to the project root directory
-# app/database.py -> app -> prosi-mini
-PROJECT_ROOT = Path(__file__).parent.parent
-DB_NAME = "prosi_mini.db"
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{PROJECT_ROOT.joinpath(DB_NAME)}"
-
-# print(f"Database URL: {SQLALCHEMY_DATABASE_URL}") # For debugging
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+__all__ = ["SQLALCHEMY_DATABASE_URL", "engine", "SessionLocal", "Base", "get_db"]
@@ -1,13 +1,80 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional
+import httpx
+from pydantic import ValidationError
+from app.core.config import (
+    INGESTION_CHUNK_SIZE,
+    INGESTION_SOURCE_BASE_URL,
+    INGESTION_FETCH_CONCURRENCY,
+    INGESTION_PAGE_SIZE,
+    INGESTION_SOURCE_TIMEOUT_SECONDS,
+)
+from app.ingestion.watermarks import format_watermark
 from app.schemas.lead import LeadCreate
 
+# What normalizing or keying a malformed raw record can raise. Callers catch
+# these to reject that one record instead of failing its whole batch.
+NORMALIZE_ERRORS = (ValidationError, KeyError, IndexError, TypeError, ValueError, AttributeError)
+
+@dataclass
+class RejectedRecord:
+    raw: Dict[str, Any]
+    error: str
+
+@dataclass
+class IngestionChunk:
+    """One fixed-size slice of a source: the valid leads and the rejects."""
+    leads: List[LeadCreate] = field(default_factory=list)
+    rejected: List[RejectedRecord] = field(default_factory=list)
+    # Newest record watermark in the chunk; None for sources without one.
+    watermark: Optional[datetime] = None
+    # Leads validated column-wise by the adapter, already in `LeadCreate.model_dump()` shape.
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # `record_key` of each entry in `leads`, so a re-delivered record's note is stored once.
+    note_keys: List[Optional[str]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.leads) + len(self.rows) + len(self.rejected)
+
+    @property
+    def lead_count(self) -> int:
+        return len(self.leads) + len(self.rows)
+
+    def lead_rows(self) -> List[Dict[str, Any]]:
+        """Every valid lead in the chunk as a plain row for the bulk upsert."""
+        keys = self.note_keys or [None] * len(self.leads)
+        return [{**lead.model_dump(), "note_key": key} for lead, key in zip(self.leads, keys)] + self.rows
+
 class BaseIngestion(ABC):
     """
     Abstract base class for all data ingestion sources.
     It defines a standard interface for fetching and normalizing data.
+
+    Adapters implement either the streaming pair `iter_fetch` and
+    `normalize_record`, or the original list-based `fetch` and `normalize`.
+    Each pair has a default built on the other, so both kinds run through
+    the same chunked pipeline.
+
+    When `base_url` is set the pipeline reads from `aiter_fetch` instead,
+    which pulls paginated pages over HTTP with bounded concurrency.
+
+    Sources whose records carry a timestamp implement `record_watermark`.
+    Runs then only process records at or after the last committed
+    watermark. Such sources must yield records in ascending watermark order.
     """
-    
+
+    # Overrides INGESTION_SOURCE_TIMEOUT_SECONDS for a slow or fast source.
+    timeout_seconds: Optional[float] = None
+    chunk_size: int = INGESTION_CHUNK_SIZE
+    base_url: Optional[str] = INGESTION_SOURCE_BASE_URL
+    fetch_concurrency: int = INGESTION_FETCH_CONCURRENCY
+    page_size: int = INGESTION_PAGE_SIZE
+
     @property
     @abstractmethod
     def source_name(self) -> str:
@@ -20,25 +87,163 @@ class BaseIngestion(ABC):
         """A score from 0.0 to 1.0 indicating the reliability of the source."""
         pass
 
-    @abstractmethod
+    def _overrides(self, name: str) -> bool:
+        return getattr(type(self), name) is not getattr(BaseIngestion, name)
+
+    def iter_fetch(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields raw records from the source one at a time.
+        In a real implementation, this would page through an API or export.
+        """
+        if not self._overrides("fetch"):
+            raise NotImplementedError(f"{type(self).__name__} must implement iter_fetch or fetch")
+        return iter(self.fetch())
+
+    def normalize_record(self, raw: Dict[str, Any]) -> LeadCreate:
+        """Transforms one raw record into a standardized LeadCreate."""
+        if not self._overrides("normalize"):
+            raise NotImplementedError(f"{type(self).__name__} must implement normalize_record or normalize")
+        return self.normalize([raw])[0]
+
     def fetch(self) -> List[Dict[str, Any]]:
         """
-        Fetches raw data from the source.
-        In a real implementation, this would involve API calls.
+        Fetches all raw data from the source.
+        Prefer `iter_fetch`; this holds the whole source in memory.
         """
-        pass
+        return list(self.iter_fetch())
 
-    @abstractmethod
     def normalize(self, raw_data: List[Dict[str, Any]]) -> List[LeadCreate]:
         """
         Transforms the raw data from the source into a list of
         standardized LeadCreate Pydantic models.
         """
-        pass
+        return [self.normalize_record(raw) for raw in raw_data]
+
+    def record_watermark(self, raw: Dict[str, Any]) -> Optional[datetime]:
+        """The record's position for incremental runs, or None if the source has none."""
+        return None
+
+    def record_key(self, raw: Dict[str, Any]) -> Optional[str]:
+        """
+        The source's identity for a record, or None if it has none. A record
+        delivered again under the same key does not add its note twice.
+        """
+        return None
+
+    def note_key(self, raw: Dict[str, Any]) -> Optional[str]:
+        """`record_key`, or None for a record too malformed to have one."""
+        try:
+            return self.record_key(raw)
+        except NORMALIZE_ERRORS:
+            return None
+
+    async def fetch_page(self, client: httpx.AsyncClient, page: int, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Fetches one page of raw records. The default expects
+        `{"data": [...], "total_pages": n}` from `GET /<source_name>` and
+        passes the watermark as `since` so the source can skip old records.
+        """
+        params = {"page": page, "page_size": self.page_size}
+        if since is not None:
+            params["since"] = format_watermark(since)
+        response = await client.get(f"/{self.source_name}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def aiter_fetch(self, since: Optional[datetime] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields raw records from a paginated HTTP source. The first page gives
+        the page count; the rest are fetched with at most
+        `fetch_concurrency` requests in flight. Pages are yielded in page
+        order, so watermarks only ever move forward, and at most
+        `fetch_concurrency` pages are buffered.
+        """
+        timeout = self.timeout_seconds or INGESTION_SOURCE_TIMEOUT_SECONDS
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=timeout) as client:
+            first = await self.fetch_page(client, 1, since)
+            for record in first.get("data", []):
+                yield record
+
+            window = max(1, self.fetch_concurrency)
+            pages = iter(range(2, int(first.get("total_pages") or 1) + 1))
+            in_flight: Dict[int, asyncio.Future] = {}
+            try:
+                while True:
+                    for page in islice(pages, window - len(in_flight)):
+                        in_flight[page] = asyncio.ensure_future(self.fetch_page(client, page, since))
+                    if not in_flight:
+                        return
+                    # Wait for the lowest outstanding page; later ones keep downloading meanwhile.
+                    page = min(in_flight)
+                    result = await in_flight.pop(page)
+                    for record in result.get("data", []):
+                        yield record
+            finally:
+                for task in in_flight.values():
+                    task.cancel()
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+    def _iter_remote(self, since: Optional[datetime]) -> Iterator[Dict[str, Any]]:
+        # Drives aiter_fetch on a private event loop so the synchronous
+        # chunk pipeline, which runs in a worker thread, can consume it lazily.
+        loop = asyncio.new_event_loop()
+        records = self.aiter_fetch(since)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(records.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(records.aclose())
+            loop.close()
+
+    def _record_watermark(self, raw: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return self.record_watermark(raw)
+        except NORMALIZE_ERRORS:
+            return None
+
+    def iter_chunks(self, chunk_size: Optional[int] = None, since: Optional[datetime] = None) -> Iterator[IngestionChunk]:
+        """
+        Streams the source as fixed-size chunks of normalized, validated
+        leads. Records that fail normalization or validation are returned as
+        rejects instead of failing the source. Only one chunk of raw records
+        is held at a time, so memory stays flat however large the source is.
+
+        With `since`, records older than that watermark are skipped. Records
+        exactly at it are processed again; the lead upsert is idempotent, and
+        this way records sharing the boundary timestamp are never lost.
+        """
+        records = self._iter_remote(since) if self.base_url else self.iter_fetch()
+        size = chunk_size or self.chunk_size
+        while True:
+            raw_chunk = list(islice(records, size))
+            if not raw_chunk:
+                return
+            chunk = IngestionChunk()
+            for raw in raw_chunk:
+                watermark = self._record_watermark(raw)
+                if since is not None and watermark is not None and watermark < since:
+                    continue
+                if watermark is not None and (chunk.watermark is None or watermark > chunk.watermark):
+                    chunk.watermark = watermark
+                try:
+                    chunk.leads.append(self.normalize_record(raw))
+                except NORMALIZE_ERRORS as e:
+                    chunk.rejected.append(RejectedRecord(raw=raw, error=str(e)))
+                    continue
+                chunk.note_keys.append(self.note_key(raw))
+            if chunk.size:
+                yield chunk
 
     def run(self) -> List[LeadCreate]:
         """
         Executes the full fetch and normalize pipeline for the source.
+        Kept for callers that want every lead at once.
         """
-        raw_data = self.fetch()
-        return self.normalize(raw_data)
+        leads: List[LeadCreate] = []
+        for chunk in self.iter_chunks():
+            leads.extend(chunk.leads)
+            leads.extend(LeadCreate.model_construct(**row) for row in chunk.rows)
+        return leads
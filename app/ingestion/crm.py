@@ -1,7 +1,22 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from .base import BaseIngestion
 from app.schemas.lead import LeadCreate
 
+# Sample payloads in the upstream API's shape. scripts/stub_source_server.py
+# replays them over HTTP.
+MOCK_RECORDS: List[Dict[str, Any]] = [
+    {
+        "lead_id": "CRM-001",
+        "contact_name": "David Chen",
+        "contact_phone": "+6281987654321",
+        "contact_email": "david.chen@example.com",
+        "estimated_budget": 2000000000,
+        "lead_status": "new",
+        "created_by": "Sales Agent A",
+        "summary": "Referral from existing client. Looking for investment property."
+    }
+]
+
 class CRMIngestion(BaseIngestion):
     """Ingestion adapter for leads manually entered into a CRM."""
 
@@ -13,34 +28,21 @@ class CRMIngestion(BaseIngestion):
     def trust_score(self) -> float:
         return 0.9  # High trust
 
-    def fetch(self) -> List[Dict[str, Any]]:
-        """Mocks fetching data from a CRM API or database."""
-        return [
-            {
-                "lead_id": "CRM-001",
-                "contact_name": "David Chen",
-                "contact_phone": "+6281987654321",
-                "contact_email": "david.chen@example.com",
-                "estimated_budget": 2000000000,
-                "lead_status": "new",
-                "created_by": "Sales Agent A",
-                "summary": "Referral from existing client. Looking for investment property."
-            }
-        ]
+    def iter_fetch(self) -> Iterator[Dict[str, Any]]:
+        """Mocks paging through a CRM API or database."""
+        yield from MOCK_RECORDS
+
+    def record_key(self, item: Dict[str, Any]) -> Optional[str]:
+        return item["lead_id"]
 
-    def normalize(self, raw_data: List[Dict[str, Any]]) -> List[LeadCreate]:
-        """Normalizes CRM data into the canonical Lead schema."""
-        normalized_leads = []
-        for item in raw_data:
-            normalized_leads.append(
-                LeadCreate(
-                    name=item["contact_name"],
-                    phone=item["contact_phone"],
-                    email=item["contact_email"],
-                    source=self.source_name,
-                    budget=item["estimated_budget"],
-                    notes=item["summary"],
-                    status=item["lead_status"]
-                )
-            )
-        return normalized_leads
+    def normalize_record(self, item: Dict[str, Any]) -> LeadCreate:
+        """Normalizes a CRM record into the canonical Lead schema."""
+        return LeadCreate(
+            name=item["contact_name"],
+            phone=item["contact_phone"],
+            email=item["contact_email"],
+            source=self.source_name,
+            budget=item["estimated_budget"],
+            notes=item["summary"],
+            status=item["lead_status"]
+        )
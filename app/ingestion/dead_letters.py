@@ -0,0 +1,25 @@
+import json
+from typing import Sequence
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.ingestion.base import RejectedRecord
+from app.models.ingestion_dead_letter import IngestionDeadLetter
+
+def record_dead_letters(db: Session, source: str, rejected: Sequence[RejectedRecord]) -> None:
+    """
+    Stores rejected records for later replay. Runs in the caller's
+    transaction, so rejects commit together with the chunk they came from.
+    """
+    if not rejected:
+        return
+    db.execute(insert(IngestionDeadLetter.__table__), [
+        {
+            "source": source,
+            # Raw payloads may hold values JSON can't encode (dates, decimals).
+            "payload": json.loads(json.dumps(record.raw, default=str)),
+            "error": record.error,
+            "attempts": 1,
+            "status": "pending"
+        }
+        for record in rejected
+    ])
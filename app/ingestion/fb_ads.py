@@ -1,7 +1,33 @@
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
 from .base import BaseIngestion
 from app.schemas.lead import LeadCreate
 
+# Sample payloads in the upstream API's shape, also replayed by
+# scripts/stub_source_server.py.
+MOCK_RECORDS: List[Dict[str, Any]] = [
+    {
+        "form_id": "123",
+        "created_time": "2023-10-27T10:00:00+0000",
+        "field_data": [
+            {"name": "full_name", "values": ["Andi Wijaya"]},
+            {"name": "email", "values": ["andi.w@example.com"]},
+            {"name": "phone_number", "values": ["+6281234567890"]},
+            {"name": "budget_range", "values": ["1-2 Bio"]}
+        ]
+    },
+    {
+        "form_id": "124",
+        "created_time": "2023-10-27T11:00:00+0000",
+        "field_data": [
+            {"name": "full_name", "values": ["Siti Aminah"]},
+            {"name": "email", "values": ["siti.a@example.com"]},
+            {"name": "phone_number", "values": ["+628111222333"]},
+            {"name": "budget_range", "values": ["> 2 Bio"]}
+        ]
+    }
+]
+
 class FBAdsIngestion(BaseIngestion):
     """Ingestion adapter for leads from Facebook Ads lead forms."""
 
@@ -13,54 +39,36 @@ class FBAdsIngestion(BaseIngestion):
     def trust_score(self) -> float:
         return 0.6  # Lower initial trust
 
-    def fetch(self) -> List[Dict[str, Any]]:
-        """Mocks fetching data from the Facebook Graph API."""
-        return [
-            {
-                "form_id": "123",
-                "created_time": "2023-10-27T10:00:00+0000",
-                "field_data": [
-                    {"name": "full_name", "values": ["Andi Wijaya"]},
-                    {"name": "email", "values": ["andi.w@example.com"]},
-                    {"name": "phone_number", "values": ["+6281234567890"]},
-                    {"name": "budget_range", "values": ["1-2 Bio"]}
-                ]
-            },
-            {
-                "form_id": "124",
-                "created_time": "2023-10-27T11:00:00+0000",
-                "field_data": [
-                    {"name": "full_name", "values": ["Siti Aminah"]},
-                    {"name": "email", "values": ["siti.a@example.com"]},
-                    {"name": "phone_number", "values": ["+628111222333"]},
-                    {"name": "budget_range", "values": ["> 2 Bio"]}
-                ]
-            }
-        ]
+    def iter_fetch(self) -> Iterator[Dict[str, Any]]:
+        """Mocks paging through the Facebook Graph API."""
+        yield from MOCK_RECORDS
+
+    def record_watermark(self, item: Dict[str, Any]) -> Optional[datetime]:
+        """Graph API lead forms carry `created_time`, e.g. 2023-10-27T10:00:00+0000."""
+        return datetime.strptime(item["created_time"], "%Y-%m-%dT%H:%M:%S%z")
+
+    def record_key(self, item: Dict[str, Any]) -> Optional[str]:
+        """The Graph API lead id, else the form and submission time."""
+        return item.get("id") or f"{item['form_id']}:{item['created_time']}"
+
+    def normalize_record(self, item: Dict[str, Any]) -> LeadCreate:
+        """Normalizes an FB Ads lead form into the canonical Lead schema."""
+        field_map = {field["name"]: field["values"][0] for field in item["field_data"]}
 
-    def normalize(self, raw_data: List[Dict[str, Any]]) -> List[LeadCreate]:
-        """Normalizes FB Ads data into the canonical Lead schema."""
-        normalized_leads = []
-        for item in raw_data:
-            field_map = {field["name"]: field["values"][0] for field in item["field_data"]}
-            
-            # Simple budget parsing logic
-            budget_str = field_map.get("budget_range", "0").lower()
-            budget = 0.0
-            if "1-2 bio" in budget_str:
-                budget = 1500000000
-            elif "> 2 bio" in budget_str:
-                budget = 2500000000
+        # Simple budget parsing logic
+        budget_str = field_map.get("budget_range", "0").lower()
+        budget = 0.0
+        if "1-2 bio" in budget_str:
+            budget = 1500000000
+        elif "> 2 bio" in budget_str:
+            budget = 2500000000
 
-            normalized_leads.append(
-                LeadCreate(
-                    name=field_map.get("full_name", "Unknown"),
-                    phone=field_map.get("phone_number", "N/A"),
-                    email=field_map.get("email"),
-                    source=self.source_name,
-                    budget=budget,
-                    notes=f"Lead from FB Ads form_id: {item['form_id']}",
-                    status="new"
-                )
-            )
-        return normalized_leads
+        return LeadCreate(
+            name=field_map.get("full_name", "Unknown"),
+            phone=field_map.get("phone_number", "N/A"),
+            email=field_map.get("email"),
+            source=self.source_name,
+            budget=budget,
+            notes=f"Lead from FB Ads form_id: {item['form_id']}",
+            status="new"
+        )
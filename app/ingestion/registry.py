@@ -1,23 +1,313 @@
-from typing import List, Dict, Any
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+
+from app.core.config import INGESTION_MAX_WORKERS, INGESTION_SOURCE_TIMEOUT_SECONDS
+from app.core.database import SessionLocal
+from app.ingestion.base import BaseIngestion, IngestionChunk
+from app.ingestion.watermarks import advance_watermark, get_watermark
+from app.ingestion.dead_letters import record_dead_letters
+from app.ingestion.crm import CRMIngestion
+from app.ingestion.fb_ads import FBAdsIngestion
+from app.ingestion.whatsapp import WhatsAppIngestion
+from app.services.ingestion_run_service import record_ingestion_run
+from app.services.lead_service import bulk_upsert_lead_rows
+
+DEFAULT_ADAPTERS = (CRMIngestion, FBAdsIngestion, WhatsAppIngestion)
+
+# Producers block once this many chunks per worker are waiting to be written,
+# which bounds memory to a few chunks regardless of source size.
+_QUEUE_CHUNKS_PER_WORKER = 2
+_PUT_POLL_SECONDS = 0.1
+# How often the consumer re-checks sources' progress while nothing arrives.
+_PROGRESS_POLL_SECONDS = 0.1
+
+_CHUNK, _DONE, _ERROR = "chunk", "done", "error"
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class _SourceProgress:
+    """
+    Where a source's producer is, shared with the consumer so that only time
+    spent fetching counts toward the source's timeout: not time waiting for
+    a worker, blocked on a full queue, or with chunks still to be written.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = False
+        self.exited = False
+        # When the producer last went back to fetching; None while it hands over an item.
+        self._fetching_since: Optional[float] = None
+        # Items handed to the queue that the consumer has not taken yet.
+        self._pending = 0
+
+    def fetching(self) -> None:
+        with self._lock:
+            self.started = True
+            self._fetching_since = time.monotonic()
+
+    def offering(self) -> None:
+        with self._lock:
+            self._pending += 1
+            self._fetching_since = None
+
+    def taken(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def deadline(self, timeout: float) -> Optional[float]:
+        """When the source times out if it yields nothing; None while it can't."""
+        with self._lock:
+            if self._fetching_since is None or self._pending:
+                return None
+            return self._fetching_since + timeout
+
+def _produce_chunks(
+    adapter: BaseIngestion,
+    out: "queue.Queue",
+    stop: threading.Event,
+    since: Optional[datetime],
+    progress: _SourceProgress
+) -> None:
+    """Streams one source's chunks onto the shared queue until it ends or is stopped."""
+    def put(item) -> bool:
+        progress.offering()
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    name = adapter.source_name
+    try:
+        progress.fetching()
+        started = time.perf_counter()
+        for chunk in adapter.iter_chunks(since=since):
+            if not put((name, _CHUNK, chunk, time.perf_counter() - started)):
+                return
+            progress.fetching()
+            started = time.perf_counter()
+        put((name, _DONE, None, 0.0))
+    except Exception as e:
+        put((name, _ERROR, e, 0.0))
+    finally:
+        progress.exited = True
 
 class IngestionRegistry:
-    enabled_sources: List[str] = ["manual", "api"]
-    last_summary: Dict[str, Any] = None
+    """
+    Streams every enabled adapter through its chunked fetch → normalize →
+    validate pipeline concurrently in a bounded thread pool. Chunks are
+    bulk-written as they arrive, one at a time, so a slow source only
+    delays itself and memory stays bounded by a few chunks.
+    """
 
-    def ingest_all(self) -> Dict[str, Any]:
-        # Dummy ingestion logic
+    def __init__(
+        self,
+        adapters: Optional[List[BaseIngestion]] = None,
+        max_workers: int = INGESTION_MAX_WORKERS,
+        source_timeout: float = INGESTION_SOURCE_TIMEOUT_SECONDS
+    ):
+        self._adapters: Dict[str, BaseIngestion] = {}
+        for adapter in adapters if adapters is not None else [cls() for cls in DEFAULT_ADAPTERS]:
+            self.register(adapter)
+        self.enabled_sources: List[str] = list(self._adapters)
+        self.max_workers = max_workers
+        self.source_timeout = source_timeout
+
+    def register(self, adapter: BaseIngestion) -> None:
+        self._adapters[adapter.source_name] = adapter
+
+    def _read_watermarks(self, session_factory: Callable[[], Session], names: List[str]) -> Dict[str, Optional[datetime]]:
+        db = session_factory()
+        try:
+            return {name: get_watermark(db, name) for name in names}
+        finally:
+            db.close()
+
+    def _write_chunk(
+        self,
+        session_factory: Callable[[], Session],
+        source: str,
+        chunk: IngestionChunk,
+        watermark: Optional[datetime]
+    ) -> Dict[str, int]:
+        db = session_factory()
+        try:
+            statuses = bulk_upsert_lead_rows(db, chunk.lead_rows())
+            record_dead_letters(db, source, chunk.rejected)
+            # Same transaction as the leads and rejects: a crash never leaves
+            # the watermark ahead of what was written.
+            if watermark is not None:
+                advance_watermark(db, source, watermark)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return {"inserted": statuses.count("inserted"), "updated": statuses.count("updated")}
+
+    def ingest_all(self, session_factory: Callable[[], Session] = SessionLocal, incremental: bool = True) -> Dict[str, Any]:
+        """
+        Runs every enabled source once and records the run in the ingestion
+        history. Incremental runs resume each source from its last committed
+        watermark; pass `incremental=False` to re-read everything.
+        """
+        start_time = datetime.now(timezone.utc)
+        adapters = {name: self._adapters[name] for name in self.enabled_sources if name in self._adapters}
+        results: Dict[str, Dict[str, Any]] = {
+            name: {
+                "name": name, "status": "running", "records": 0, "inserted": 0, "updated": 0,
+                "failed": 0, "chunks": 0, "fetch_seconds": 0.0, "write_seconds": 0.0
+            }
+            for name in adapters
+        }
+        since = self._read_watermarks(session_factory, list(adapters)) if incremental else {}
+        for name, watermark in since.items():
+            results[name]["since"] = watermark
+        chunk_latencies: Dict[str, List[float]] = {name: [] for name in adapters}
+
+        workers = max(1, self.max_workers)
+        chunks: queue.Queue = queue.Queue(maxsize=workers * _QUEUE_CHUNKS_PER_WORKER)
+        stops = {name: threading.Event() for name in adapters}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion")
+        try:
+            # A source times out when it spends its timeout fetching without
+            # yielding a chunk, so a large but steady source is never cut off,
+            # however long it waits for a worker or for its chunks to be written.
+            progress = {name: _SourceProgress() for name in adapters}
+            timeouts = {name: adapter.timeout_seconds or self.source_timeout for name, adapter in adapters.items()}
+            for name, adapter in adapters.items():
+                results[name]["started_at"] = datetime.now(timezone.utc)
+                executor.submit(_produce_chunks, adapter, chunks, stops[name], since.get(name), progress[name])
+            active = set(adapters)
+            timed_out: List[str] = []
+
+            while active:
+                now = time.monotonic()
+                deadlines = [progress[name].deadline(timeouts[name]) for name in active]
+                wait_seconds = min([_PROGRESS_POLL_SECONDS] + [d - now for d in deadlines if d is not None])
+                try:
+                    name, kind, payload, fetch_seconds = chunks.get(timeout=max(0.0, wait_seconds))
+                except queue.Empty:
+                    name, kind, payload, fetch_seconds = None, None, None, 0.0
+                if name is not None:
+                    progress[name].taken()
+
+                if name in active:
+                    result = results[name]
+                    if kind == _CHUNK:
+                        result["chunks"] += 1
+                        result["records"] += payload.size
+                        result["failed"] += len(payload.rejected)
+                        result["fetch_seconds"] += fetch_seconds
+                        write_started = time.perf_counter()
+                        # After a failed write the watermark stays put, so the
+                        # next run retries the lost chunk.
+                        watermark = None if "error" in result else payload.watermark
+                        try:
+                            counts = self._write_chunk(session_factory, name, payload, watermark)
+                            result["inserted"] += counts["inserted"]
+                            result["updated"] += counts["updated"]
+                        except Exception as e:
+                            logging.warning(f"Writing ingestion source '{name}' failed: {e}")
+                            result["failed"] += payload.lead_count
+                            result["error"] = str(e)
+                        write_seconds = time.perf_counter() - write_started
+                        result["write_seconds"] += write_seconds
+                        chunk_latencies[name].append(fetch_seconds + write_seconds)
+                    elif kind == _ERROR:
+                        logging.warning(f"Ingestion source '{name}' failed: {payload}")
+                        result["status"] = "failed"
+                        result["error"] = str(payload)
+                        result["finished_at"] = datetime.now(timezone.utc)
+                        active.discard(name)
+                    else:
+                        result["status"] = "failed" if "error" in result else "success"
+                        result["finished_at"] = datetime.now(timezone.utc)
+                        active.discard(name)
+
+                now = time.monotonic()
+                for name in list(active):
+                    deadline = progress[name].deadline(timeouts[name])
+                    if deadline is not None and deadline <= now:
+                        error = f"No data within {timeouts[name]}s"
+                    elif not progress[name].started and self._workers_held(timed_out, progress) >= workers:
+                        # Timed-out producers can't be interrupted mid-fetch, so
+                        # a source queued behind them would never start.
+                        error = "No free worker: all are held by timed-out sources"
+                    else:
+                        continue
+                    results[name].update(status="timeout", error=error, finished_at=datetime.now(timezone.utc))
+                    stops[name].set()
+                    active.discard(name)
+                    timed_out.append(name)
+        finally:
+            for stop in stops.values():
+                stop.set()
+            # Don't wait for timed-out adapters; their threads finish in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        end_time = datetime.now(timezone.utc)
+        sources = list(results.values())
+        for source in sources:
+            source.setdefault("started_at", start_time)
+            source.setdefault("finished_at", end_time)
+            elapsed = (source["finished_at"] - source["started_at"]).total_seconds()
+            source["rows_per_second"] = round(source["records"] / elapsed, 2) if elapsed > 0 else None
+            latencies = sorted(chunk_latencies[source["name"]])
+            for q in (50, 95, 99):
+                value = _percentile(latencies, q)
+                source[f"chunk_latency_p{q}_ms"] = round(value * 1000, 2) if value is not None else None
+            source["fetch_seconds"] = round(source["fetch_seconds"], 4)
+            source["write_seconds"] = round(source["write_seconds"], 4)
+        duration_seconds = (end_time - start_time).total_seconds()
+        total_processed = sum(s["records"] for s in sources)
+        failed_sources = [s["name"] for s in sources if s["status"] != "success"]
         summary = {
-            "start_time": datetime.now(timezone.utc),
-            "end_time": datetime.now(timezone.utc),
-            "total_processed": 10,
-            "total_failed": 0,
-            "sources": [{"name": "manual", "status": "success"}]
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration_seconds": round(duration_seconds, 4),
+            "status": "success" if not failed_sources else ("failed" if len(failed_sources) == len(sources) else "partial"),
+            "total_processed": total_processed,
+            "total_failed": sum(s["failed"] for s in sources),
+            "rows_per_second": round(total_processed / duration_seconds, 2) if duration_seconds > 0 else None,
+            "failed_sources": failed_sources,
+            "sources": sources
         }
-        self.last_summary = summary
+
+        db = session_factory()
+        try:
+            summary["run_id"] = record_ingestion_run(db, summary, incremental=incremental).id
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Could not record ingestion run: {e}")
+        finally:
+            db.close()
         return summary
 
+    @staticmethod
+    def _workers_held(timed_out: List[str], progress: Dict[str, _SourceProgress]) -> int:
+        """Workers still occupied by producers of sources that already timed out."""
+        return sum(1 for name in timed_out if progress[name].started and not progress[name].exited)
+
+    def get_adapter(self, name: str) -> Optional[BaseIngestion]:
+        return self._adapters.get(name)
+
     def get_available_sources(self) -> List[str]:
-        return ["manual", "api", "csv"]
+        return list(self._adapters)
 
 registry = IngestionRegistry()
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.ingestion_watermark import IngestionWatermark
+
+def format_watermark(value: datetime) -> str:
+    """Fixed-precision UTC text, so stored watermarks compare correctly as strings."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+def get_watermark(db: Session, source: str) -> Optional[datetime]:
+    value = db.execute(select(IngestionWatermark.value).where(IngestionWatermark.source == source)).scalar()
+    return datetime.fromisoformat(value) if value else None
+
+def advance_watermark(db: Session, source: str, value: datetime) -> None:
+    """
+    Moves the source's watermark forward to `value`; never backwards. Runs in
+    the caller's transaction, so it commits together with the chunk it covers.
+    """
+    table = IngestionWatermark.__table__
+    stmt = sqlite_insert(table).values(source=source, value=format_watermark(value))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.source],
+        set_={
+            "value": case((stmt.excluded.value > table.c.value, stmt.excluded.value), else_=table.c.value),
+            "updated_at": func.now()
+        }
+    ))
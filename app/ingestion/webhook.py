@@ -0,0 +1,255 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.core.config import WEBHOOK_QUEUE_MAX_SIZE, WEBHOOK_FLUSH_INTERVAL_MS, WEBHOOK_FLUSH_MAX_MESSAGES
+from app.core.database import SessionLocal
+from app.ingestion.base import NORMALIZE_ERRORS, BaseIngestion, RejectedRecord
+from app.ingestion.dead_letters import record_dead_letters
+from app.ingestion.whatsapp import WhatsAppIngestion
+from app.services.lead_service import bulk_upsert_lead_rows
+
+# How long an idle flusher waits for a message before re-checking for shutdown.
+_IDLE_POLL_SECONDS = 0.5
+# Queued by `stop` to wake an idle flusher immediately.
+_WAKE = object()
+
+def extract_messages(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flattens a WhatsApp Cloud API webhook body into the adapter's message
+    shape: `{"id", "from", "profile", "timestamp", "text"}`. A body that already
+    carries a flat `messages` list is passed through.
+    """
+    if "entry" not in payload:
+        return list(payload.get("messages") or [])
+    messages = []
+    for entry in payload.get("entry") or []:
+        for change in entry.get("changes") or []:
+            value = change.get("value") or {}
+            profiles = {contact.get("wa_id"): contact.get("profile") or {} for contact in value.get("contacts") or []}
+            for message in value.get("messages") or []:
+                sender = str(message.get("from", ""))
+                messages.append({
+                    "id": message.get("id"),
+                    # Cloud API sends the number without the leading "+".
+                    "from": sender if sender.startswith("+") else f"+{sender}",
+                    "profile": profiles.get(sender, {}),
+                    "timestamp": message.get("timestamp"),
+                    "text": message.get("text") or {"body": ""}
+                })
+    return messages
+
+class WebhookBuffer:
+    """
+    Absorbs webhook bursts without a commit per message. Messages are queued
+    in memory and written by a background thread, which coalesces them per
+    phone number into one lead each and bulk-upserts the batch. Invalid
+    messages go to the dead-letter table in the same transaction. A batch
+    whose write fails is dead-lettered whole, since its senders were already
+    acknowledged and will not retry.
+    """
+
+    def __init__(
+        self,
+        adapter: BaseIngestion,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_size: int = WEBHOOK_QUEUE_MAX_SIZE,
+        flush_interval_ms: float = WEBHOOK_FLUSH_INTERVAL_MS,
+        flush_max_messages: int = WEBHOOK_FLUSH_MAX_MESSAGES
+    ):
+        self.adapter = adapter
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.flush_interval_seconds = flush_interval_ms / 1000
+        self.flush_max_messages = max(1, flush_max_messages)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._write_lock = threading.Lock()
+        # Serializes producers, so the capacity check in `submit` still holds when it enqueues.
+        self._submit_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {
+            "received": 0, "dropped": 0, "flushes": 0, "flushed_messages": 0,
+            "written_leads": 0, "rejected": 0, "failed_messages": 0, "dead_lettered": 0, "max_queue_depth": 0
+        }
+        self._last_flush_at: Optional[datetime] = None
+        self._last_flush_ms: Optional[float] = None
+
+    def _count(self, **increments: int) -> None:
+        with self._metrics_lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def submit(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Queues messages without blocking, all or nothing: if the batch does
+        not fit, none of it is queued and 0 is returned, so a sender's retry
+        never queues a message twice.
+        """
+        with self._submit_lock:
+            # Only the flusher removes items meanwhile, which can only free space.
+            fits = self.max_size <= 0 or self.max_size - self._queue.qsize() >= len(messages)
+            if fits:
+                for message in messages:
+                    self._queue.put_nowait(message)
+            depth = self._queue.qsize()
+        accepted = len(messages) if fits else 0
+        with self._metrics_lock:
+            self._counters["received"] += accepted
+            self._counters["dropped"] += len(messages) - accepted
+            self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], depth)
+        return accepted
+
+    def coalesce(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[RejectedRecord]]:
+        """
+        Normalizes messages and merges those from the same phone into one
+        lead row: the first name and budget seen win, and every message's
+        note is kept, in arrival order, keyed by its message so a
+        re-delivered message is not stored twice.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        rejected: List[RejectedRecord] = []
+        for raw in messages:
+            try:
+                lead = self.adapter.normalize_record(raw)
+            except NORMALIZE_ERRORS as e:
+                rejected.append(RejectedRecord(raw=raw, error=str(e)))
+                continue
+            row = merged.get(lead.phone)
+            if row is None:
+                row = merged[lead.phone] = {**lead.model_dump(), "notes": []}
+            else:
+                row["name"] = row["name"] or lead.name
+                row["budget"] = row["budget"] or lead.budget
+            if lead.notes:
+                row["notes"].append((lead.notes, self.adapter.note_key(raw)))
+        return list(merged.values()), rejected
+
+    def _write(self, messages: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        rows, rejected = self.coalesce(messages)
+        with self._write_lock:
+            db = self.session_factory()
+            try:
+                bulk_upsert_lead_rows(db, rows)
+                record_dead_letters(db, self.adapter.source_name, rejected)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Flushing {len(messages)} webhook messages failed: {e}")
+                self._count(failed_messages=len(messages))
+                self._dead_letter_batch(messages, rejected, e)
+                return
+            finally:
+                db.close()
+        self._count(flushes=1, flushed_messages=len(messages), written_leads=len(rows), rejected=len(rejected))
+        with self._metrics_lock:
+            self._last_flush_at = datetime.now(timezone.utc)
+            self._last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def _dead_letter_batch(self, messages: List[Dict[str, Any]], rejected: List[RejectedRecord], error: Exception) -> None:
+        """
+        Keeps the raw messages of a failed write, in a fresh session, so
+        `replay_dead_letters` can recover them. Invalid messages keep their
+        own validation error.
+        """
+        invalid = {id(record.raw): record for record in rejected}
+        records = [
+            invalid.get(id(raw)) or RejectedRecord(raw=raw, error=f"Webhook flush failed: {error}")
+            for raw in messages
+        ]
+        db = self.session_factory()
+        try:
+            record_dead_letters(db, self.adapter.source_name, records)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Dead-lettering {len(messages)} webhook messages failed; they are lost: {e}")
+            return
+        finally:
+            db.close()
+        self._count(dead_lettered=len(messages))
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        """Waits for a message, then gathers more until the batch is full or the interval ends."""
+        try:
+            first = self._queue.get(timeout=_IDLE_POLL_SECONDS)
+        except queue.Empty:
+            return []
+        if first is _WAKE:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.flush_max_messages:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if message is _WAKE:
+                break
+            batch.append(message)
+        return batch
+
+    def flush(self) -> int:
+        """Writes everything queued right now; returns the number of messages written."""
+        written = 0
+        while True:
+            batch = []
+            while len(batch) < self.flush_max_messages:
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if message is not _WAKE:
+                    batch.append(message)
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="webhook-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the flusher after writing whatever is still queued."""
+        self._stop.set()
+        with self._submit_lock:
+            try:
+                self._queue.put_nowait(_WAKE)
+            except queue.Full:
+                pass  # a full queue keeps the flusher busy; it sees the stop flag next batch
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                **self._counters,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_size,
+                "running": bool(self._thread and self._thread.is_alive()),
+                "last_flush_at": self._last_flush_at,
+                "last_flush_ms": self._last_flush_ms
+            }
+
+whatsapp_webhook = WebhookBuffer(WhatsAppIngestion())
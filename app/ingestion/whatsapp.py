@@ -1,7 +1,25 @@
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Optional
 from .base import BaseIngestion
 from app.schemas.lead import LeadCreate
 
+# Sample payloads in the upstream API's shape, also replayed by
+# scripts/stub_source_server.py.
+MOCK_RECORDS: List[Dict[str, Any]] = [
+    {
+        "from": "+6285611112222",
+        "profile": {"name": "Bapak Eko"},
+        "timestamp": "1698382800", # Unix timestamp
+        "text": {"body": "Halo, saya tertarik dengan properti di BSD, budget 1M."}
+    },
+    {
+        "from": "+6287733334444",
+        "profile": {"name": "Ibu Ratna"},
+        "timestamp": "1698386400",
+        "text": {"body": "Selamat pagi, info dong untuk rumah 3 kamar tidur."}
+    }
+]
+
 class WhatsAppIngestion(BaseIngestion):
     """Ingestion adapter for leads from WhatsApp chats."""
 
@@ -13,39 +31,29 @@ class WhatsAppIngestion(BaseIngestion):
     def trust_score(self) -> float:
         return 0.75  # Medium trust
 
-    def fetch(self) -> List[Dict[str, Any]]:
-        """Mocks fetching data from a WhatsApp Business API webhook."""
-        return [
-            {
-                "from": "+6285611112222",
-                "profile": {"name": "Bapak Eko"},
-                "timestamp": "1698382800", # Unix timestamp
-                "text": {"body": "Halo, saya tertarik dengan properti di BSD, budget 1M."}
-            },
-            {
-                "from": "+6287733334444",
-                "profile": {"name": "Ibu Ratna"},
-                "timestamp": "1698386400",
-                "text": {"body": "Selamat pagi, info dong untuk rumah 3 kamar tidur."}
-            }
-        ]
-
-    def normalize(self, raw_data: List[Dict[str, Any]]) -> List[LeadCreate]:
-        """Normalizes WhatsApp data into the canonical Lead schema."""
-        normalized_leads = []
-        for item in raw_data:
-            # Simple budget parsing from text
-            budget = 1000000000 if "1m" in item["text"]["body"].lower() else None
-
-            normalized_leads.append(
-                LeadCreate(
-                    name=item["profile"]["name"],
-                    phone=item["from"],
-                    email=None,  # WhatsApp doesn't provide email
-                    source=self.source_name,
-                    budget=budget,
-                    notes=f"Initial query: {item['text']['body']}",
-                    status="new"
-                )
-            )
-        return normalized_leads
+    def iter_fetch(self) -> Iterator[Dict[str, Any]]:
+        """Mocks reading messages from a WhatsApp Business API webhook."""
+        yield from MOCK_RECORDS
+
+    def record_watermark(self, item: Dict[str, Any]) -> Optional[datetime]:
+        """Messages carry a Unix `timestamp` in seconds."""
+        return datetime.fromtimestamp(int(item["timestamp"]), tz=timezone.utc)
+
+    def record_key(self, item: Dict[str, Any]) -> Optional[str]:
+        """The Cloud API message id, else sender and timestamp."""
+        return item.get("id") or f"{item['from']}:{item['timestamp']}"
+
+    def normalize_record(self, item: Dict[str, Any]) -> LeadCreate:
+        """Normalizes a WhatsApp message into the canonical Lead schema."""
+        # Simple budget parsing from text
+        budget = 1000000000 if "1m" in item["text"]["body"].lower() else None
+
+        return LeadCreate(
+            name=item["profile"]["name"],
+            phone=item["from"],
+            email=None,  # WhatsApp doesn't provide email
+            source=self.source_name,
+            budget=budget,
+            notes=f"Initial query: {item['text']['body']}",
+            status="new"
+        )
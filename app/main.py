@@ -2,36 +2,50 @@ from fastapi import FastAPI, Request, Depends
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import OperationalError
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.api.v1 import lead, followup, listing, analytics, governance, ingestion, system, health, alerts, auth, decisions, simulation, learning
 from app.verticals.property_sales import api as property_sales_api
-from app.core.database import engine, Base, get_db
+from app.core.database import engine, get_db, optimize_database
+from app.core.migrations import run_migrations
+from app.core.config import DB_OPTIMIZE_INTERVAL_SECONDS
 from app.core.governance.audit import create_audit_log_entry
 from app.schemas.audit_log import AuditLogCreate
 from app.core.auth.security import get_current_user, UserContext
 from app.services.decision_sla_service import evaluate_decision_sla
+from app.ingestion.webhook import whatsapp_webhook
 
-# Ensure all models are imported before creating tables
-from app.models import learning_review, decision_snapshot
-
-Base.metadata.create_all(bind=engine)
+async def _optimize_database_periodically(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(optimize_database, engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    # A no-op single query when the schema is already current.
+    await asyncio.to_thread(run_migrations, engine)
+
     db = next(get_db())
     try:
-        # This will fail if the schema is out of date, but we will catch it.
         evaluate_decision_sla(db)
-    except OperationalError:
-        logging.warning("Could not evaluate SLAs on startup. This may be due to an outdated database schema.")
     finally:
         db.close()
+
+    await asyncio.to_thread(optimize_database, engine)
+    optimize_task = None
+    if DB_OPTIMIZE_INTERVAL_SECONDS > 0:
+        optimize_task = asyncio.create_task(_optimize_database_periodically(DB_OPTIMIZE_INTERVAL_SECONDS))
+    whatsapp_webhook.start()
     yield
-    # Shutdown logic can go here
+    # Shutdown logic
+    if optimize_task:
+        optimize_task.cancel()
+    # Writes any webhook messages still queued before the process exits.
+    await asyncio.to_thread(whatsapp_webhook.stop)
+    await asyncio.to_thread(optimize_database, engine)
 
 app = FastAPI(
     title="DscienTia Core",
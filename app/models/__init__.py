@@ -5,7 +5,11 @@ from .user import User
 from .audit_log import AuditLog
 from .decision import Decision
 from .lead import Lead
+from .lead_note import LeadNote
 from .followup import Followup
 from .listing import Listing
 from .decision_proposal import DecisionProposal
 from .decision_feedback import DecisionFeedback
+from .ingestion_watermark import IngestionWatermark
+from .ingestion_run import IngestionRun, IngestionSourceRun
+from .ingestion_dead_letter import IngestionDeadLetter
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -12,6 +12,10 @@ class AuditLog(Base):
     Stores a simplified record of system events and decisions.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_event_type_created_at", "event_type", "created_at"),
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(String, unique=True, index=True, default=default_uuid)
@@ -1,3 +1,2 @@
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+# All models share the declarative base from app.core.database.
+from app.core.database import Base
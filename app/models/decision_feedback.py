@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -10,6 +10,9 @@ class DecisionFeedbackType(str, enum.Enum):
 
 class DecisionFeedback(Base):
     __tablename__ = "decision_feedback"
+    __table_args__ = (
+        Index("ix_decision_feedback_persona_decision", "persona", "decision"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     recommendation_id = Column(String, index=True, nullable=False)
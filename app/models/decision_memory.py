@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, JSON, DateTime, Text, Enum as SAEnum
+from sqlalchemy import Column, String, Float, JSON, DateTime, Text, Index, Enum as SAEnum
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -17,6 +17,9 @@ class DecisionOutcome(str, enum.Enum):
 
 class DecisionMemory(Base):
     __tablename__ = "decision_memories"
+    __table_args__ = (
+        Index("ix_decision_memories_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     persona = Column(String, index=True, nullable=False)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class DecisionProposal(Base):
     __tablename__ = "decision_proposals"
+    __table_args__ = (
+        Index("ix_decision_proposals_status_escalated_created_at", "status", "escalated", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     entity_type = Column(String, index=True) # e.g., "lead", "listing"
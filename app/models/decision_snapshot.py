@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Float, JSON, DateTime, Text
+from sqlalchemy import Column, String, Float, JSON, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class DecisionSnapshot(Base):
     __tablename__ = "decision_snapshots"
+    __table_args__ = (
+        Index("ix_decision_snapshots_created_at_decision_id", "created_at", "decision_id"),
+    )
 
     decision_id = Column(String, primary_key=True, index=True)
     user_id = Column(String, nullable=True)
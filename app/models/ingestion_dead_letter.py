@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class IngestionDeadLetter(Base):
+    """
+    A source record that could not be ingested, kept with its raw payload so
+    it can be fixed and replayed.
+    """
+    __tablename__ = "ingestion_dead_letters"
+    __table_args__ = (
+        Index("ix_ingestion_dead_letters_status_source_id", "status", "source", "id"),
+        Index("ix_ingestion_dead_letters_created_at_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    error = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=1)
+    status = Column(String, nullable=False, default="pending")  # pending, replayed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    replayed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,60 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+class IngestionRun(Base):
+    """One execution of the ingestion registry across all enabled sources."""
+    __tablename__ = "ingestion_runs"
+    __table_args__ = (
+        Index("ix_ingestion_runs_started_at_id", "started_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False)  # success, partial, failed
+    incremental = Column(Boolean, nullable=False, default=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    total_processed = Column(Integer, nullable=False, default=0)
+    total_failed = Column(Integer, nullable=False, default=0)
+    rows_per_second = Column(Float, nullable=True)
+
+    sources = relationship(
+        "IngestionSourceRun",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="IngestionSourceRun.id"
+    )
+
+class IngestionSourceRun(Base):
+    """Per-source result of an ingestion run, with throughput and chunk latency."""
+    __tablename__ = "ingestion_source_runs"
+    __table_args__ = (
+        Index("ix_ingestion_source_runs_source_started_at", "source", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # success, failed, timeout
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    since = Column(DateTime(timezone=True), nullable=True)
+
+    records = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    chunks = Column(Integer, nullable=False, default=0)
+
+    fetch_seconds = Column(Float, nullable=False, default=0.0)
+    write_seconds = Column(Float, nullable=False, default=0.0)
+    rows_per_second = Column(Float, nullable=True)
+    # Per-chunk latency (fetch + write), in milliseconds.
+    chunk_latency_p50_ms = Column(Float, nullable=True)
+    chunk_latency_p95_ms = Column(Float, nullable=True)
+    chunk_latency_p99_ms = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+    run = relationship("IngestionRun", back_populates="sources")
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class IngestionWatermark(Base):
+    """
+    The newest record each ingestion source has committed. `value` is an
+    ISO-8601 UTC timestamp with fixed precision, so it orders as text.
+    """
+    __tablename__ = "ingestion_watermarks"
+
+    source = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
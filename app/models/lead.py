@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Float, select
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.lead_note import LeadNote
 
 class Lead(Base):
     """
@@ -15,7 +16,6 @@ class Lead(Base):
     email = Column(String, nullable=True, index=True)
     source = Column(String, index=True)
     budget = Column(Float, nullable=True)
-    notes = Column(String, nullable=True)
     status = Column(String, default="new", index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -25,3 +25,24 @@ class Lead(Base):
         back_populates="lead", 
         cascade="all, delete-orphan"
     )
+
+    # Full note history, loaded only when accessed. List views use the
+    # latest-N projection in lead_service instead.
+    note_entries = relationship(
+        "LeadNote",
+        back_populates="lead",
+        order_by="LeadNote.id",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    # The most recent note, fetched on first access with one indexed lookup.
+    notes = column_property(
+        select(LeadNote.body)
+        .where(LeadNote.lead_id == id)
+        .order_by(LeadNote.id.desc())
+        .limit(1)
+        .correlate_except(LeadNote)
+        .scalar_subquery(),
+        deferred=True
+    )
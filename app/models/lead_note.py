@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class LeadNote(Base):
+    """
+    One note on a lead. Notes are append-only: every delivery adds its note,
+    even if the text repeats an earlier one. `delivery_key` is the source's
+    identity for the record that carried the note (e.g. a WhatsApp message
+    id); a re-delivery of the same record is stored once. Notes without a
+    key, such as those entered through the API, are always appended.
+    """
+    __tablename__ = "lead_notes"
+    __table_args__ = (
+        Index("ux_lead_notes_lead_id_source_delivery_key", "lead_id", "source", "delivery_key", unique=True),
+        Index("ix_lead_notes_lead_id_id", "lead_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
+    body = Column(Text, nullable=False)
+    source = Column(String, nullable=True)
+    delivery_key = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    lead = relationship("Lead", back_populates="note_entries")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AuditLogCreate(BaseModel):
@@ -20,3 +20,10 @@ class AuditLog(BaseModel):
 
     class Config:
         from_attributes = True
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLog]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
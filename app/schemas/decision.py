@@ -30,3 +30,7 @@ class DecisionRecommendation(BaseModel):
 
     class Config:
         from_attributes = True
+
+class PersonaRecommendationBatch(BaseModel):
+    confidence_score: float
+    feeds: Dict[str, List[DecisionRecommendation]]
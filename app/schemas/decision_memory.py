@@ -42,6 +42,13 @@ class DecisionMemoryRead(BaseModel):
     class Config:
         from_attributes = True
 
+class DecisionMemoryPage(BaseModel):
+    items: List[DecisionMemoryRead]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class LearningSignal(BaseModel):
     delta: float = Field(..., ge=-0.1, le=0.1)
     reason: str
@@ -18,3 +18,10 @@ class DecisionSnapshotRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+class DecisionSnapshotPage(BaseModel):
+    items: List[DecisionSnapshotRead]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
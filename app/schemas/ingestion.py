@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+class FileImportRequest(BaseModel):
+    path: str = Field(..., description="CSV or Parquet file, relative to the import directory")
+    source: str = Field("csv", min_length=1, description="Source name recorded on the imported leads")
+    columns: Optional[Dict[str, str]] = Field(None, description="Lead field to file header, where they differ")
+
+class DeadLetterRead(BaseModel):
+    id: int
+    source: str
+    payload: Dict[str, Any]
+    error: str
+    attempts: int
+    status: str
+    created_at: datetime
+    last_attempt_at: Optional[datetime]
+    replayed_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class DeadLetterPage(BaseModel):
+    items: List[DeadLetterRead]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class DeadLetterUpdate(BaseModel):
+    payload: Dict[str, Any]
+
+class DeadLetterReplayRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, description="Dead letters to replay; all pending ones when omitted")
+    source: Optional[str] = None
+    limit: int = Field(1000, ge=1, le=10000)
+
+class DeadLetterReplayResult(BaseModel):
+    replayed: int
+    failed: int
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class IngestionSourceRunRead(BaseModel):
+    source: str
+    status: str
+    started_at: datetime
+    finished_at: datetime
+    since: Optional[datetime]
+    records: int
+    inserted: int
+    updated: int
+    failed: int
+    chunks: int
+    fetch_seconds: float
+    write_seconds: float
+    rows_per_second: Optional[float]
+    chunk_latency_p50_ms: Optional[float]
+    chunk_latency_p95_ms: Optional[float]
+    chunk_latency_p99_ms: Optional[float]
+    error: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+class IngestionRunRead(BaseModel):
+    id: int
+    status: str
+    incremental: bool
+    started_at: datetime
+    finished_at: datetime
+    duration_seconds: float
+    total_processed: int
+    total_failed: int
+    rows_per_second: Optional[float]
+    sources: List[IngestionSourceRunRead]
+
+    class Config:
+        from_attributes = True
+
+class IngestionRunPage(BaseModel):
+    items: List[IngestionRunRead]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
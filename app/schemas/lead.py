@@ -19,6 +19,21 @@ class Lead(LeadBase):
     status: str
     created_at: datetime
     followups: List[Followup] = []
+    # Latest notes, newest first; `notes` is the most recent one.
+    recent_notes: List[str] = []
 
     class Config:
         from_attributes = True
+
+class MergeSuggestion(BaseModel):
+    primary_id: int
+    duplicate_ids: List[int]
+    matched_on: List[str]
+    phone: Optional[str] = None
+
+class DuplicateReport(BaseModel):
+    total_leads: int
+    duplicate_leads: int
+    duplicate_rate: float
+    clusters: int
+    suggestions: List[MergeSuggestion]
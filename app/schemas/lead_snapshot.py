@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional, Tuple
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive timestamps; server defaults are written in UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+@dataclass(frozen=True, slots=True)
+class FollowupSnapshot:
+    """Immutable, session-free copy of a follow-up row."""
+    id: int
+    lead_id: int
+    note: str
+    status: str
+    next_contact_date: Optional[date]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row) -> "FollowupSnapshot":
+        return cls(
+            id=row.id,
+            lead_id=row.lead_id,
+            note=row.note,
+            status=row.status,
+            next_contact_date=row.next_contact_date,
+            created_at=_as_utc(row.created_at)
+        )
+
+@dataclass(frozen=True, slots=True)
+class LeadSnapshot:
+    """
+    Immutable, session-free copy of a lead, its follow-ups and its most
+    recent notes (newest first; `notes` is the latest).
+    This is what the cache stores and what read-only consumers receive, so it
+    can be shared between requests and threads without lazy loads.
+    """
+    id: int
+    name: str
+    phone: str
+    email: Optional[str]
+    source: str
+    budget: Optional[float]
+    notes: Optional[str]
+    status: str
+    created_at: Optional[datetime]
+    followups: Tuple[FollowupSnapshot, ...] = ()
+    recent_notes: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_row(
+        cls,
+        row,
+        followups: Tuple[FollowupSnapshot, ...] = (),
+        recent_notes: Tuple[str, ...] = ()
+    ) -> "LeadSnapshot":
+        return cls(
+            id=row.id,
+            name=row.name,
+            phone=row.phone,
+            email=row.email,
+            source=row.source,
+            budget=row.budget,
+            notes=recent_notes[0] if recent_notes else None,
+            status=row.status,
+            created_at=_as_utc(row.created_at),
+            followups=followups,
+            recent_notes=recent_notes
+        )
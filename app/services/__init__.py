@@ -10,6 +10,7 @@ from . import confidence_service
 from . import system_health_service
 from . import alert_service
 from . import data_quality_service
+from . import dedup_service
 from . import insight_quality_service
 from . import trust_service
 from . import learning_service
@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
 from typing import Dict, Any
+from app.core.cache import single_flight
+from app.services.dedup_service import get_duplicate_report
 
+@single_flight(key=lambda db: ())
 def get_key_metrics(db: Session) -> Dict[str, Any]:
     """
-    Dummy function to provide analytics metrics for the decision engine.
-    In a real system, this would query and calculate metrics from the database.
+    Analytics metrics for the decision engine. The duplicate rate is
+    measured over the leads table; the other values are still fixed.
     """
     # These values can be changed to test different recommendation rules.
     return {
@@ -12,5 +15,5 @@ def get_key_metrics(db: Session) -> Dict[str, Any]:
         "whatsapp_response_rate": 12,     # low score = high risk
         "data_completeness": 65,          # low score = high risk
         "avg_response_time": 48,          # high score = high risk
-        "duplicate_rate": 3,              # high score = high risk
+        "duplicate_rate": get_duplicate_report(db)["duplicate_rate"],  # high score = high risk
     }
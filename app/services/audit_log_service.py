@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogCreate
-from app.core.cache import simple_cache, clear_cache
+from app.core.cache import invalidate_tags
+# Audit log reads are keyset-paginated; the governance module owns the query.
+from app.core.governance.audit import get_audit_logs, get_audit_logs_async
 
 def create_audit_log_entry(db: Session, event: AuditLogCreate) -> AuditLog:
     """
@@ -14,31 +14,5 @@ def create_audit_log_entry(db: Session, event: AuditLogCreate) -> AuditLog:
     db.add(db_log)
     db.commit()
     db.refresh(db_log)
-    clear_cache() # Invalidate cache whenever a new log is created
+    invalidate_tags("audit_logs") # Only audit log queries depend on this write
     return db_log
-
-@simple_cache(ttl=60)
-def get_audit_logs(
-    db: Session,
-    event_type: Optional[str] = None,
-    persona: Optional[str] = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    skip: int = 0,
-    limit: int = 100
-) -> List[AuditLog]:
-    """
-    Retrieves audit logs with optional filtering. This function is cached.
-    """
-    query = db.query(AuditLog)
-
-    if event_type:
-        query = query.filter(AuditLog.event_type == event_type)
-    if persona:
-        query = query.filter(AuditLog.persona == persona)
-    if start_date:
-        query = query.filter(AuditLog.timestamp >= start_date)
-    if end_date:
-        query = query.filter(AuditLog.timestamp <= end_date)
-
-    return query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
@@ -3,7 +3,7 @@ from typing import Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
 from app.schemas.confidence import ConfidenceInput, ConfidenceScore, ConfidenceSignal, DataSource
 from app.services.lead_service import get_all_leads
-from app.ingestion.registry import registry
+from app.services.ingestion_run_service import get_latest_summary
 from app.services.explainability import generate_explanation
 
 # --- Configuration ---
@@ -102,7 +102,7 @@ def calculate_confidence(input_data: ConfidenceInput) -> ConfidenceScore:
 
 def get_system_confidence(db: Session) -> ConfidenceScore:
     leads = get_all_leads(db)
-    ingestion_summary = registry.last_summary or {}
+    ingestion_summary = get_latest_summary(db) or {}
 
     input_data = ConfidenceInput(
         last_updated=ingestion_summary.get("end_time", datetime.now(timezone.utc)),
@@ -1,7 +1,7 @@
-from typing import List, Dict, Any
-from app.models.lead import Lead
+from typing import Sequence, Dict, Any
+from app.schemas.lead_snapshot import LeadSnapshot
 
-def analyze_data_quality(leads: List[Lead]) -> Dict[str, Any]:
+def analyze_data_quality(leads: Sequence[LeadSnapshot]) -> Dict[str, Any]:
     total_leads = len(leads)
     if total_leads == 0:
         return {"completeness_score": 0}
@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.pagination import Page, keyset_query, build_page
+from app.ingestion.base import NORMALIZE_ERRORS
+from app.ingestion.registry import IngestionRegistry, registry
+from app.models.ingestion_dead_letter import IngestionDeadLetter
+from app.schemas.lead import LeadCreate
+from app.services.lead_service import bulk_upsert_lead_rows
+
+# Dead letters normalized and written per transaction during a replay.
+REPLAY_BATCH_SIZE = 500
+
+def _normalizer(ingestion_registry: IngestionRegistry, source: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Turns a payload into a lead row, keyed like the adapter's own ingestion."""
+    adapter = ingestion_registry.get_adapter(source)
+    if adapter is not None:
+        return lambda payload: {**adapter.normalize_record(payload).model_dump(), "note_key": adapter.note_key(payload)}
+    # File imports are not registered; their rejects are stored as lead fields.
+    return lambda payload: LeadCreate(**{**payload, "source": source}).model_dump()
+
+async def list_dead_letters_async(
+    db: AsyncSession,
+    source: Optional[str] = None,
+    status: Optional[str] = "pending",
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[IngestionDeadLetter]:
+    """Dead-lettered records, newest first."""
+    query = select(IngestionDeadLetter)
+    if source:
+        query = query.where(IngestionDeadLetter.source == source)
+    if status:
+        query = query.where(IngestionDeadLetter.status == status)
+    query = keyset_query(query, IngestionDeadLetter.created_at, IngestionDeadLetter.id, cursor, limit)
+    result = await db.execute(query)
+    return build_page(result.all(), limit)
+
+def update_dead_letter_payload(db: Session, dead_letter_id: int, payload: Dict[str, Any]) -> Optional[IngestionDeadLetter]:
+    """Replaces a pending record's payload, e.g. to fix it before a replay."""
+    letter = db.get(IngestionDeadLetter, dead_letter_id)
+    if letter is None or letter.status != "pending":
+        return None
+    letter.payload = payload
+    db.commit()
+    db.refresh(letter)
+    return letter
+
+def replay_dead_letters(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    source: Optional[str] = None,
+    limit: int = 1000,
+    batch_size: int = REPLAY_BATCH_SIZE,
+    ingestion_registry: IngestionRegistry = registry
+) -> Dict[str, int]:
+    """
+    Re-runs pending dead letters through their source's normalizer, oldest
+    first. Each batch is one transaction: valid records are bulk-upserted and
+    marked replayed; the rest keep their place with a new error and one more
+    attempt, without holding up the others.
+
+    Batches are read one at a time, resuming after the last id seen, so each
+    batch is loaded fresh by a single query instead of refreshing letters
+    that the previous commit expired.
+    """
+    query = select(IngestionDeadLetter).where(IngestionDeadLetter.status == "pending")
+    if ids:
+        query = query.where(IngestionDeadLetter.id.in_(ids))
+    if source:
+        query = query.where(IngestionDeadLetter.source == source)
+    query = query.order_by(IngestionDeadLetter.id)
+
+    normalizers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+    replayed = failed = 0
+    last_id = 0
+    while replayed + failed < limit:
+        batch_limit = min(batch_size, limit - replayed - failed)
+        letters = db.execute(query.where(IngestionDeadLetter.id > last_id).limit(batch_limit)).scalars().all()
+        if not letters:
+            break
+        last_id = letters[-1].id
+        now = datetime.now(timezone.utc)
+        rows: List[Dict[str, Any]] = []
+        for letter in letters:
+            if letter.source not in normalizers:
+                normalizers[letter.source] = _normalizer(ingestion_registry, letter.source)
+            letter.attempts += 1
+            letter.last_attempt_at = now
+            try:
+                rows.append(normalizers[letter.source](letter.payload))
+            except NORMALIZE_ERRORS as e:
+                letter.error = str(e)
+                failed += 1
+                continue
+            letter.status = "replayed"
+            letter.replayed_at = now
+            replayed += 1
+        # Flush first: the bulk upsert expires every loaded instance.
+        db.flush()
+        bulk_upsert_lead_rows(db, rows)
+        db.commit()
+    return {"replayed": replayed, "failed": failed}
@@ -1,7 +1,10 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 
+from app.core.pagination import Page, keyset_query, build_page
 from app.models.decision_memory import DecisionMemory, ApprovalStatus, DecisionOutcome
 from app.schemas.decision_memory import DecisionMemoryCreate, DecisionFeedbackUpdate, LearningSignal
 
@@ -75,8 +78,15 @@ def generate_learning_signal(memory: DecisionMemory) -> LearningSignal:
     # TODO D6.2: Implement logic to apply these learning signals to rule weights/confidence models
     # after human governance approval.
 
-def get_decision_history(db: Session, skip: int = 0, limit: int = 100) -> List[DecisionMemory]:
-    return db.query(DecisionMemory).order_by(DecisionMemory.created_at.desc()).offset(skip).limit(limit).all()
+def _decision_history_query(cursor: Optional[str], limit: int):
+    return keyset_query(select(DecisionMemory), DecisionMemory.created_at, DecisionMemory.id, cursor, limit)
+
+def get_decision_history(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[DecisionMemory]:
+    return build_page(db.execute(_decision_history_query(cursor, limit)).all(), limit)
+
+async def get_decision_history_async(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Page[DecisionMemory]:
+    result = await db.execute(_decision_history_query(cursor, limit))
+    return build_page(result.all(), limit)
 
 def get_learning_signals(db: Session) -> List[Dict[str, Any]]:
     """
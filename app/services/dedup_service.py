@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.cache import simple_cache
+from app.core.config import DEDUP_DEFAULT_COUNTRY_CODE
+from app.models.lead import Lead
+
+# Columns whose shared value puts two leads in the same candidate block.
+# A lead joins a cluster when it shares any one of these with a member.
+BLOCKING_KEYS = ("phone_key", "email_key", "name_phone_key")
+_MATCH_REASONS = {"phone_key": "phone", "email_key": "email", "name_phone_key": "name_and_phone_suffix"}
+
+# E.164 numbers carry at most 15 digits; anything much shorter is not a phone.
+_MIN_PHONE_DIGITS = 8
+_MAX_PHONE_DIGITS = 15
+_PHONE_SUFFIX_DIGITS = 7
+
+def normalize_phones(phones: pd.Series, default_country_code: str = DEDUP_DEFAULT_COUNTRY_CODE) -> pd.Series:
+    """
+    Normalizes phone numbers to E.164 ("+628123456789"). National numbers
+    ("0812...") and bare subscriber numbers get `default_country_code`;
+    "00" international prefixes become "+". Unparseable values become NA.
+    """
+    raw = phones.astype("string").str.strip()
+    international = raw.str.startswith("+") | raw.str.startswith("00")
+    digits = raw.str.replace(r"\D", "", regex=True)
+    digits = digits.mask(raw.str.startswith("00"), digits.str.slice(2))
+
+    national = ~international & digits.str.startswith("0")
+    bare = ~international & ~national & ~digits.str.startswith(default_country_code)
+    digits = digits.mask(national, default_country_code + digits.str.slice(1))
+    digits = digits.mask(bare, default_country_code + digits)
+
+    valid = digits.str.len().between(_MIN_PHONE_DIGITS, _MAX_PHONE_DIGITS)
+    return ("+" + digits).where(valid.fillna(False).astype(bool))
+
+def canonicalize_emails(emails: pd.Series) -> pd.Series:
+    """Lower-cases emails and drops "+tag" sub-addressing from the local part."""
+    cleaned = emails.astype("string").str.strip().str.lower()
+    parts = cleaned.str.extract(r"^([^@+]+)(?:\+[^@]*)?@(.+)$")
+    canonical = parts[0] + "@" + parts[1]
+    return canonical.where(canonical.notna() & (canonical != ""))
+
+def canonicalize_names(names: pd.Series) -> pd.Series:
+    """
+    Reduces names to lower-case letter tokens in sorted order, so
+    "Budi  Santoso", "santoso, budi" and "BUDI SANTOSO" share one key.
+    """
+    tokens = (
+        names.astype("string")
+        .str.lower()
+        .str.replace(r"[^\w\s]|\d|_", " ", regex=True)
+        .str.split()
+    )
+    canonical = tokens.map(lambda parts: " ".join(sorted(parts)) if isinstance(parts, list) else pd.NA).astype("string")
+    return canonical.where(canonical != "")
+
+def build_blocking_keys(frame: pd.DataFrame) -> pd.DataFrame:
+    """Adds the canonical blocking-key columns to a frame of leads."""
+    keyed = frame.copy()
+    keyed["phone_key"] = normalize_phones(frame["phone"])
+    keyed["email_key"] = canonicalize_emails(frame["email"])
+    name_key = canonicalize_names(frame["name"])
+    keyed["name_phone_key"] = name_key + "|" + keyed["phone_key"].str.slice(-_PHONE_SUFFIX_DIGITS)
+    return keyed
+
+def assign_clusters(keyed: pd.DataFrame) -> pd.Series:
+    """
+    Connected components over the blocking keys. Every lead starts as its own
+    cluster labelled by its id; each pass relabels a lead with the smallest
+    label in any block it belongs to, until nothing changes. Each pass is one
+    group-by per key, so the work stays linear in the number of leads.
+    """
+    labels = keyed["id"].copy()
+    while True:
+        previous = labels.copy()
+        for key in BLOCKING_KEYS:
+            blocked = keyed[key].notna()
+            labels.loc[blocked] = labels[blocked].groupby(keyed.loc[blocked, key]).transform("min")
+        if labels.equals(previous):
+            return labels
+
+def _completeness(keyed: pd.DataFrame) -> pd.Series:
+    return keyed[["phone_key", "email_key", "name"]].notna().sum(axis=1)
+
+def _merge_suggestions(keyed: pd.DataFrame) -> List[Dict[str, Any]]:
+    duplicated = keyed[keyed["cluster"].duplicated(keep=False)].copy()
+    if duplicated.empty:
+        return []
+    # Keep the most complete record, then the oldest.
+    duplicated["completeness"] = _completeness(duplicated)
+    duplicated = duplicated.sort_values(["cluster", "completeness", "id"], ascending=[True, False, True])
+
+    # Members are contiguous per cluster, primary first.
+    cluster_ids = duplicated["cluster"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, cluster_ids[1:] != cluster_ids[:-1]])
+    members = np.split(duplicated["id"].to_numpy(), starts[1:])
+    clusters = cluster_ids[starts]
+    phones = duplicated.groupby("cluster", sort=False)["phone_key"].first().reindex(clusters).tolist()
+    # A key is a match reason for a cluster if two members share its value.
+    matched = np.zeros((len(clusters), len(_MATCH_REASONS)), dtype=bool)
+    for column, key in enumerate(_MATCH_REASONS):
+        shared = duplicated.dropna(subset=[key])
+        matched[:, column] = np.isin(clusters, shared.loc[shared.duplicated(["cluster", key]), "cluster"])
+    reasons = list(_MATCH_REASONS.values())
+
+    suggestions = [
+        {
+            "primary_id": int(ids[0]),
+            "duplicate_ids": ids[1:].tolist(),
+            "matched_on": [reason for reason, hit in zip(reasons, row) if hit],
+            "phone": None if pd.isna(phone) else str(phone)
+        }
+        for ids, row, phone in zip(members, matched.tolist(), phones)
+    ]
+    suggestions.sort(key=lambda s: (-len(s["duplicate_ids"]), s["primary_id"]))
+    return suggestions
+
+def find_duplicates(frame: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """Clusters a frame of leads (id, name, phone, email); returns it keyed plus merge suggestions."""
+    keyed = build_blocking_keys(frame)
+    keyed["cluster"] = assign_clusters(keyed) if len(keyed) else pd.Series(dtype="int64")
+    return keyed, _merge_suggestions(keyed)
+
+def _load_leads(db: Session) -> pd.DataFrame:
+    rows = db.execute(select(Lead.id, Lead.name, Lead.phone, Lead.email).order_by(Lead.id)).all()
+    return pd.DataFrame.from_records(rows, columns=["id", "name", "phone", "email"]).astype({"id": "int64"})
+
+@simple_cache(ttl=300, key=lambda db: (), tags=("leads",))
+def get_duplicate_report(db: Session) -> Dict[str, Any]:
+    """
+    Duplicate analysis over the full leads table. `duplicate_rate` is the
+    percentage of leads that would be merged away, i.e. every member of a
+    cluster except the record it is merged into.
+    """
+    keyed, suggestions = find_duplicates(_load_leads(db))
+    total = len(keyed)
+    duplicates = sum(len(s["duplicate_ids"]) for s in suggestions)
+    return {
+        "total_leads": total,
+        "duplicate_leads": duplicates,
+        "duplicate_rate": round(duplicates / total * 100, 2) if total else 0.0,
+        "clusters": len(suggestions),
+        "suggestions": suggestions
+    }
@@ -5,7 +5,7 @@ from typing import List
 from app.models.followup import Followup
 from app.models.lead import Lead
 from app.schemas.followup import FollowupCreate
-from app.core.cache import clear_cache
+from app.core.cache import invalidate_tags
 
 def create_followup(db: Session, followup_in: FollowupCreate) -> Followup:
     """Create a new follow-up record for a lead and invalidate cache."""
@@ -26,8 +26,8 @@ def create_followup(db: Session, followup_in: FollowupCreate) -> Followup:
     db.commit()
     db.refresh(db_followup)
     
-    # 4. Invalidate cache
-    clear_cache()
+    # 4. Invalidate cached results that embed follow-ups
+    invalidate_tags("followups")
     
     return db_followup
 
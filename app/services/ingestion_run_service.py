@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import simple_cache, invalidate_tags
+from app.core.pagination import Page, keyset_query, build_page
+from app.models.ingestion_run import IngestionRun, IngestionSourceRun
+
+_SOURCE_RUN_FIELDS = (
+    "records", "inserted", "updated", "failed", "chunks", "fetch_seconds", "write_seconds",
+    "rows_per_second", "chunk_latency_p50_ms", "chunk_latency_p95_ms", "chunk_latency_p99_ms", "error"
+)
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive timestamps; runs are recorded in UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def record_ingestion_run(db: Session, summary: Dict[str, Any], incremental: bool = True) -> IngestionRun:
+    """Persists a registry run summary and its per-source results."""
+    run = IngestionRun(
+        status=summary["status"],
+        incremental=incremental,
+        started_at=summary["start_time"],
+        finished_at=summary["end_time"],
+        duration_seconds=summary["duration_seconds"],
+        total_processed=summary["total_processed"],
+        total_failed=summary["total_failed"],
+        rows_per_second=summary.get("rows_per_second")
+    )
+    for source in summary["sources"]:
+        run.sources.append(IngestionSourceRun(
+            source=source["name"],
+            status=source["status"],
+            started_at=source["started_at"],
+            finished_at=source["finished_at"],
+            since=source.get("since"),
+            **{field: source.get(field) for field in _SOURCE_RUN_FIELDS if source.get(field) is not None}
+        ))
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    invalidate_tags("ingestion")
+    return run
+
+def _run_to_summary(run: IngestionRun) -> Dict[str, Any]:
+    sources = [
+        {
+            "name": source.source,
+            "status": source.status,
+            "started_at": _as_utc(source.started_at),
+            "finished_at": _as_utc(source.finished_at),
+            "since": _as_utc(source.since),
+            **{field: getattr(source, field) for field in _SOURCE_RUN_FIELDS}
+        }
+        for source in run.sources
+    ]
+    return {
+        "run_id": run.id,
+        "status": run.status,
+        "start_time": _as_utc(run.started_at),
+        "end_time": _as_utc(run.finished_at),
+        "duration_seconds": run.duration_seconds,
+        "total_processed": run.total_processed,
+        "total_failed": run.total_failed,
+        "rows_per_second": run.rows_per_second,
+        "failed_sources": [s["name"] for s in sources if s["status"] != "success"],
+        "sources": sources
+    }
+
+@simple_cache(ttl=60, key=lambda db: (), tags=("ingestion",))
+def get_latest_summary(db: Session) -> Optional[Dict[str, Any]]:
+    """
+    The most recent committed ingestion run in the summary shape the
+    registry returns, or None before the first run. Served from the
+    (started_at, id) index and cached in the default backend, which is
+    per process unless CACHE_BACKEND=sqlite shares it between workers.
+    """
+    query = select(IngestionRun).order_by(IngestionRun.started_at.desc(), IngestionRun.id.desc()).limit(1)
+    run = db.execute(query).scalars().first()
+    return _run_to_summary(run) if run else None
+
+async def get_ingestion_history_async(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Page[IngestionRun]:
+    """Ingestion runs with their per-source results, newest first."""
+    query = keyset_query(select(IngestionRun), IngestionRun.started_at, IngestionRun.id, cursor, limit)
+    result = await db.execute(query)
+    return build_page(result.all(), limit)
@@ -1,6 +1,6 @@
-from typing import List, Dict, Any
-from app.models.lead import Lead
+from typing import Sequence, Dict, Any
+from app.schemas.lead_snapshot import LeadSnapshot
 
-def calculate_insight_quality(leads: List[Lead]) -> Dict[str, Any]:
+def calculate_insight_quality(leads: Sequence[LeadSnapshot]) -> Dict[str, Any]:
     # Dummy implementation
     return {"confidence_score": 85.0}
@@ -1,8 +1,46 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Tuple
+from sqlalchemy import select, case, func, literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.core.config import LEAD_NOTES_PREVIEW_COUNT
 from app.models.lead import Lead
+from app.models.lead_note import LeadNote
+from app.models.followup import Followup
 from app.schemas.lead import LeadCreate
-from app.core.cache import simple_cache, clear_cache
+from app.schemas.lead_snapshot import LeadSnapshot, FollowupSnapshot
+from app.core.cache import simple_cache, invalidate_tags
+from app.core.unit_of_work import invalidate_tags_on_commit
+
+NoteEntry = Tuple[str, Optional[str]]
+
+def _note_entries(row: Dict[str, Any]) -> List[NoteEntry]:
+    """
+    A row's notes as (body, delivery_key) pairs. `notes` is a single note
+    keyed by the row's `note_key`, or a list of bodies or of pairs.
+    """
+    notes = row.get("notes")
+    if not notes:
+        return []
+    if isinstance(notes, str):
+        return [(notes, row.get("note_key"))]
+    entries = []
+    for note in notes:
+        body, key = (note, None) if isinstance(note, str) else note
+        if body:
+            entries.append((body, key))
+    return entries
+
+def _append_notes(db: Session, notes: List[Dict[str, Any]]) -> None:
+    """Appends notes to their leads; a delivery the lead already has a note from is skipped."""
+    if notes:
+        stmt = sqlite_insert(LeadNote.__table__).on_conflict_do_nothing(
+            index_elements=["lead_id", "source", "delivery_key"]
+        )
+        db.execute(stmt, notes)
+
+def _note_row(lead_id: int, body: str, source: Optional[str], delivery_key: Optional[str] = None) -> Dict[str, Any]:
+    return {"lead_id": lead_id, "body": body, "source": source, "delivery_key": delivery_key}
 
 def upsert_lead(db: Session, lead_in: LeadCreate) -> Tuple[Lead, str]:
     """
@@ -21,30 +59,169 @@ def upsert_lead(db: Session, lead_in: LeadCreate) -> Tuple[Lead, str]:
         if lead_in.name and not existing_lead.name: existing_lead.name = lead_in.name
         if lead_in.email and not existing_lead.email: existing_lead.email = lead_in.email
         if lead_in.budget and not existing_lead.budget: existing_lead.budget = lead_in.budget
-        if lead_in.notes: existing_lead.notes = f"{existing_lead.notes}\n---\n{lead_in.notes}"
         
         db_lead = existing_lead
     else:
         # --- INSERT Logic ---
         status = "inserted"
-        db_lead = Lead(**lead_in.model_dump())
+        db_lead = Lead(**lead_in.model_dump(exclude={"notes"}))
         db.add(db_lead)
 
     # The commit is handled by the ingestion registry per-source
     db.flush()
+    # Notes are appended as their own rows, so the cost doesn't grow with the history.
+    if lead_in.notes:
+        _append_notes(db, [_note_row(db_lead.id, lead_in.notes, lead_in.source)])
     db.refresh(db_lead)
-    clear_cache()
+    invalidate_tags_on_commit(db, "leads")
     return db_lead, status
 
+# Rows per existing-phone lookup and executemany batch; keeps the IN list
+# well under SQLite's bound-parameter limit.
+BULK_UPSERT_CHUNK_SIZE = 500
+
+_LEAD_COLUMNS = ("name", "phone", "email", "source", "budget")
+
+def _merge_on_conflict(stmt):
+    """The upsert_lead merge rules expressed as ON CONFLICT(phone) DO UPDATE."""
+    existing = Lead.__table__.c
+    incoming = stmt.excluded
+    source_known = func.instr(
+        literal(",") + existing.source + literal(","),
+        literal(",") + incoming.source + literal(",")
+    ) > 0
+    return stmt.on_conflict_do_update(
+        index_elements=[existing.phone],
+        set_={
+            "source": case(
+                (existing.source.is_(None), incoming.source),
+                (source_known, existing.source),
+                else_=existing.source + literal(",") + incoming.source
+            ),
+            "name": func.coalesce(func.nullif(existing.name, ""), incoming.name),
+            "email": func.coalesce(func.nullif(existing.email, ""), incoming.email),
+            "budget": func.coalesce(func.nullif(existing.budget, 0), func.nullif(incoming.budget, 0), existing.budget)
+        }
+    )
+
+def bulk_upsert_leads(db: Session, leads_in: Sequence[LeadCreate]) -> List[str]:
+    """
+    Set-based equivalent of `upsert_lead` for ingestion batches.
+    Each chunk is merged with one prepared INSERT ... ON CONFLICT(phone),
+    executed for all of its rows, using the same merge rules. Notes are
+    appended to `lead_notes` in one more statement. Returns
+    'inserted' or 'updated' for each input row, in order. As with
+    `upsert_lead`, the caller commits.
+    """
+    return bulk_upsert_lead_rows(db, [lead_in.model_dump() for lead_in in leads_in])
+
+def bulk_upsert_lead_rows(db: Session, lead_rows: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    `bulk_upsert_leads` for rows that are already validated, e.g. by a
+    columnar import, in `LeadCreate.model_dump()` shape. A row's `notes` may
+    also be a list, to append several notes at once.
+
+    A row's `note_key` (or a `(body, key)` pair in `notes`) identifies the
+    source record the note came from; a record that is delivered again does
+    not repeat its note, while distinct records always add theirs.
+    """
+    statuses: List[str] = []
+    for start in range(0, len(lead_rows), BULK_UPSERT_CHUNK_SIZE):
+        rows = lead_rows[start:start + BULK_UPSERT_CHUNK_SIZE]
+
+        phones = {row["phone"] for row in rows}
+        seen = set(db.execute(select(Lead.phone).where(Lead.phone.in_(phones))).scalars())
+        for row in rows:
+            statuses.append("updated" if row["phone"] in seen else "inserted")
+            seen.add(row["phone"])
+
+        db.execute(
+            _merge_on_conflict(sqlite_insert(Lead.__table__)),
+            [{column: row.get(column) for column in _LEAD_COLUMNS} for row in rows]
+        )
+
+        noted = [row for row in rows if row.get("notes")]
+        if noted:
+            lead_ids = dict(db.execute(
+                select(Lead.phone, Lead.id).where(Lead.phone.in_({row["phone"] for row in noted}))
+            ).all())
+            _append_notes(db, [
+                _note_row(lead_ids[row["phone"]], body, row.get("source"), key)
+                for row in noted
+                for body, key in _note_entries(row)
+            ])
+
+    if lead_rows:
+        # Rows were written behind the ORM's back; drop any stale identities.
+        db.expire_all()
+        invalidate_tags_on_commit(db, "leads")
+    return statuses
+
 def create_lead(db: Session, lead_in: LeadCreate) -> Lead:
     """Simple lead creation. Ingestion should use upsert_lead."""
-    db_lead = Lead(**lead_in.model_dump())
+    db_lead = Lead(**lead_in.model_dump(exclude={"notes"}))
+    if lead_in.notes:
+        db_lead.note_entries.append(LeadNote(body=lead_in.notes, source=lead_in.source))
     db.add(db_lead)
     db.commit()
     db.refresh(db_lead)
-    clear_cache()
+    invalidate_tags("leads")
     return db_lead
 
-@simple_cache(ttl=120)
-def get_all_leads(db: Session) -> List[Lead]:
-    return db.query(Lead).options(joinedload(Lead.followups)).all()
+_LEAD_SNAPSHOT_QUERY = select(
+    Lead.id, Lead.name, Lead.phone, Lead.email, Lead.source,
+    Lead.budget, Lead.status, Lead.created_at
+).order_by(Lead.id)
+
+# Ranks notes newest-first per lead from the (lead_id, id) index alone, then
+# fetches bodies only for the latest LEAD_NOTES_PREVIEW_COUNT of each.
+_ranked_notes = select(
+    LeadNote.id,
+    func.row_number().over(partition_by=LeadNote.lead_id, order_by=LeadNote.id.desc()).label("rank")
+).subquery()
+
+_RECENT_NOTES_QUERY = (
+    select(LeadNote.lead_id, LeadNote.body)
+    .join(_ranked_notes, _ranked_notes.c.id == LeadNote.id)
+    .where(_ranked_notes.c.rank <= LEAD_NOTES_PREVIEW_COUNT)
+    .order_by(LeadNote.lead_id, _ranked_notes.c.rank)
+)
+
+_FOLLOWUP_SNAPSHOT_QUERY = select(
+    Followup.id, Followup.lead_id, Followup.note, Followup.status,
+    Followup.next_contact_date, Followup.created_at
+).order_by(Followup.id)
+
+def _build_lead_snapshots(lead_rows, followup_rows, note_rows) -> Tuple[LeadSnapshot, ...]:
+    followups_by_lead: Dict[int, List[FollowupSnapshot]] = {}
+    for row in followup_rows:
+        followups_by_lead.setdefault(row.lead_id, []).append(FollowupSnapshot.from_row(row))
+    notes_by_lead: Dict[int, List[str]] = {}
+    for row in note_rows:
+        notes_by_lead.setdefault(row.lead_id, []).append(row.body)
+    return tuple(
+        LeadSnapshot.from_row(row, tuple(followups_by_lead.get(row.id, ())), tuple(notes_by_lead.get(row.id, ())))
+        for row in lead_rows
+    )
+
+@simple_cache(ttl=120, key=lambda db: (), tags=("leads", "followups"))
+def get_all_leads(db: Session) -> Tuple[LeadSnapshot, ...]:
+    """
+    Returns every lead with its follow-ups and latest notes as immutable
+    snapshots.
+    Plain column queries are used so no ORM instances are built or kept
+    alive in the cache.
+    """
+    followup_rows = db.execute(_FOLLOWUP_SNAPSHOT_QUERY).all()
+    note_rows = db.execute(_RECENT_NOTES_QUERY).all()
+    lead_rows = db.execute(_LEAD_SNAPSHOT_QUERY).all()
+    return _build_lead_snapshots(lead_rows, followup_rows, note_rows)
+
+# Shares the cache namespace with get_all_leads, so sync and async readers
+# reuse the same entry.
+@simple_cache(ttl=120, key=lambda db: (), tags=("leads", "followups"), namespace=get_all_leads.cache_namespace)
+async def get_all_leads_async(db: AsyncSession) -> Tuple[LeadSnapshot, ...]:
+    followup_rows = (await db.execute(_FOLLOWUP_SNAPSHOT_QUERY)).all()
+    note_rows = (await db.execute(_RECENT_NOTES_QUERY)).all()
+    lead_rows = (await db.execute(_LEAD_SNAPSHOT_QUERY)).all()
+    return _build_lead_snapshots(lead_rows, followup_rows, note_rows)
@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.models.listing import Listing
 from app.schemas.listing import ListingCreate
@@ -12,3 +14,7 @@ def create_listing(db: Session, listing_in: ListingCreate) -> Listing:
 
 def get_all_listings(db: Session) -> List[Listing]:
     return db.query(Listing).all()
+
+async def get_all_listings_async(db: AsyncSession) -> List[Listing]:
+    result = await db.execute(select(Listing))
+    return list(result.scalars().all())
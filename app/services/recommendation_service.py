@@ -0,0 +1,117 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+from app.core.auth.security import UserRole
+from app.core.cache import cache_stats, default_cache
+from app.core.config import DECISION_CACHE_TTL_SECONDS
+from app.core.decision.engine import (
+    ENGINE_VERSION, PERSONA_WEIGHTS, generate_recommendations, filter_recommendations_by_persona, recommendation_fingerprint
+)
+from app.core.decision.rules import RuleEvaluation, evaluate_rules
+from app.core.governance.audit import stage_audit_log_entry
+from app.core.unit_of_work import UnitOfWork
+from app.models.decision_snapshot import DecisionSnapshot
+from app.schemas.audit_log import AuditLogCreate
+from app.schemas.decision import DecisionRecommendation
+from app.services.traceability_service import decision_snapshot_row
+
+def trace_recommendations(
+    uow: UnitOfWork,
+    recommendations: List[DecisionRecommendation],
+    persona: UserRole,
+    user_id: str,
+    analytics_metrics: Dict[str, Any]
+) -> List[DecisionRecommendation]:
+    """
+    Stages a snapshot and an audit entry for each recommendation and
+    replaces its id with the DTID. Nothing is written until `uow` commits.
+    """
+    for rec in recommendations:
+        # Capture snapshot for traceability
+        snapshot = decision_snapshot_row(
+            decision=rec,
+            user_id=user_id,
+            persona=persona,
+            inputs=analytics_metrics,
+            rules_fired=rec.explanation.get("triggered_rule_ids", []) if rec.explanation else [],
+            weights={"persona_weight": PERSONA_WEIGHTS.get(persona, 1.0)},
+            model_version=ENGINE_VERSION
+        )
+        uow.add(DecisionSnapshot, snapshot)
+
+        # Update recommendation ID with the generated DTID
+        rec.id = snapshot["decision_id"]
+
+        log_details = json.dumps({
+            "title": rec.title,
+            "priority": rec.priority.value,
+            "confidence": rec.confidence,
+            "explanation": rec.explanation,
+            "dtid": rec.id
+        })
+
+        log_entry = AuditLogCreate(
+            event_type="decision_generated",
+            decision=rec.recommendation[:255],
+            details=log_details,
+            persona=persona.value if persona else "anonymous"
+        )
+        stage_audit_log_entry(uow, log_entry)
+    return recommendations
+
+_RECOMMENDATIONS_NAMESPACE = f"{__name__}.get_persona_recommendations"
+# Metrics and confidence are derived from these tables.
+_RECOMMENDATIONS_TAGS = ("leads", "ingestion")
+
+def get_persona_recommendations(
+    uow: UnitOfWork,
+    analytics_metrics: Dict[str, Any],
+    confidence_score: float,
+    persona: UserRole,
+    user_id: str,
+    evaluation: Optional[RuleEvaluation] = None
+) -> List[DecisionRecommendation]:
+    """
+    Generates, filters and traces a persona's recommendations. Results are
+    memoized on the input fingerprint, so a repeat request with unchanged
+    metrics and confidence returns the DTIDs already recorded instead of
+    writing new snapshots and audit rows. Lead and ingestion writes drop
+    the cached entries.
+
+    A new result is cached only after `uow` commits, so no other request is
+    handed DTIDs whose snapshots do not exist yet (or never will). Requests
+    that miss concurrently each trace their own decisions.
+    """
+    # The requesting user is deliberately not part of the key: identical
+    # inputs for the same persona share one set of traced decisions.
+    cache_key = (_RECOMMENDATIONS_NAMESPACE, recommendation_fingerprint(analytics_metrics, confidence_score, persona))
+    found, cached = default_cache.lookup(cache_key)
+    if found:
+        cache_stats.record_hit(_RECOMMENDATIONS_NAMESPACE)
+        return cached
+
+    generation = default_cache.tag_generation(_RECOMMENDATIONS_TAGS)
+    started = time.perf_counter()
+    recommendations = generate_recommendations(analytics_metrics, confidence_score, persona, evaluation=evaluation)
+    filtered = filter_recommendations_by_persona(recommendations, persona)
+    traced = trace_recommendations(uow, filtered, persona, user_id, analytics_metrics)
+    cache_stats.record_miss(_RECOMMENDATIONS_NAMESPACE, time.perf_counter() - started)
+
+    uow.on_commit(lambda: default_cache.set(
+        cache_key, traced, ttl=DECISION_CACHE_TTL_SECONDS, tags=_RECOMMENDATIONS_TAGS, generation=generation
+    ))
+    return traced
+
+def get_persona_feeds(
+    uow: UnitOfWork,
+    analytics_metrics: Dict[str, Any],
+    confidence_score: float,
+    user_id: str,
+    personas: Optional[List[UserRole]] = None
+) -> Dict[UserRole, List[DecisionRecommendation]]:
+    """Traced feeds for each persona (all by default), sharing one rule evaluation."""
+    evaluation = evaluate_rules(analytics_metrics, confidence_score)
+    return {
+        persona: get_persona_recommendations(uow, analytics_metrics, confidence_score, persona, user_id, evaluation=evaluation)
+        for persona in personas or list(PERSONA_WEIGHTS)
+    }
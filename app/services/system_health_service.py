@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, func
 from typing import Dict, Any
-from app.core.cache import simple_cache
+from datetime import datetime, timedelta, timezone
+from app.core.cache import get_cache_metrics
+from app.models.lead import Lead
+from app.models.audit_log import AuditLog
 
 def get_system_health(db: Session, last_ingestion_summary: Dict[str, Any]) -> Dict[str, Any]:
     db_status = "healthy"
@@ -17,10 +20,22 @@ def get_system_health(db: Session, last_ingestion_summary: Dict[str, Any]) -> Di
     }
 
 def get_system_metrics(db: Session, last_ingestion_summary: Dict[str, Any]) -> Dict[str, Any]:
+    total_leads = db.query(func.count(Lead.id)).scalar() or 0
+
+    # Personas seen in the audit trail over the last day. SQLite keeps
+    # created_at as naive UTC text, so compare against a naive UTC bound.
+    since = (datetime.now(timezone.utc) - timedelta(hours=24)).replace(tzinfo=None)
+    active_users = db.query(func.count(func.distinct(AuditLog.persona))).filter(
+        AuditLog.created_at >= since,
+        AuditLog.persona.isnot(None),
+        AuditLog.persona != "anonymous"
+    ).scalar() or 0
+
     return {
-        "total_leads": 100, # Dummy
-        "active_users": 5,
-        "last_ingestion": last_ingestion_summary
+        "total_leads": total_leads,
+        "active_users": active_users,
+        "last_ingestion": last_ingestion_summary,
+        "cache": get_cache_metrics()
     }
 
 def get_ingestion_status(last_ingestion_summary: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,8 +1,11 @@
 import time
-import hashlib
+import secrets
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.pagination import Page, keyset_query, build_page
 from app.models.decision_snapshot import DecisionSnapshot
 from app.schemas.decision import DecisionRecommendation
 from app.core.auth.security import UserRole
@@ -10,14 +13,12 @@ from app.core.auth.security import UserRole
 def generate_dtid() -> str:
     """
     Generates a unique Decision Trace ID (DTID).
-    Format: dsc_<unix_timestamp>_<short_hash>
+    Format: dsc_<unix_timestamp>_<random_hex>
     """
     timestamp = int(time.time())
-    # Use a random component or unique input to ensure uniqueness
-    # Here using timestamp + simple hash for demonstration
-    raw_str = f"{timestamp}-{time.process_time()}"
-    short_hash = hashlib.sha256(raw_str.encode()).hexdigest()[:8]
-    return f"dsc_{timestamp}_{short_hash}"
+    # 48 random bits: DTIDs minted together in one batch, before anything is
+    # committed, must not collide within the same second.
+    return f"dsc_{timestamp}_{secrets.token_hex(6)}"
 
 def determine_governance_status(confidence: float) -> str:
     """
@@ -27,8 +28,7 @@ def determine_governance_status(confidence: float) -> str:
         return "REQUIRES_REVIEW"
     return "APPROVED"
 
-def capture_decision_snapshot(
-    db: Session,
+def decision_snapshot_row(
     decision: DecisionRecommendation,
     user_id: str,
     persona: UserRole,
@@ -36,15 +36,11 @@ def capture_decision_snapshot(
     rules_fired: List[str],
     weights: Dict[str, float],
     model_version: str = "v1.0"
-) -> DecisionSnapshot:
+) -> Dict[str, Any]:
     """
-    Persists a decision snapshot to the database.
+    Builds a decision snapshot row with a freshly generated DTID, for a
+    single insert or a batched unit of work.
     """
-    dtid = generate_dtid()
-    
-    # Ensure decision object has the DTID (if we were modifying the object in place, 
-    # but here we return the snapshot which has the ID)
-    
     # Construct explanation structure as per requirement
     # Existing explanation in decision might need adaptation or we use it as is if it fits
     explanation_data = decision.explanation if decision.explanation else {}
@@ -57,8 +53,8 @@ def capture_decision_snapshot(
 
     status = determine_governance_status(decision.confidence)
 
-    snapshot = DecisionSnapshot(
-        decision_id=dtid,
+    return dict(
+        decision_id=generate_dtid(),
         user_id=user_id,
         persona=persona.value,
         inputs=inputs,
@@ -70,6 +66,23 @@ def capture_decision_snapshot(
         status=status,
         model_version=model_version
     )
+
+def capture_decision_snapshot(
+    db: Session,
+    decision: DecisionRecommendation,
+    user_id: str,
+    persona: UserRole,
+    inputs: Dict[str, Any],
+    rules_fired: List[str],
+    weights: Dict[str, float],
+    model_version: str = "v1.0"
+) -> DecisionSnapshot:
+    """
+    Persists a decision snapshot to the database.
+    """
+    snapshot = DecisionSnapshot(**decision_snapshot_row(
+        decision, user_id, persona, inputs, rules_fired, weights, model_version
+    ))
     
     db.add(snapshot)
     db.commit()
@@ -79,3 +92,20 @@ def capture_decision_snapshot(
 
 def get_decision_snapshot(db: Session, decision_id: str) -> DecisionSnapshot:
     return db.query(DecisionSnapshot).filter(DecisionSnapshot.decision_id == decision_id).first()
+
+async def get_decision_snapshot_async(db: AsyncSession, decision_id: str) -> DecisionSnapshot:
+    result = await db.execute(select(DecisionSnapshot).where(DecisionSnapshot.decision_id == decision_id))
+    return result.scalars().first()
+
+async def list_decision_snapshots_async(
+    db: AsyncSession,
+    persona: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[DecisionSnapshot]:
+    query = select(DecisionSnapshot)
+    if persona:
+        query = query.where(DecisionSnapshot.persona == persona)
+    query = keyset_query(query, DecisionSnapshot.created_at, DecisionSnapshot.decision_id, cursor, limit)
+    result = await db.execute(query)
+    return build_page(result.all(), limit, id_attr="decision_id")
@@ -1,8 +1,8 @@
-from typing import List, Dict, Any
-from app.models.lead import Lead
+from typing import Sequence, Dict, Any
+from app.schemas.lead_snapshot import LeadSnapshot
 from datetime import datetime, timezone
 
-def calculate_data_freshness(leads: List[Lead]) -> Dict[str, Any]:
+def calculate_data_freshness(leads: Sequence[LeadSnapshot]) -> Dict[str, Any]:
     if not leads:
         return {"hours_since_last_update": 999}
 
@@ -0,0 +1,56 @@
+"""
+Measures end-to-end ingestion throughput against the stub source server.
+
+Runs every registered adapter through the registry into a throwaway SQLite
+database and prints records per second for each source:
+
+    python scripts/stub_source_server.py --records 50000 &
+    python scripts/benchmark_ingestion.py --base-url http://127.0.0.1:8765
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Add project root to Python path ---
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_db_engine
+from app.core.migrations import run_migrations
+from app.ingestion.registry import IngestionRegistry
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8765")
+    parser.add_argument("--concurrency", type=int, help="Page requests in flight per source")
+    parser.add_argument("--page-size", type=int)
+    args = parser.parse_args()
+
+    registry = IngestionRegistry()
+    for name in registry.get_available_sources():
+        adapter = registry.get_adapter(name)
+        adapter.base_url = args.base_url
+        if args.concurrency:
+            adapter.fetch_concurrency = args.concurrency
+        if args.page_size:
+            adapter.page_size = args.page_size
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'benchmark.db'}")
+        run_migrations(engine)
+        summary = registry.ingest_all(session_factory=sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        engine.dispose()
+
+    print(f"{'source':<10} {'status':<8} {'records':>9} {'rows/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for source in summary["sources"]:
+        latencies = [source[f"chunk_latency_p{q}_ms"] or 0.0 for q in (50, 95, 99)]
+        print(f"{source['name']:<10} {source['status']:<8} {source['records']:>9} {source['rows_per_second'] or 0.0:>9.0f} "
+              + " ".join(f"{value:>8.1f}" for value in latencies))
+    print(f"total: {summary['total_processed']} records in {summary['duration_seconds']:.2f}s "
+          f"({summary['rows_per_second'] or 0.0:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ from faker import Faker
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal, engine
+from app.core.migrations import run_migrations
 from app.models.lead import Lead
+from app.models.lead_note import LeadNote
 from app.models.followup import Followup
 
 # --- Simulation Configuration ---
@@ -44,8 +46,8 @@ def seed_data():
     """
     Generates and inserts realistic, production-like sales data for leads and follow-ups.
     """
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    # Create or upgrade the schema
+    run_migrations(engine)
     
     db = SessionLocal()
     try:
@@ -71,7 +73,7 @@ def seed_data():
                 source=source,
                 status=status,
                 created_at=created_date,
-                notes=f"Initial inquiry from {source}."
+                note_entries=[LeadNote(body=f"Initial inquiry from {source}.", source=source)]
             )
             leads.append(lead)
         
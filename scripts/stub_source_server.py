@@ -0,0 +1,138 @@
+"""
+Local HTTP stub for the CRM, FB Ads and WhatsApp sources.
+
+Replays the sample payloads from the ingestion adapters as paginated
+`GET /<source>?page=N&page_size=M` responses, with a configurable delay per
+request, so ingestion throughput can be benchmarked offline:
+
+    python scripts/stub_source_server.py --records 50000 --latency-ms 80
+    python scripts/benchmark_ingestion.py --base-url http://127.0.0.1:8765
+"""
+import argparse
+import copy
+import json
+import math
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# --- Add project root to Python path ---
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from app.ingestion import crm, fb_ads, whatsapp
+
+# Replayed record `i` is stamped EPOCH + i seconds, so timestamps ascend and
+# `since` can be answered by skipping straight to the first newer record.
+EPOCH = datetime(2023, 10, 27, tzinfo=timezone.utc)
+
+def _phone(index: int) -> str:
+    return f"+62813{index:08d}"
+
+def _vary_crm(record: Dict[str, Any], phone_index: int, index: int) -> None:
+    record["lead_id"] = f"CRM-{index:08d}"
+    record["contact_phone"] = _phone(phone_index)
+
+def _vary_fb_ads(record: Dict[str, Any], phone_index: int, index: int) -> None:
+    record["form_id"] = str(index)
+    record["created_time"] = (EPOCH + timedelta(seconds=index)).strftime("%Y-%m-%dT%H:%M:%S+0000")
+    for field in record["field_data"]:
+        if field["name"] == "phone_number":
+            field["values"] = [_phone(phone_index)]
+
+def _vary_whatsapp(record: Dict[str, Any], phone_index: int, index: int) -> None:
+    record["from"] = _phone(phone_index)
+    record["timestamp"] = str(int(EPOCH.timestamp()) + index)
+
+# Each source replays its samples in a loop, with a distinct phone per record
+# so every replayed record is a new lead. The offsets keep phones apart
+# across sources. CRM records carry no timestamp and ignore `since`.
+SOURCES: Dict[str, tuple] = {
+    "crm": (crm.MOCK_RECORDS, _vary_crm, 0, False),
+    "fb_ads": (fb_ads.MOCK_RECORDS, _vary_fb_ads, 20_000_000, True),
+    "whatsapp": (whatsapp.MOCK_RECORDS, _vary_whatsapp, 40_000_000, True),
+}
+
+def _first_index_since(since: Optional[datetime]) -> int:
+    if since is None:
+        return 0
+    return max(0, math.ceil((since - EPOCH).total_seconds()))
+
+def build_page(source: str, page: int, page_size: int, total_records: int, since: Optional[datetime] = None) -> Dict[str, Any]:
+    samples, vary, offset, timestamped = SOURCES[source]
+    first = _first_index_since(since) if timestamped else 0
+    remaining = max(0, total_records - first)
+    start = first + (page - 1) * page_size
+    data: List[Dict[str, Any]] = []
+    for index in range(start, min(start + page_size, total_records)):
+        record = copy.deepcopy(samples[index % len(samples)])
+        vary(record, offset + index, index)
+        data.append(record)
+    return {
+        "data": data,
+        "page": page,
+        "total_pages": max(1, math.ceil(remaining / page_size)),
+        "total_records": remaining
+    }
+
+def make_handler(total_records: int, latency_seconds: float) -> Callable[..., BaseHTTPRequestHandler]:
+    class StubSourceHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            source = url.path.strip("/")
+            if source not in SOURCES:
+                self.send_error(404, f"Unknown source '{source}'")
+                return
+            params = parse_qs(url.query)
+            try:
+                page = max(1, int(params.get("page", ["1"])[0]))
+                page_size = max(1, int(params.get("page_size", ["100"])[0]))
+                since = datetime.fromisoformat(params["since"][0]) if "since" in params else None
+            except ValueError:
+                self.send_error(400, "page and page_size must be integers and since an ISO-8601 timestamp")
+                return
+
+            if latency_seconds:
+                time.sleep(latency_seconds)
+            body = json.dumps(build_page(source, page, page_size, total_records, since)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubSourceHandler
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, total_records: int = 1000, latency_ms: float = 50) -> ThreadingHTTPServer:
+    """Builds the stub server; port 0 picks a free port (see `server_address`)."""
+    server = ThreadingHTTPServer((host, port), make_handler(total_records, latency_ms / 1000))
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--records", type=int, default=1000, help="Records served per source")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Delay added to every page request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.records, args.latency_ms)
+    print(f"Serving {', '.join(SOURCES)} on http://{args.host}:{server.server_address[1]} "
+          f"({args.records} records each, {args.latency_ms:g} ms per page)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
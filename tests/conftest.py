@@ -1,14 +1,21 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import get_db, get_async_db
+from app.core.migrations import run_migrations
+from app.core.cache import clear_cache
+from app.ingestion.webhook import whatsapp_webhook
 
 # --- Test Database Setup ---
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# A named shared-cache in-memory database, so the async engine used by the
+# read-only endpoints can open its own connections to the same data.
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:prosi_test?mode=memory&cache=shared&uri=true"
+SQLALCHEMY_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:prosi_test?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -17,8 +24,20 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create tables once for the entire test session
-Base.metadata.create_all(bind=engine)
+# Each test's writes stay inside an uncommitted transaction, so async readers
+# must read uncommitted data to see them.
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _read_uncommitted(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA read_uncommitted = 1")
+    cursor.close()
+
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Build the schema once for the entire test session
+run_migrations(engine)
 
 
 # --- Pytest Fixture for Test Client with Transactional DB ---
@@ -39,12 +58,30 @@ def client():
     def override_get_db():
         yield db_session
 
-    # Apply the override
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_session:
+            yield async_session
+
+    # Apply the overrides
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    # Start every test with an empty result cache
+    clear_cache()
 
     # Yield the test client
     with TestClient(app) as c:
-        yield c
+        # The lifespan started the webhook flusher, which writes through the
+        # real SessionLocal. Stop it so deliveries stay queued, and send any
+        # explicit flush into this test's transaction.
+        whatsapp_webhook.stop()
+        session_factory = whatsapp_webhook.session_factory
+        whatsapp_webhook.session_factory = lambda: TestingSessionLocal(bind=connection)
+        try:
+            yield c
+        finally:
+            whatsapp_webhook.flush()  # leave nothing queued for the next test
+            whatsapp_webhook.session_factory = session_factory
 
     # After the test, roll back the transaction and close the connection
     db_session.close()
@@ -53,3 +90,18 @@ def client():
 
     # Clear the override after the test
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def db():
+    """A session bound to a transaction that is rolled back after the test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    db_session = TestingSessionLocal(bind=connection)
+    clear_cache()
+
+    yield db_session
+
+    db_session.close()
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,15 @@
+def test_active_users_counts_personas_from_the_last_day(db):
+    from datetime import datetime, timedelta, timezone
+    from app.models.audit_log import AuditLog
+    from app.services.system_health_service import get_system_metrics
+
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        AuditLog(event_type="login", decision="ok", persona="Sales Agent"),  # server default timestamp
+        AuditLog(event_type="login", decision="ok", persona="Executive", created_at=now - timedelta(hours=1)),
+        AuditLog(event_type="login", decision="ok", persona="Analyst", created_at=now - timedelta(days=2)),
+        AuditLog(event_type="login", decision="ok", persona="anonymous"),
+    ])
+    db.flush()
+
+    assert get_system_metrics(db, {})["active_users"] == 2
@@ -0,0 +1,218 @@
+import time
+from app.core.cache import LRUCache, simple_cache, clear_cache
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, default_ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" is now the most recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+def test_lru_respects_byte_budget():
+    cache = LRUCache(max_entries=100, max_bytes=2000, default_ttl=None)
+    for i in range(10):
+        cache.set(i, "x" * 500)
+
+    assert cache.total_bytes <= 2000
+    assert len(cache) < 10
+    assert 9 in cache
+
+def test_entries_expire_lazily_and_on_sweep():
+    cache = LRUCache(default_ttl=0.01)
+    cache.set("short", 1)
+    cache.set("long", 2, ttl=60)
+    time.sleep(0.02)
+
+    assert cache.sweep_expired() == 1
+    assert cache.lookup("short") == (False, None)
+    assert cache.lookup("long") == (True, 2)
+
+def test_cached_none_is_a_hit():
+    cache = LRUCache()
+    cache.set("k", None)
+    assert cache.lookup("k") == (True, None)
+
+def test_simple_cache_uses_explicit_key_function():
+    clear_cache()
+    calls = []
+
+    @simple_cache(ttl=60, key=lambda db, limit=10: limit)
+    def fetch(db, limit=10):
+        calls.append(limit)
+        return [limit]
+
+    # Different session objects must not defeat the cache
+    assert fetch(object(), limit=5) == [5]
+    assert fetch(object(), limit=5) == [5]
+    assert fetch(object(), 7) == [7]
+    assert calls == [5, 7]
+
+def test_invalidate_tags_only_drops_dependent_entries():
+    cache = LRUCache(default_ttl=None)
+    cache.set("leads", [1], tags=("leads", "followups"))
+    cache.set("logs", [2], tags=("audit_logs",))
+
+    assert cache.invalidate_tags("audit_logs") == 1
+    assert "leads" in cache
+    assert "logs" not in cache
+
+    assert cache.invalidate_tags("followups") == 1
+    assert len(cache) == 0
+
+def test_invalidation_during_compute_keeps_stale_result_out():
+    from app.core.cache import invalidate_tags
+    clear_cache()
+    calls = []
+
+    @simple_cache(ttl=60, tags=("leads",))
+    def report():
+        calls.append(True)
+        if len(calls) == 1:
+            invalidate_tags("leads")  # a write commits while the first result is computed
+        return len(calls)
+
+    assert report() == 1
+    assert report() == 2  # the stale first result was not cached
+    assert report() == 2
+
+def test_sqlite_backend_skips_sets_from_an_older_generation(tmp_path):
+    from app.core.cache import SQLiteCacheBackend
+
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path, default_ttl=None)
+    worker_b = SQLiteCacheBackend(path, default_ttl=None)
+
+    generation = worker_a.tag_generation(("leads",))
+    worker_b.invalidate_tags("leads")
+    worker_a.set("report", "stale", tags=("leads",), generation=generation)
+    assert "report" not in worker_a
+
+    worker_a.set("report", "fresh", tags=("leads",), generation=worker_a.tag_generation(("leads",)))
+    assert worker_b.lookup("report") == (True, "fresh")
+
+def test_audit_write_keeps_cached_leads(client):
+    from app.core.cache import default_cache
+    from app.services.lead_service import get_all_leads
+
+    client.get("/api/v1/leads/")
+    leads_key = (get_all_leads.cache_namespace, ())
+    assert leads_key in default_cache
+
+    client.post("/api/v1/auth/login", json={"persona": "Sales Manager"})  # writes an audit row
+    assert leads_key in default_cache
+
+    client.post("/api/v1/leads/", json={"name": "Tag Test", "phone": "+6281200000001", "source": "crm"})
+    assert leads_key not in default_cache
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    from app.core.cache import SQLiteCacheBackend
+
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path, default_ttl=None)
+    worker_b = SQLiteCacheBackend(path, default_ttl=None)
+
+    worker_a.set(("ns", 1), {"leads": [1, 2]}, tags=("leads",))
+    worker_a.set(("ns", 2), ["log"], tags=("audit_logs",))
+    assert worker_b.lookup(("ns", 1)) == (True, {"leads": [1, 2]})
+
+    # An invalidation in one worker is visible to the other
+    assert worker_b.invalidate_tags("leads") == 1
+    assert ("ns", 1) not in worker_a
+    assert ("ns", 2) in worker_a
+
+def test_sqlite_backend_expires_and_bounds_entries(tmp_path):
+    from app.core.cache import SQLiteCacheBackend
+
+    cache = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=3, default_ttl=None)
+    cache.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.lookup("short") == (False, None)
+
+    for i in range(5):
+        cache.set(i, i)
+    assert len(cache) == 3
+
+def test_single_flight_coalesces_concurrent_callers():
+    import threading
+    from app.core.cache import SingleFlight
+
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_query():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["lead"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("leads", slow_query)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("leads", slow_query))) for _ in range(5)]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)  # let the followers reach the in-flight call
+    release.set()
+    for t in [leader] + followers:
+        t.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == [["lead"]] * 6
+    assert flights.in_flight() == 0
+
+def test_single_flight_async_callers_share_one_task():
+    import asyncio
+    from app.core.cache import SingleFlight
+
+    flights = SingleFlight()
+    calls = []
+
+    async def slow_query():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run():
+        return await asyncio.gather(*(flights.do_async("metrics", slow_query) for _ in range(10)))
+
+    assert asyncio.run(run()) == [42] * 10
+    assert len(calls) == 1
+
+def test_system_metrics_report_cache_activity(client):
+    from app.core.cache import cache_stats
+    from app.services.lead_service import get_all_leads
+
+    cache_stats.reset()
+    client.get("/api/v1/leads/")
+    client.get("/api/v1/leads/")
+
+    response = client.get("/api/v1/system/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_leads"] == 0
+
+    leads_stats = data["cache"]["namespaces"][get_all_leads.cache_namespace]
+    assert leads_stats["misses"] == 1
+    assert leads_stats["hits"] == 1
+    assert leads_stats["entries"] == 1
+    assert leads_stats["bytes"] > 0
+
+def test_async_audit_log_reads_see_new_entries(client):
+    token = client.post("/api/v1/auth/login", json={"persona": "Founder / Executive"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/v1/governance/audit_logs", headers=headers)
+    assert first.status_code == 200
+    assert [log["event_type"] for log in first.json()["items"]] == ["user_login"]
+
+    # A second login invalidates the cached page for the async reader too
+    client.post("/api/v1/auth/login", json={"persona": "Sales Manager"})
+    second = client.get("/api/v1/governance/audit_logs", headers=headers)
+    assert len(second.json()["items"]) == 2
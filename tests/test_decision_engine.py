@@ -42,3 +42,113 @@ def test_sales_manager_weighting():
     
     # Base confidence 70 * 1.1 = 77
     assert sales_rec.confidence == 77.0
+
+def test_rules_evaluate_once_and_registered_rules_apply(monkeypatch):
+    from app.core.decision import rules
+
+    monkeypatch.setattr(rules, "RULES", list(rules.RULES))
+    monkeypatch.setattr(rules, "_plan", None)
+
+    analytics = {"duplicate_rate": 2, "data_completeness": 80}
+    evaluation = rules.evaluate_rules(analytics, 70.0)
+    assert evaluation.all_passed
+    assert evaluation.triggered_rule_ids == ("CONFIDENCE_CHECK", "POLICY_VIOLATION_CHECK", "COMPLETENESS_CHECK")
+    assert evaluation.by_id["POLICY_VIOLATION_CHECK"].explanation == "Data duplication rate is 2%, which does not violate the 5% policy."
+
+    rules.register_rule(rules.Rule(
+        rule_id="FOLLOWUP_BACKLOG_CHECK",
+        metric="overdue_followups",
+        comparator="<",
+        threshold=10,
+        weight=0.1,
+        explanation="{value} follow-ups are overdue, which is {verdict} the limit of {threshold:g}.",
+        verdicts=("within", "over")
+    ))
+    with pytest.raises(ValueError):
+        rules.register_rule(rules.Rule("FOLLOWUP_BACKLOG_CHECK", "x", ">=", 1, 0.1, ""))
+
+    recs = generate_recommendations({**analytics, "overdue_followups": 25}, 70.0, UserRole.SALES_MANAGER)
+    assert not any(r.title == "Proceed with Automated Outreach" for r in recs)
+
+def test_persona_feeds_match_single_persona_generation():
+    from app.core.decision.engine import generate_persona_feeds, filter_recommendations_by_persona
+
+    analytics = {"duplicate_rate": 1, "data_completeness": 50}
+    feeds = generate_persona_feeds(analytics, 75.0)
+    assert set(feeds) == set(UserRole)
+    for persona, feed in feeds.items():
+        expected = filter_recommendations_by_persona(generate_recommendations(analytics, 75.0, persona), persona)
+        assert [(r.title, r.priority, r.confidence) for r in feed] == [(r.title, r.priority, r.confidence) for r in expected]
+
+def test_batch_endpoint_traces_every_feed(client):
+    token = client.post("/api/v1/auth/login", json={"persona": "Founder / Executive"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get("/api/v1/decisions/recommendations/batch", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body["feeds"]) == {role.value for role in UserRole}
+    assert any(body["feeds"].values())
+
+    for persona, feed in body["feeds"].items():
+        for rec in feed:
+            trace = client.get(f"/api/v1/decisions/{rec['id']}", headers=headers).json()
+            assert trace["persona"] == persona
+
+    only_ops = client.get("/api/v1/decisions/recommendations/batch", params={"personas": "ops_crm"}, headers=headers).json()
+    assert list(only_ops["feeds"]) == ["ops_crm"]
+
+def test_repeat_requests_reuse_traced_decisions(client, db):
+    from app.models.audit_log import AuditLog
+    from app.models.decision_snapshot import DecisionSnapshot
+    from app.core.cache import invalidate_tags
+
+    token = client.post("/api/v1/auth/login", json={"persona": "Founder / Executive"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    first = client.get("/api/v1/decisions/recommendations", headers=headers).json()
+    snapshots = db.query(DecisionSnapshot).count()
+    audits = db.query(AuditLog).filter(AuditLog.event_type == "decision_generated").count()
+    assert first and snapshots == len(first)
+
+    second = client.get("/api/v1/decisions/recommendations", headers=headers).json()
+    assert [r["id"] for r in second] == [r["id"] for r in first]
+    assert db.query(DecisionSnapshot).count() == snapshots
+    assert db.query(AuditLog).filter(AuditLog.event_type == "decision_generated").count() == audits
+
+    # The batch feed for the same persona and inputs shares the entry.
+    batch = client.get("/api/v1/decisions/recommendations/batch", params={"personas": "founder"}, headers=headers).json()
+    assert [r["id"] for r in batch["feeds"]["founder"]] == [r["id"] for r in first]
+
+    invalidate_tags("leads")
+    third = client.get("/api/v1/decisions/recommendations", headers=headers).json()
+    assert {r["id"] for r in third}.isdisjoint(r["id"] for r in first)
+
+def test_fingerprint_tracks_inputs_persona_and_rules():
+    from app.core.decision.engine import recommendation_fingerprint
+
+    metrics = {"duplicate_rate": 1, "data_completeness": 80}
+    base = recommendation_fingerprint(metrics, 70.0, UserRole.FOUNDER)
+    assert base == recommendation_fingerprint(dict(reversed(list(metrics.items()))), 70.0, UserRole.FOUNDER)
+    assert base != recommendation_fingerprint({**metrics, "duplicate_rate": 2}, 70.0, UserRole.FOUNDER)
+    assert base != recommendation_fingerprint(metrics, 70.5, UserRole.FOUNDER)
+    assert base != recommendation_fingerprint(metrics, 70.0, UserRole.OPS_CRM)
+
+def test_recommendations_are_cached_only_after_commit(db):
+    from app.core.cache import clear_cache, default_cache
+    from app.core.decision.engine import recommendation_fingerprint
+    from app.core.unit_of_work import UnitOfWork
+    from app.services.recommendation_service import _RECOMMENDATIONS_NAMESPACE, get_persona_recommendations
+
+    clear_cache()
+    analytics = {"duplicate_rate": 0, "data_completeness": 50}
+    cache_key = (_RECOMMENDATIONS_NAMESPACE, recommendation_fingerprint(analytics, 70.0, UserRole.OPS_CRM))
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db) as uow:
+            get_persona_recommendations(uow, analytics, 70.0, UserRole.OPS_CRM, "ops")
+            raise RuntimeError("commit never happens")
+    assert cache_key not in default_cache
+
+    with UnitOfWork(db) as uow:
+        recs = get_persona_recommendations(uow, analytics, 70.0, UserRole.OPS_CRM, "ops")
+        assert cache_key not in default_cache
+    assert recs and default_cache.get(cache_key) == recs
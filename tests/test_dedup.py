@@ -0,0 +1,39 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.services.dedup_service import normalize_phones, canonicalize_emails, canonicalize_names
+from app.services.analytics_service import get_key_metrics
+
+def test_phone_and_identity_canonicalization():
+    phones = pd.Series(["+62 812-3456-7890", "081234567890", "6281234567890", "0062 812 3456 7890", "n/a", None])
+    assert normalize_phones(phones).tolist()[:4] == ["+6281234567890"] * 4
+    assert normalize_phones(phones).isna().tolist()[4:] == [True, True]
+
+    emails = canonicalize_emails(pd.Series([" Budi+Ads@Example.COM", "budi@example.com", "not-an-email"]))
+    assert emails.tolist()[:2] == ["budi@example.com"] * 2
+    assert pd.isna(emails.iloc[2])
+
+    names = canonicalize_names(pd.Series(["Budi  Santoso", "santoso, BUDI"]))
+    assert names.nunique() == 1
+
+def test_duplicate_report_clusters_variant_phones_and_emails(client: TestClient, db):
+    leads = [
+        {"name": "Budi Santoso", "phone": "+6281234567890", "source": "crm"},
+        {"name": "Budi", "phone": "081234567890", "source": "whatsapp"},
+        {"name": "Sari", "phone": "+6281100000001", "email": "sari@example.com", "source": "crm"},
+        {"name": "Sari W", "phone": "+6281100000002", "email": "Sari+fb@example.com", "source": "fb_ads"},
+        {"name": "Andi", "phone": "+6281900000003", "source": "crm"},
+    ]
+    ids = [client.post("/api/v1/leads/", json=lead).json()["id"] for lead in leads]
+
+    report = client.get("/api/v1/leads/duplicates").json()
+    assert report["total_leads"] == 5
+    assert report["duplicate_leads"] == 2
+    assert report["duplicate_rate"] == 40.0
+    by_primary = {s["primary_id"]: s for s in report["suggestions"]}
+    assert by_primary[ids[0]]["duplicate_ids"] == [ids[1]]
+    assert "phone" in by_primary[ids[0]]["matched_on"]
+    assert by_primary[ids[2]]["duplicate_ids"] == [ids[3]]
+    assert by_primary[ids[2]]["matched_on"] == ["email"]
+
+    assert get_key_metrics(db)["duplicate_rate"] == 40.0
@@ -0,0 +1,432 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from app.ingestion.base import BaseIngestion
+from app.ingestion.registry import IngestionRegistry
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate
+
+class FakeIngestion(BaseIngestion):
+    def __init__(self, name: str, phones: List[str], delay: float = 0.0, error: Exception = None):
+        self._name = name
+        self._phones = phones
+        self._delay = delay
+        self._error = error
+
+    @property
+    def source_name(self) -> str:
+        return self._name
+
+    @property
+    def trust_score(self) -> float:
+        return 0.5
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        time.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return [{"phone": phone} for phone in self._phones]
+
+    def normalize(self, raw_data: List[Dict[str, Any]]) -> List[LeadCreate]:
+        return [LeadCreate(name="Fake", phone=row["phone"], source=self._name) for row in raw_data]
+
+def test_ingest_all_runs_sources_concurrently_and_reports_each(db):
+    fast = FakeIngestion("fast", ["+6281200000020", "+6281200000021"])
+    broken = FakeIngestion("broken", [], error=RuntimeError("upstream down"))
+    slow = FakeIngestion("slow", ["+6281200000022"], delay=1.0)
+    slow.timeout_seconds = 0.2
+    registry = IngestionRegistry(adapters=[fast, broken, slow], max_workers=3)
+
+    started = time.perf_counter()
+    summary = registry.ingest_all(session_factory=lambda: db)
+    assert time.perf_counter() - started < 0.9  # did not wait for the slow source
+
+    sources = {s["name"]: s for s in summary["sources"]}
+    assert sources["fast"]["status"] == "success"
+    assert sources["fast"]["inserted"] == 2
+    assert "fetch_seconds" in sources["fast"]
+    assert sources["broken"]["status"] == "failed"
+    assert "upstream down" in sources["broken"]["error"]
+    assert sources["slow"]["status"] == "timeout"
+
+    assert summary["status"] == "partial"
+    assert summary["total_processed"] == 2
+    assert summary["failed_sources"] == ["broken", "slow"]
+    assert db.query(Lead).filter(Lead.source == "fast").count() == 2
+    assert summary["run_id"] is not None
+    assert sources["fast"]["chunk_latency_p50_ms"] is not None
+    assert sources["fast"]["rows_per_second"] > 0
+
+def test_sources_waiting_for_a_worker_do_not_time_out(db):
+    # One worker: each source waits for the ones before it, well past its
+    # timeout, but never takes longer than the timeout to fetch.
+    sources = [FakeIngestion(f"queued_{i}", [f"+62812000001{i}0"], delay=0.15) for i in range(4)]
+    for source in sources:
+        source.timeout_seconds = 0.3
+    registry = IngestionRegistry(adapters=sources, max_workers=1)
+
+    summary = registry.ingest_all(session_factory=lambda: db)
+
+    assert [s["status"] for s in summary["sources"]] == ["success"] * 4
+    assert summary["total_processed"] == 4
+
+class StreamingIngestion(BaseIngestion):
+    chunk_size = 100
+
+    def __init__(self, total: int):
+        self.total = total
+        self.fetched = 0
+        self.max_in_flight = 0
+        self.normalized = 0
+
+    @property
+    def source_name(self) -> str:
+        return "stream"
+
+    @property
+    def trust_score(self) -> float:
+        return 0.5
+
+    def iter_fetch(self):
+        for i in range(self.total):
+            self.fetched += 1
+            self.max_in_flight = max(self.max_in_flight, self.fetched - self.normalized)
+            # Every 50th record has a phone that fails validation.
+            phone = "123" if i % 50 == 0 else f"+62812{i:08d}"
+            yield {"phone": phone}
+
+    def normalize_record(self, raw: Dict[str, Any]) -> LeadCreate:
+        self.normalized += 1
+        return LeadCreate(name="Stream", phone=raw["phone"], source="stream")
+
+def test_streaming_source_is_written_in_chunks_with_rejects(db):
+    source = StreamingIngestion(total=250)
+    summary = IngestionRegistry(adapters=[source]).ingest_all(session_factory=lambda: db)
+
+    result = summary["sources"][0]
+    assert result["status"] == "success"
+    assert result["chunks"] == 3
+    assert result["records"] == 250
+    assert result["failed"] == 5
+    assert result["inserted"] == 245
+    # Only one chunk of raw records is buffered at a time.
+    assert source.max_in_flight <= source.chunk_size
+    assert db.query(Lead).filter(Lead.source == "stream").count() == 245
+
+def test_legacy_list_adapters_still_run():
+    adapter = FakeIngestion("legacy", ["+6281200000030"])
+    assert [lead.phone for lead in adapter.run()] == ["+6281200000030"]
+    assert [chunk.size for chunk in adapter.iter_chunks()] == [1]
+
+def test_async_fetch_pulls_pages_concurrently_from_stub_server():
+    from scripts.stub_source_server import make_server
+    from app.ingestion.crm import CRMIngestion
+
+    server = make_server(port=0, total_records=200, latency_ms=100)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        adapter = CRMIngestion()
+        adapter.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        adapter.page_size = 20
+        adapter.fetch_concurrency = 5
+
+        started = time.perf_counter()
+        leads = adapter.run()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(leads) == 200
+    assert len({lead.phone for lead in leads}) == 200
+    # 10 pages at 100 ms each would take a second if fetched one by one.
+    assert elapsed < 0.7
+
+def test_incremental_runs_resume_from_committed_watermark(db):
+    from scripts.stub_source_server import make_server
+    from app.ingestion.whatsapp import WhatsAppIngestion
+    from app.ingestion.watermarks import get_watermark
+
+    server = make_server(port=0, total_records=120, latency_ms=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        adapter = WhatsAppIngestion()
+        adapter.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        adapter.page_size = 50
+        adapter.chunk_size = 40
+        registry = IngestionRegistry(adapters=[adapter])
+
+        first = registry.ingest_all(session_factory=lambda: db)["sources"][0]
+        watermark = get_watermark(db, "whatsapp")
+        second = registry.ingest_all(session_factory=lambda: db)["sources"][0]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first["inserted"] == 120
+    assert watermark is not None
+    # Only the record at the watermark is re-read, and merging it is a no-op.
+    assert second["records"] == 1
+    assert second["updated"] == 1
+    assert second["since"] == watermark
+    assert get_watermark(db, "whatsapp") == watermark
+    assert db.query(Lead).filter(Lead.source == "whatsapp").count() == 120
+    # The re-read record is the same delivery, so its note is not appended again.
+    assert all(len(lead.note_entries) == 1 for lead in db.query(Lead).filter(Lead.source == "whatsapp"))
+
+def test_runs_are_recorded_and_listed_in_history(client, db):
+    from app.services.ingestion_run_service import get_latest_summary
+
+    registry = IngestionRegistry(adapters=[
+        FakeIngestion("fast", ["+6281200000030"]),
+        FakeIngestion("broken", [], error=RuntimeError("upstream down"))
+    ])
+    first = registry.ingest_all(session_factory=lambda: db)
+    second = registry.ingest_all(session_factory=lambda: db)
+
+    latest = get_latest_summary(db)
+    assert latest["run_id"] == second["run_id"]
+    assert latest["status"] == "partial"
+    assert latest["failed_sources"] == ["broken"]
+    assert latest["sources"][0]["records"] == 1
+
+    login = client.post("/api/v1/auth/login", json={"persona": "Operations / CRM Manager"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    page = client.get("/api/v1/ingestion/runs?limit=1", headers=headers).json()
+    assert [run["id"] for run in page["items"]] == [second["run_id"]]
+    assert {s["source"] for s in page["items"][0]["sources"]} == {"fast", "broken"}
+
+    older = client.get(f"/api/v1/ingestion/runs?limit=1&cursor={page['next_cursor']}", headers=headers).json()
+    assert older["items"][0]["id"] == first["run_id"]
+
+def test_file_import_validates_columns_and_bulk_writes(db, tmp_path):
+    import pandas as pd
+    from app.ingestion.file_import import FileIngestion
+
+    frame = pd.DataFrame({
+        "full_name": ["Budi", "Sari", None, "Andi", "Rudi"],
+        "mobile": ["081200000040", "0812", "+6281200000042", "+6281200000043", "+6281200000044"],
+        # The last address passes a loose pattern, but not the schema's EmailStr.
+        "email": ["Budi@Example.COM", None, "not-an-email", None, "rudi..s@example.com"],
+        "budget": ["1500000000", None, "abc", "2e9", None],
+    })
+    frame.to_csv(tmp_path / "partner.csv", index=False)
+    frame.to_parquet(tmp_path / "partner.parquet")
+    columns = {"name": "full_name", "phone": "mobile"}
+
+    adapter = FileIngestion(tmp_path / "partner.csv", source_name="agency_a", columns=columns)
+    adapter.chunk_size = 3
+    chunks = list(adapter.iter_chunks())
+    assert [chunk.size for chunk in chunks] == [3, 2]
+    rejected = [r for chunk in chunks for r in chunk.rejected]
+    assert [r.error for r in rejected] == [
+        "phone: must be 10-15 characters",
+        "name: field required; email: not a valid email address; budget: not a number",
+        "email: not a valid email address",
+    ]
+
+    registry = IngestionRegistry(adapters=[FileIngestion(tmp_path / "partner.parquet", source_name="agency_a", columns=columns)])
+    source = registry.ingest_all(session_factory=lambda: db)["sources"][0]
+    assert (source["inserted"], source["failed"]) == (2, 3)
+    budi = db.query(Lead).filter(Lead.phone == "081200000040").one()
+    # Normalized exactly as LeadCreate would: the domain is lower-cased.
+    assert (budi.source, budi.budget, budi.email) == ("agency_a", 1500000000, "Budi@example.com")
+
+def test_file_import_endpoint_is_confined_to_import_dir(client):
+    login = client.post("/api/v1/auth/login", json={"persona": "Operations / CRM Manager"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    response = client.post("/api/v1/ingestion/import", json={"path": "../app/main.py"}, headers=headers)
+    assert response.status_code == 400
+
+def test_rejected_records_are_dead_lettered_and_replayable(client, db):
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+    from app.services.dead_letter_service import replay_dead_letters
+
+    adapter = StreamingIngestion(total=120)
+    registry = IngestionRegistry(adapters=[adapter])
+    registry.ingest_all(session_factory=lambda: db)
+
+    letters = db.query(IngestionDeadLetter).order_by(IngestionDeadLetter.id).all()
+    assert [letter.payload for letter in letters] == [{"phone": "123"}] * 3
+    assert all(letter.source == "stream" and "phone" in letter.error for letter in letters)
+
+    login = client.post("/api/v1/auth/login", json={"persona": "Operations / CRM Manager"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    fixed = client.patch(
+        f"/api/v1/ingestion/dead_letters/{letters[0].id}",
+        json={"payload": {"phone": "+6281299999999"}},
+        headers=headers
+    )
+    assert fixed.status_code == 200
+    db.expire_all()  # the fix was committed through the API's session
+
+    result = replay_dead_letters(db, source="stream", batch_size=2, ingestion_registry=registry)
+    assert result == {"replayed": 1, "failed": 2}
+    assert db.query(Lead).filter(Lead.phone == "+6281299999999").count() == 1
+
+    pending = client.get("/api/v1/ingestion/dead_letters?source=stream", headers=headers).json()
+    assert [item["attempts"] for item in pending["items"]] == [2, 2]
+
+def test_dead_letter_replay_marks_malformed_payloads_failed(db):
+    from app.ingestion.whatsapp import WhatsAppIngestion
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+    from app.services.dead_letter_service import replay_dead_letters
+
+    db.add_all([
+        # A non-string body raises AttributeError inside the normalizer.
+        IngestionDeadLetter(source="whatsapp", payload={"from": "+6281200000070", "text": {"body": 5}}, error="bad body"),
+        IngestionDeadLetter(source="whatsapp", error="flush failed", payload={
+            "from": "+6281200000071", "profile": {"name": "Wati"}, "timestamp": "1698382800", "text": {"body": "Halo"}
+        }),
+    ])
+    db.commit()
+
+    registry = IngestionRegistry(adapters=[WhatsAppIngestion()])
+    assert replay_dead_letters(db, source="whatsapp", ingestion_registry=registry) == {"replayed": 1, "failed": 1}
+    assert db.query(Lead).filter(Lead.phone == "+6281200000071").count() == 1
+
+def test_dead_letter_replay_reads_each_batch_with_one_query(db):
+    from sqlalchemy import event
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+    from app.services.dead_letter_service import replay_dead_letters
+
+    registry = IngestionRegistry(adapters=[StreamingIngestion(total=0)])
+    db.add_all([
+        IngestionDeadLetter(source="stream", payload={"phone": "123"}, error="bad phone") for _ in range(40)
+    ])
+    db.commit()
+
+    selects: List[str] = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "ingestion_dead_letters" in statement:
+            selects.append(statement)
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = replay_dead_letters(db, source="stream", limit=35, batch_size=10, ingestion_registry=registry)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert result == {"replayed": 0, "failed": 35}
+    # Four batches (10, 10, 10, 5), each loaded by a single query.
+    assert len(selects) == 4
+    attempts = [letter.attempts for letter in db.query(IngestionDeadLetter).order_by(IngestionDeadLetter.id)]
+    assert attempts == [2] * 35 + [1] * 5
+
+def test_webhook_buffer_coalesces_messages_per_phone(db):
+    from app.ingestion.webhook import WebhookBuffer
+    from app.ingestion.whatsapp import WhatsAppIngestion
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+
+    buffer = WebhookBuffer(WhatsAppIngestion(), session_factory=lambda: db, flush_max_messages=100)
+    messages = [
+        {"from": "+6281200000050", "profile": {"name": "Eko"}, "timestamp": "1698382800", "text": {"body": "Halo"}},
+        {"from": "+6281200000051", "profile": {"name": "Ratna"}, "timestamp": "1698382801", "text": {"body": "Info rumah"}},
+        {"from": "+6281200000050", "profile": {"name": "Eko"}, "timestamp": "1698382802", "text": {"body": "Budget 1M"}},
+        {"from": "+6281200000052", "timestamp": "1698382803", "text": {"body": "no profile"}},
+    ]
+    assert buffer.submit(messages) == 4
+    assert buffer.metrics()["queue_depth"] == 4
+    assert buffer.flush() == 4
+
+    eko = db.query(Lead).filter(Lead.phone == "+6281200000050").one()
+    assert [note.body for note in eko.note_entries] == ["Initial query: Halo", "Initial query: Budget 1M"]
+    assert eko.budget == 1000000000
+    assert db.query(IngestionDeadLetter).filter(IngestionDeadLetter.source == "whatsapp").count() == 1
+    metrics = buffer.metrics()
+    assert (metrics["flushes"], metrics["written_leads"], metrics["rejected"], metrics["queue_depth"]) == (1, 2, 1, 0)
+
+def test_webhook_batch_that_fails_to_commit_is_dead_lettered_for_replay():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.core.database import Base
+    from app.ingestion.webhook import WebhookBuffer
+    from app.ingestion.whatsapp import WhatsAppIngestion
+    from app.models.ingestion_dead_letter import IngestionDeadLetter
+    from app.services.dead_letter_service import replay_dead_letters
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    sessions = []
+    def session_factory():
+        session = SessionLocal()
+        if not sessions:
+            def fail():
+                raise RuntimeError("database is locked")
+            session.commit = fail
+        sessions.append(session)
+        return session
+
+    adapter = WhatsAppIngestion()
+    buffer = WebhookBuffer(adapter, session_factory=session_factory, flush_max_messages=100)
+    assert buffer.submit([
+        {"id": "wamid.1", "from": "+6281200000055", "profile": {"name": "Yanti"}, "timestamp": "1698382800", "text": {"body": "Halo"}},
+        {"id": "wamid.2", "from": "+6281200000056", "timestamp": "1698382801", "text": {"body": "no profile"}},
+    ]) == 2
+    buffer.flush()
+
+    metrics = buffer.metrics()
+    assert (metrics["failed_messages"], metrics["dead_lettered"]) == (2, 2)
+    db = SessionLocal()
+    try:
+        assert db.query(Lead).count() == 0
+        # The invalid message keeps its own error; the valid one records the failed write.
+        errors = {letter.payload["id"]: letter.error for letter in db.query(IngestionDeadLetter)}
+        assert errors == {"wamid.1": "Webhook flush failed: database is locked", "wamid.2": "'profile'"}
+
+        result = replay_dead_letters(db, source="whatsapp", ingestion_registry=IngestionRegistry(adapters=[adapter]))
+        assert result == {"replayed": 1, "failed": 1}
+        assert db.query(Lead).filter(Lead.phone == "+6281200000055").one().name == "Yanti"
+    finally:
+        db.close()
+        engine.dispose()
+
+def test_webhook_buffer_drops_messages_beyond_capacity():
+    from app.ingestion.webhook import WebhookBuffer
+    from app.ingestion.whatsapp import WhatsAppIngestion
+
+    buffer = WebhookBuffer(WhatsAppIngestion(), max_size=2)
+    assert buffer.submit([{}]) == 1
+    # All or nothing: a delivery that does not fit queues none of its messages.
+    assert buffer.submit([{}, {}]) == 0
+    metrics = buffer.metrics()
+    assert (metrics["dropped"], metrics["queue_depth"]) == (2, 1)
+
+def test_whatsapp_webhook_accepts_cloud_api_payload(client, monkeypatch):
+    import hashlib
+    import hmac
+    import json
+    from app.api.v1 import ingestion as ingestion_api
+    from app.ingestion.webhook import extract_messages, whatsapp_webhook
+
+    payload = {"entry": [{"changes": [{"value": {
+        "contacts": [{"wa_id": "6281200000060", "profile": {"name": "Dewi"}}],
+        "messages": [{"id": "wamid.1", "from": "6281200000060", "timestamp": "1698382800", "text": {"body": "Halo"}}]
+    }}]}]}
+    assert extract_messages(payload) == [{
+        "id": "wamid.1", "from": "+6281200000060", "profile": {"name": "Dewi"}, "timestamp": "1698382800", "text": {"body": "Halo"}
+    }]
+    body = json.dumps(payload).encode()
+    # Refused while no app secret is configured...
+    response = client.post("/api/v1/ingestion/webhooks/whatsapp", content=body)
+    assert response.status_code == 401
+
+    monkeypatch.setattr(ingestion_api, "WHATSAPP_APP_SECRET", "test-secret")
+    signature = "sha256=" + hmac.new(b"test-secret", body, hashlib.sha256).hexdigest()
+    response = client.post("/api/v1/ingestion/webhooks/whatsapp", content=body, headers={"X-Hub-Signature-256": "sha256=bad"})
+    assert response.status_code == 401
+    assert whatsapp_webhook.metrics()["queue_depth"] == 0
+
+    # ...and queued, not written, once the signature checks out.
+    response = client.post("/api/v1/ingestion/webhooks/whatsapp", content=body, headers={"X-Hub-Signature-256": signature})
+    assert response.status_code == 202
+    assert response.json() == {"status": "accepted", "messages": 1}
+    assert whatsapp_webhook.metrics()["queue_depth"] == 1
+    failed = whatsapp_webhook.metrics()["failed_messages"]
+    assert whatsapp_webhook.flush() == 1
+    assert whatsapp_webhook.metrics()["failed_messages"] == failed
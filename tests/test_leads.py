@@ -41,3 +41,104 @@ def test_get_leads_empty(client: TestClient):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) == 0
+
+def test_get_leads_returns_snapshots_with_followups(client: TestClient):
+    """
+    Tests that the lead list is served from immutable snapshots that
+    include each lead's follow-ups.
+    """
+    from app.services.lead_service import get_all_leads
+    from app.schemas.lead_snapshot import LeadSnapshot
+
+    lead_res = client.post("/api/v1/leads/", json={"name": "Snap Shot", "phone": "+6281200000002", "source": "crm"})
+    lead_id = lead_res.json()["id"]
+    client.post("/api/v1/followups/", json={"lead_id": lead_id, "note": "Called", "status": "contacted"})
+
+    response = client.get("/api/v1/leads/")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["followups"][0]["note"] == "Called"
+
+    # Served from the cache as plain, immutable records
+    cached = get_all_leads(None)
+    assert isinstance(cached[0], LeadSnapshot)
+
+def test_bulk_upsert_applies_merge_rules(db):
+    """
+    Tests that the set-based upsert merges on phone with the same rules as
+    the per-row upsert and reports the status of every input row.
+    """
+    from app.models.lead import Lead
+    from app.models.lead_note import LeadNote
+    from app.schemas.lead import LeadCreate
+    from app.services.lead_service import bulk_upsert_leads
+
+    existing = Lead(name="Old Name", phone="+6281200000010", source="crm", note_entries=[LeadNote(body="first")])
+    db.add(existing)
+    db.flush()
+
+    statuses = bulk_upsert_leads(db, [
+        LeadCreate(name="New Name", phone="+6281200000010", source="fb_ads", email="a@example.com", budget=900, notes="second"),
+        LeadCreate(name="Fresh", phone="+6281200000011", source="whatsapp"),
+        LeadCreate(name="Fresh Again", phone="+6281200000011", source="whatsapp", notes="dup"),
+    ])
+    assert statuses == ["updated", "inserted", "updated"]
+
+    merged = db.query(Lead).filter(Lead.phone == "+6281200000010").one()
+    assert merged.name == "Old Name"
+    assert merged.source == "crm,fb_ads"
+    assert merged.email == "a@example.com"
+    assert merged.budget == 900
+    assert merged.notes == "second"
+    assert [note.body for note in merged.note_entries] == ["first", "second"]
+
+    fresh = db.query(Lead).filter(Lead.phone == "+6281200000011").one()
+    assert fresh.name == "Fresh"
+    assert fresh.source == "whatsapp"
+    assert fresh.notes == "dup"
+    assert fresh.status == "new"
+
+def test_notes_are_appended_once_per_delivery_and_listed_newest_first(client: TestClient, db):
+    from app.models.lead import Lead
+    from app.schemas.lead import LeadCreate
+    from app.services.lead_service import bulk_upsert_lead_rows
+
+    lead = {"name": "Rina", "phone": "+6281200000020", "source": "crm"}
+    bulk_upsert_lead_rows(db, [
+        {**LeadCreate(**lead, notes=f"note {i}").model_dump(), "note_key": f"msg-{i}"} for i in range(5)
+    ])
+    # A re-delivered message is not stored again ...
+    bulk_upsert_lead_rows(db, [{**LeadCreate(**lead, notes="note 4").model_dump(), "note_key": "msg-4"}])
+    # ... but the same text in a new message is.
+    bulk_upsert_lead_rows(db, [{**LeadCreate(**lead, notes="note 4").model_dump(), "note_key": "msg-5"}])
+    db.commit()
+
+    stored = db.query(Lead).filter(Lead.phone == lead["phone"]).one()
+    assert len(stored.note_entries) == 6
+
+    listed = client.get("/api/v1/leads/").json()
+    rina = next(item for item in listed if item["phone"] == lead["phone"])
+    assert rina["recent_notes"] == ["note 4", "note 4", "note 3"]
+    assert rina["notes"] == "note 4"
+
+def test_lead_upserts_invalidate_the_cache_only_once_committed(db):
+    from app.core.cache import default_cache
+    from app.schemas.lead import LeadCreate
+    from app.services.lead_service import bulk_upsert_leads, upsert_lead
+
+    key = ("test_leads", "cached")
+    lead = {"name": "Tono", "phone": "+6281200000030", "source": "crm"}
+
+    default_cache.set(key, "before", tags=("leads",))
+    upsert_lead(db, LeadCreate(**lead))
+    # Uncommitted: a reader could still only see the old rows.
+    assert default_cache.get(key) == "before"
+    db.commit()
+    assert default_cache.get(key) is None
+
+    default_cache.set(key, "before", tags=("leads",))
+    bulk_upsert_leads(db, [LeadCreate(**lead, notes="merged")])
+    assert default_cache.get(key) == "before"
+    db.commit()
+    assert default_cache.get(key) is None
@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.migrations import LATEST_VERSION, get_schema_version, run_migrations
+
+def test_migrations_build_schema_and_are_idempotent():
+    engine = create_engine("sqlite://")
+
+    assert run_migrations(engine) == LATEST_VERSION
+    assert run_migrations(engine) == 0
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+    index_names = {index["name"] for index in inspect(engine).get_indexes("audit_logs")}
+    assert "ix_audit_logs_event_type_created_at" in index_names
+
+def test_migrations_upgrade_a_stale_unversioned_schema():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE decision_proposals (id INTEGER PRIMARY KEY, status VARCHAR, "
+            "created_at DATETIME)"
+        ))
+
+    run_migrations(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("decision_proposals")}
+    assert {"escalated", "decided_at"} <= columns
+    index_names = {index["name"] for index in inspect(engine).get_indexes("decision_proposals")}
+    assert "ix_decision_proposals_status_escalated_created_at" in index_names
+
+def test_legacy_lead_notes_move_to_the_notes_table():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE leads (id INTEGER PRIMARY KEY, name VARCHAR, phone VARCHAR UNIQUE, email VARCHAR, "
+            "source VARCHAR, budget FLOAT, notes VARCHAR, status VARCHAR, created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO leads (id, name, phone, source, notes) VALUES "
+            "(1, 'Budi', '+6281200000001', 'crm', 'first\n---\nsecond\n---\nfirst'), "
+            "(2, 'Sari', '+6281200000002', 'crm', 'None\n---\nonly')"
+        ))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        notes = conn.execute(text("SELECT lead_id, body FROM lead_notes ORDER BY id")).all()
+    assert [tuple(note) for note in notes] == [(1, "first"), (1, "second"), (1, "first"), (2, "only")]
+    assert "notes" not in {column["name"] for column in inspect(engine).get_columns("leads")}
+
+def test_lead_notes_keyed_on_text_are_rekeyed_on_delivery():
+    engine = create_engine("sqlite://")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        # Rebuild the notes table as migration 8 first shipped it.
+        conn.execute(text("DROP TABLE lead_notes"))
+        conn.execute(text(
+            "CREATE TABLE lead_notes (id INTEGER PRIMARY KEY, lead_id INTEGER, body TEXT, source VARCHAR, "
+            "body_hash VARCHAR(64), created_at DATETIME)"
+        ))
+        conn.execute(text("CREATE UNIQUE INDEX ux_lead_notes_lead_id_body_hash ON lead_notes (lead_id, body_hash)"))
+        conn.execute(text("INSERT INTO lead_notes (lead_id, body, body_hash) VALUES (1, 'first', 'h1')"))
+        conn.execute(text("DELETE FROM schema_version WHERE version = 9"))
+
+    run_migrations(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("lead_notes")}
+    assert "delivery_key" in columns and "body_hash" not in columns
+    index_names = {index["name"] for index in inspect(engine).get_indexes("lead_notes")}
+    assert "ux_lead_notes_lead_id_source_delivery_key" in index_names
+    assert "ux_lead_notes_lead_id_body_hash" not in index_names
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO lead_notes (lead_id, body) VALUES (1, 'first')"))
+        assert conn.execute(text("SELECT COUNT(*) FROM lead_notes")).scalar() == 2
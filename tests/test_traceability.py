@@ -100,3 +100,45 @@ def test_replay_consistency(db):
     replay = get_decision_snapshot(db, snapshot.decision_id)
     assert replay.outcome['title'] == "Low Conf Decision"
     assert replay.explanation['why'] == ["reason2"]
+
+def test_dtids_are_unique_within_a_batch():
+    dtids = [generate_dtid() for _ in range(5000)]
+    assert len(set(dtids)) == len(dtids)
+
+def test_unit_of_work_writes_snapshots_and_audits_together(db):
+    from app.core.unit_of_work import UnitOfWork
+    from app.core.governance.audit import stage_audit_log_entry
+    from app.models.audit_log import AuditLog
+    from app.models.decision_snapshot import DecisionSnapshot
+    from app.schemas.audit_log import AuditLogCreate
+    from app.services.traceability_service import decision_snapshot_row
+
+    def stage(uow, title):
+        decision = DecisionRecommendation(
+            title=title, recommendation="Batch", priority=RecommendationPriority.MEDIUM, confidence=70,
+            rationale="Testing", impacted_metrics=[], suggested_owner=SuggestedOwner.OPS, governance_flags=[]
+        )
+        row = decision_snapshot_row(decision, "uow_user", UserRole.OPS_CRM, {}, [], {})
+        uow.add(DecisionSnapshot, row)
+        stage_audit_log_entry(uow, AuditLogCreate(event_type="uow_test", details=row["decision_id"]))
+        return row["decision_id"]
+
+    committed = []
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db) as uow:
+            uow.on_commit(lambda: committed.append("discarded"))
+            stage(uow, "Discarded")
+            raise RuntimeError("request failed")
+    assert committed == []
+    assert db.query(AuditLog).filter(AuditLog.event_type == "uow_test").count() == 0
+
+    with UnitOfWork(db) as uow:
+        dtids = [stage(uow, f"Kept {i}") for i in range(3)]
+        uow.on_commit(lambda: committed.append(get_decision_snapshot(db, dtids[0]) is not None))
+        assert uow.pending() == 6
+        assert get_decision_snapshot(db, dtids[0]) is None
+    assert committed == [True]
+    assert all(get_decision_snapshot(db, dtid) for dtid in dtids)
+    audits = db.query(AuditLog).filter(AuditLog.event_type == "uow_test").all()
+    assert sorted(a.details for a in audits) == sorted(dtids)
+    assert all(a.event_id for a in audits)